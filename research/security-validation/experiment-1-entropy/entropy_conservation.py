@@ -7,10 +7,11 @@ below 2^256 for 24-word BIP39 mnemonics.
 """
 
 import sys
+import time
 import random
 import argparse
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from dataclasses import dataclass
 import numpy as np
 from scipy import stats
@@ -33,12 +34,17 @@ from shared.bip39_utils import (
     mnemonic_to_indices
 )
 from shared.field_arithmetic import GF2053
-from shared.reporting import (
-    ExperimentReport,
-    save_results,
-    generate_summary,
-    plot_histogram,
-    plot_convergence
+from shared.reporting import ExperimentReport, save_results
+from shared.columnar import save_columns
+from shared.warehouse import ResultsWarehouse, DEFAULT_DB
+from shared.cache import ResultCache, cache_key, DEFAULT_CACHE_DIR
+from shared.profiling import Profiler, NULL_PROFILER
+from shared.sequential import BernoulliSPRT, ACCEPT_H0
+from shared.rendering import (
+    FigureJob,
+    write_render_manifest,
+    render_directory,
+    launch_background
 )
 
 # Import DuraShare library
@@ -58,6 +64,8 @@ class TrialResult:
     samples_tested: int
     consistent_count: int
     consistency_ratio: float
+    seed: int = 0  # per-trial seed driving source and candidate generation
+    elapsed_seconds: float = 0.0
 
 
 def compute_checksum_constraints(word_indices: List[int]) -> List[int]:
@@ -94,7 +102,8 @@ def compute_checksum_constraints(word_indices: List[int]) -> List[int]:
 def check_consistency(
     candidate_mnemonic: str,
     adversary_shares: List,
-    k: int
+    k: int,
+    profiler: Profiler = NULL_PROFILER
 ) -> bool:
     """
     Check if candidate mnemonic is consistent with adversary's k-1 shares.
@@ -106,14 +115,23 @@ def check_consistency(
         candidate_mnemonic: BIP39 mnemonic to test
         adversary_shares: k-1 Share objects from split_mnemonic
         k: Threshold value
+        profiler: Optional stage profiler (see shared.profiling)
     
     Returns:
         True if consistent, False otherwise
     """
     # First, must be valid BIP39
-    if not is_valid_bip39(candidate_mnemonic):
+    with profiler.stage('bip39_validation'):
+        valid = is_valid_bip39(candidate_mnemonic)
+    if not valid:
         return False
     
+    with profiler.stage('interpolation'):
+        return _check_polynomial_consistency(candidate_mnemonic, adversary_shares)
+
+
+def _check_polynomial_consistency(candidate_mnemonic: str, adversary_shares: List) -> bool:
+    """Interpolation part of check_consistency (candidate already BIP39-valid)."""
     # Get candidate word indices
     candidate_indices = mnemonic_to_indices(candidate_mnemonic)
     
@@ -217,7 +235,9 @@ def run_single_trial(
     k: int,
     n: int,
     samples: int,
-    verbose: bool = False
+    verbose: bool = False,
+    profiler: Profiler = NULL_PROFILER,
+    seed: Optional[int] = None
 ) -> TrialResult:
     """
     Run a single entropy conservation trial.
@@ -228,15 +248,24 @@ def run_single_trial(
         n: Total shares
         samples: Number of candidate mnemonics to test
         verbose: Print progress
+        profiler: Optional stage profiler (see shared.profiling)
+        seed: Per-trial seed for the source and candidate mnemonics
+              (None: fresh random seed, still recorded in the result)
     
     Returns:
         TrialResult object
     """
+    start = time.perf_counter()
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    rng = random.Random(seed)
+    
     # Generate random source mnemonic
-    source_mnemonic = generate_random_bip39(24)
+    source_mnemonic = generate_random_bip39(24, rng=rng)
     
     # Create shares using real Python implementation
-    shares = split_mnemonic(source_mnemonic, k, n)
+    with profiler.stage('split'):
+        shares = split_mnemonic(source_mnemonic, k, n)
     adversary_shares = shares[:k-1]  # Adversary gets k-1 shares
     
     # Sample random valid BIP39 mnemonics and check consistency
@@ -247,10 +276,13 @@ def run_single_trial(
         iterator = tqdm(iterator, desc=f"Trial {trial_num}", leave=False)
     
     for _ in iterator:
-        candidate = generate_random_bip39(24)
-        if check_consistency(candidate, adversary_shares, k):
+        with profiler.stage('candidate_generation'):
+            candidate = generate_random_bip39(24, rng=rng)
+        if check_consistency(candidate, adversary_shares, k, profiler):
             consistent += 1
     
+    profiler.count('candidates', samples)
+    profiler.count('consistent', consistent)
     ratio = consistent / samples
     
     return TrialResult(
@@ -260,17 +292,145 @@ def run_single_trial(
         n=n,
         samples_tested=samples,
         consistent_count=consistent,
-        consistency_ratio=ratio
+        consistency_ratio=ratio,
+        seed=seed,
+        elapsed_seconds=time.perf_counter() - start
     )
 
 
+def _run_trial_task(args: Tuple) -> Tuple[TrialResult, Optional[Profiler], float]:
+    """
+    Pool task wrapper: run one trial with its own profiler.
+    
+    Returns:
+        (TrialResult, profiler snapshot or None, wall-clock finish time)
+    """
+    trial_num, k, n, samples, seed, profile, trace_memory = args
+    profiler = Profiler(profile=profile, trace_memory=trace_memory).start()
+    result = run_single_trial(trial_num, k, n, samples, False, profiler, seed)
+    return result, profiler.snapshot(), time.time()
+
+
+# Consistency-ratio thresholds of analyze_results (and the SPRT hypotheses)
+PASS_RATIO = 0.99
+FAIL_RATIO = 0.95
+
+# Time-budget mode: calibration burst size and the smallest plan accepted
+CALIBRATION_SAMPLES = 20
+MIN_BUDGET_TRIALS = 30
+MIN_BUDGET_SAMPLES = 10
+
+
+def calibrate_throughput(k: int, n: int, workers: int) -> float:
+    """
+    Measure candidates/second per worker with one short trial per worker.
+    
+    Args:
+        k: Threshold
+        n: Total shares
+        workers: Pool size
+    
+    Returns:
+        Median per-worker throughput (candidates/second, split included)
+    """
+    burst = [(0, k, n, CALIBRATION_SAMPLES, None, False, False)] * workers
+    with Pool(processes=workers) as pool:
+        timings = [r.elapsed_seconds for r, _, _ in pool.map(_run_trial_task, burst)]
+    return CALIBRATION_SAMPLES / max(float(np.median(timings)), 1e-9)
+
+
+def plan_budget(
+    budget_seconds: float,
+    rate: float,
+    workers: int,
+    samples: int
+) -> Tuple[int, float]:
+    """
+    Samples per trial and expected trial duration for a time budget.
+    
+    The requested samples per trial are kept unless fewer than
+    MIN_BUDGET_TRIALS trials would fit, in which case trials get smaller.
+    
+    Returns:
+        (samples per trial, expected seconds per trial)
+    """
+    capacity = rate * workers * budget_seconds  # candidates the budget affords
+    if capacity < samples * MIN_BUDGET_TRIALS:
+        samples = max(MIN_BUDGET_SAMPLES, int(capacity // MIN_BUDGET_TRIALS))
+    return samples, samples / rate
+
+
+def budget_power(candidates: int) -> Dict[str, float]:
+    """
+    Sensitivity achieved by `candidates` consistency checks.
+    
+    Returns:
+        Dict with the probability that a true ratio of PASS_RATIO shows at
+        least one inconsistent candidate, and the smallest entropy
+        reduction (bits) detected that way with 95% probability
+    """
+    return {
+        'power_at_pass_ratio': 1.0 - PASS_RATIO ** candidates,
+        'detectable_reduction_bits_95': float(np.log2(20.0) / max(candidates, 1)),
+    }
+
+
+def _budgeted_trials(pool, make_args, workers: int, deadline: float,
+                     trial_seconds: float, max_trials: Optional[int]):
+    """
+    Yield (result, profiler, finished_at) in trial order until the deadline.
+    
+    A trial is submitted only if it is expected to finish before `deadline`
+    given the trials in flight. The expected duration is a moving average
+    over completed trials, so the plan follows throughput as it drifts.
+    """
+    pending = {}
+    next_trial = next_yield = 1
+    while True:
+        while (len(pending) < 2 * workers
+               and (max_trials is None or next_trial <= max_trials)
+               and (next_trial == 1
+                    or time.time() + trial_seconds * (1 + len(pending) // workers) <= deadline)):
+            pending[next_trial] = pool.apply_async(_run_trial_task, (make_args(next_trial),))
+            next_trial += 1
+        if next_yield not in pending:
+            return
+        item = pending.pop(next_yield).get()
+        next_yield += 1
+        trial_seconds = 0.8 * trial_seconds + 0.2 * item[0].elapsed_seconds
+        yield item
+
+
+TRIAL_COLUMNS = (
+    'trial', 'consistent', 'samples', 'ratio', 'seed', 'elapsed_seconds'
+)
+
+
+def trial_columns(results: List[TrialResult]) -> Dict[str, np.ndarray]:
+    """Convert trial results into columnar arrays (see shared.columnar)."""
+    return {
+        'trial': np.array([r.trial_number for r in results], dtype=np.int64),
+        'consistent': np.array([r.consistent_count for r in results], dtype=np.int64),
+        'samples': np.array([r.samples_tested for r in results], dtype=np.int64),
+        'ratio': np.array([r.consistency_ratio for r in results], dtype=np.float64),
+        'seed': np.array([r.seed for r in results], dtype=np.uint64),
+        'elapsed_seconds': np.array([r.elapsed_seconds for r in results], dtype=np.float64),
+    }
+
+
 def run_entropy_test(
     k: int,
     n: int,
     trials: int,
     samples: int,
     seed: int = None,
-    verbose: bool = False
+    verbose: bool = False,
+    profiler: Optional[Profiler] = None,
+    workers: Optional[int] = None,
+    sequential: Optional[BernoulliSPRT] = None,
+    min_trials: int = 1,
+    deadline: Optional[float] = None,
+    trial_seconds: float = 1.0
 ) -> Tuple[List[TrialResult], Dict[str, Any]]:
     """
     Run complete entropy conservation test.
@@ -278,38 +438,89 @@ def run_entropy_test(
     Args:
         k: Threshold
         n: Total shares
-        trials: Number of trials
+        trials: Number of trials (with a deadline: maximum, None = no limit)
         samples: Samples per trial
         seed: Random seed (None for random)
         verbose: Print progress
+        profiler: If given, per-worker measurements (and IPC latency) are
+                  merged into it; its `profile`/`trace_memory` flags are
+                  forwarded to the workers
+        workers: Pool size (default: all CPU cores)
+        sequential: If given, trials are consumed in order and fed to this
+                    SPRT; the run stops at the first trial (not before
+                    `min_trials`) after which the test has decided
+        min_trials: Minimum trials before a sequential stop
+        deadline: Wall-clock time (time.time()) after which no trial is
+                  expected to finish; trials are then submitted while they
+                  fit (see _budgeted_trials)
+        trial_seconds: Initial estimate of one trial's duration
     
     Returns:
-        Tuple of (list of trial results, statistics dict)
+        Tuple of (list of trial results, statistics dict). Sequential runs
+        add `trials_run` and `stopped_at_trial` (None if the budget ran out
+        first) to the statistics; budgeted runs add `trials_run` and
+        `candidates_tested`.
     """
     if seed is not None:
         random.seed(seed)
         np.random.seed(seed)
     
-    num_cores = cpu_count()
+    num_cores = workers or cpu_count()
     print(f"\nRunning Experiment 1: Entropy Conservation")
-    print(f"Configuration: {k}-of-{n}, {trials} trials, {samples} samples/trial")
+    planned = trials if deadline is None else f"up to {trials or 'unlimited'}"
+    print(f"Configuration: {k}-of-{n}, {planned} trials, {samples} samples/trial")
     print(f"Using {num_cores} CPU cores for parallel processing")
     print("=" * 60)
     
     # Prepare arguments for parallel execution
-    trial_args = [(i, k, n, samples, False) for i in range(1, trials + 1)]
-    
-    # Run trials in parallel using all CPU cores
+    profile = profiler.profile if profiler is not None else False
+    trace_memory = profiler.trace_memory if profiler is not None else False
+    # One 63-bit seed per trial, derived from the run seed (or fresh entropy);
+    # generate_state is prefix-stable, so budgeted runs can grow the list
+    seed_sequence = np.random.SeedSequence(seed)
+    trial_seeds = seed_sequence.generate_state(trials or 1024, dtype=np.uint64) >> 1
+    
+    def make_args(i):
+        nonlocal trial_seeds
+        if i > len(trial_seeds):
+            trial_seeds = seed_sequence.generate_state(2 * i, dtype=np.uint64) >> 1
+        return (i, k, n, samples, int(trial_seeds[i - 1]), profile, trace_memory)
+    
+    # Run trials in parallel across the worker pool
     results = []
+    stopped_at = None
     with Pool(processes=num_cores) as pool:
-        # Use imap_unordered for better performance with progress bar
-        for result in tqdm(pool.starmap(run_single_trial, trial_args), 
-                          total=trials, desc="Trials"):
+        if deadline is not None:
+            stream = _budgeted_trials(pool, make_args, num_cores, deadline,
+                                      trial_seconds, trials)
+        elif sequential is not None:
+            # A sequential run needs trial order so its stopping point is
+            # reproducible (leaving the block terminates in-flight trials)
+            stream = pool.imap(_run_trial_task, map(make_args, range(1, trials + 1)))
+        else:
+            # Use imap_unordered for better performance with progress bar
+            stream = pool.imap_unordered(_run_trial_task, map(make_args, range(1, trials + 1)))
+        for result, worker_profiler, finished_at in tqdm(
+            stream, total=trials, desc="Trials"
+        ):
+            if profiler is not None:
+                profiler.add_time('ipc', max(0.0, time.time() - finished_at))
+                profiler.merge(worker_profiler)
             results.append(result)
             
             if verbose and len(results) % 10 == 0:
                 avg = np.mean([r.consistent_count for r in results])
                 print(f"Trial {len(results)}: Running average = {avg:.1f}/{samples}")
+            
+            if sequential is not None:
+                decision = sequential.update(
+                    result.consistent_count, result.samples_tested - result.consistent_count
+                )
+                if decision is not None and len(results) >= min_trials:
+                    stopped_at = len(results)
+                    break
+    
+    results.sort(key=lambda r: r.trial_number)
     
     # Compute statistics
     consistent_counts = [r.consistent_count for r in results]
@@ -338,6 +549,15 @@ def run_entropy_test(
         't_statistic': t_stat,
         'p_value': p_value,
     }
+    if sequential is not None or deadline is not None:
+        statistics['trials_run'] = len(results)
+    if deadline is not None:
+        statistics['candidates_tested'] = sum(r.samples_tested for r in results)
+    if sequential is not None:
+        statistics['stopped_at_trial'] = stopped_at
+        if stopped_at is not None:
+            print(f"Sequential test decided after {stopped_at}/{trials} trials "
+                  f"({sequential.observations} candidates, LLR {sequential.llr:.2f})")
     
     return results, statistics
 
@@ -347,11 +567,20 @@ def analyze_results(
     statistics: Dict[str, Any],
     k: int,
     n: int,
-    samples: int
+    samples: int,
+    sequential: Optional[BernoulliSPRT] = None
 ) -> Tuple[str, str]:
     """
     Analyze results and determine pass/fail.
     
+    A sequential test that stopped the run settles PASS/FAIL at its error
+    rates, except that an accepted H0 with an observed mean ratio below
+    PASS_RATIO is reported MARGINAL, as in fixed-budget runs (the SPRT only
+    separates PASS_RATIO from FAIL_RATIO and says nothing about the band
+    between them). Otherwise (fixed-budget runs, or a test that never
+    stopped, including one that crossed a boundary before `min_trials` but
+    ran out of budget) the fixed thresholds on the mean ratio apply.
+    
     Returns:
         Tuple of (pass_fail status, conclusion text)
     """
@@ -359,8 +588,35 @@ def analyze_results(
     entropy_reduction = statistics['entropy_reduction_bits']
     p_value = statistics['p_value']
     
+    if sequential is not None and statistics.get('stopped_at_trial') is not None:
+        evidence = (
+            f"Mean consistency: {statistics['mean_consistent']:.1f}/{samples} "
+            f"({mean_ratio*100:.3f}%) over {statistics['trials_run']} trial(s). "
+            f"SPRT ratio={sequential.p0} vs ratio={sequential.p1}: "
+            f"log-likelihood ratio {sequential.llr:.2f} after "
+            f"{sequential.observations} candidates "
+            f"(alpha={sequential.alpha}, beta={sequential.beta})."
+        )
+        if sequential.decision == ACCEPT_H0 and mean_ratio < PASS_RATIO:
+            return "MARGINAL", (
+                f"⚠️ Small entropy reduction detected. {evidence} "
+                f"The SPRT rejected ratio={sequential.p1}, but the observed mean ratio is "
+                f"below {PASS_RATIO} (entropy reduction: {entropy_reduction:.4f} bits). "
+                f"Requires further analysis with larger sample size."
+            )
+        if sequential.decision == ACCEPT_H0:
+            return "PASS", (
+                f"✅ No detectable entropy reduction. {evidence} "
+                f"Conclusion: k-1 shares + checksum constraints do NOT leak information "
+                f"about individual word values for {k}-of-{n} configuration."
+            )
+        return "FAIL", (
+            f"❌ SIGNIFICANT entropy reduction detected. {evidence} "
+            f"CRITICAL: Security assumption violated for {k}-of-{n} configuration."
+        )
+    
     # Determine pass/fail
-    if mean_ratio >= 0.99 and p_value > 0.01:
+    if mean_ratio >= PASS_RATIO and p_value > 0.01:
         status = "PASS"
         conclusion = (
             f"✅ No detectable entropy reduction. Mean consistency: "
@@ -371,7 +627,7 @@ def analyze_results(
             f"Conclusion: k-1 shares + checksum constraints do NOT leak information "
             f"about individual word values for {k}-of-{n} configuration."
         )
-    elif mean_ratio >= 0.95:
+    elif mean_ratio >= FAIL_RATIO:
         status = "MARGINAL"
         conclusion = (
             f"⚠️ Small entropy reduction detected. Mean consistency: "
@@ -400,8 +656,9 @@ def main():
     parser.add_argument(
         '--trials',
         type=int,
-        default=1000,
-        help='Number of random source mnemonics (default: 1000)'
+        default=None,
+        help='Number of random source mnemonics (default: 1000; with '
+             '--time-budget: no limit)'
     )
     parser.add_argument(
         '--samples',
@@ -437,6 +694,82 @@ def main():
         action='store_true',
         help='Print detailed progress'
     )
+    parser.add_argument(
+        '--render',
+        choices=['background', 'inline', 'none'],
+        default='background',
+        help='When to render figures/summaries: in a background process '
+             '(default), inline after all configs, or not at all'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for the trial pool (default: all CPU cores)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Capture cProfile hotspots in every worker (merged into the report)'
+    )
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Record per-stage memory peaks with tracemalloc'
+    )
+    parser.add_argument(
+        '--warehouse',
+        type=Path,
+        nargs='?',
+        const=DEFAULT_DB,
+        default=None,
+        help='Ingest the reports into the results warehouse and compare each '
+             f'configuration against its history (default DB: {DEFAULT_DB})'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Wall-clock budget for all configurations: calibrate throughput, '
+             'then run trials while they fit (samples/trial shrink if needed)'
+    )
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Stop each configuration once an SPRT on the consistency counts '
+             f'decides PASS (ratio {PASS_RATIO}) vs FAIL (ratio {FAIL_RATIO})'
+    )
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=0.01,
+        help='Sequential mode: max probability of a wrong FAIL (default: 0.01)'
+    )
+    parser.add_argument(
+        '--beta',
+        type=float,
+        default=0.01,
+        help='Sequential mode: max probability of a wrong PASS (default: 0.01)'
+    )
+    parser.add_argument(
+        '--min-trials',
+        type=int,
+        default=10,
+        help='Sequential mode: trials (source mnemonics) before stopping (default: 10)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        dest='cache',
+        action='store_false',
+        help='Recompute seeded configurations even when a cached result exists'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f'Result cache directory (default: {DEFAULT_CACHE_DIR})'
+    )
     
     args = parser.parse_args()
     
@@ -451,27 +784,84 @@ def main():
         args.trials = 100
         args.samples = 100
         print("⚡ Quick mode enabled: trials=100, samples=100")
+    if args.trials is None and args.time_budget is None:
+        args.trials = 1000
+    
+    # Seeded runs are reproducible, so their outputs can be served from the
+    # content-addressed cache (see shared/cache.py); time-budgeted runs
+    # depend on the machine and are not
+    cache = (ResultCache(args.cache_dir)
+             if args.cache and args.seed is not None and args.time_budget is None else None)
+    budget_end = time.time() + args.time_budget if args.time_budget is not None else None
+    num_workers = args.workers or cpu_count()
     
     # Run experiments for each configuration
     all_reports = []
+    report_paths = []
     
-    for k, n in configs:
+    for index, (k, n) in enumerate(configs):
         print(f"\n{'='*60}")
         print(f"Testing configuration: {k}-of-{n}")
         print(f"{'='*60}")
         
+        output_dir = args.output / f"{k}-of-{n}"
+        report_file = f"report_{k}-of-{n}.json"
+        key = None
+        if cache is not None:
+            key = cache_key([Path(__file__)], {
+                'experiment': 'entropy_conservation', 'k': k, 'n': n,
+                'trials': args.trials, 'samples': args.samples, 'seed': args.seed,
+                'profile': args.profile, 'trace_memory': args.trace_memory,
+                'sequential': [args.alpha, args.beta, args.min_trials] if args.sequential else None,
+            })
+            if cache.get(key, output_dir):
+                report = ExperimentReport.from_json(output_dir / report_file)
+                print(f"\n✓ Cached result ({key[:12]}): {report.pass_fail}")
+                all_reports.append(report)
+                report_paths.append(output_dir / report_file)
+                continue
+        
+        profiler = Profiler(profile=args.profile, trace_memory=args.trace_memory).start()
+        config_start = time.perf_counter()
+        sequential = (BernoulliSPRT(PASS_RATIO, FAIL_RATIO, args.alpha, args.beta)
+                      if args.sequential else None)
+        
+        # Time budget: split what is left evenly over the remaining configs,
+        # so time saved (or overrun) by earlier configs carries forward
+        samples, deadline, trial_seconds, budget = args.samples, None, 1.0, None
+        if budget_end is not None:
+            with profiler.stage('calibration'):
+                rate = calibrate_throughput(k, n, num_workers)
+            config_budget = max(0.0, budget_end - time.time()) / (len(configs) - index)
+            samples, trial_seconds = plan_budget(config_budget, rate, num_workers, args.samples)
+            deadline = time.time() + config_budget
+            budget = {
+                'budget_seconds': config_budget,
+                'calibration_rate_per_worker': rate,
+                'workers': num_workers,
+                'samples_per_trial': samples,
+            }
+            print(f"Time budget {config_budget:.0f}s: {rate:.0f} candidates/s per worker, "
+                  f"{samples} samples/trial, ~{config_budget / trial_seconds * num_workers:.0f} trials")
+        
         # Run test
         results, statistics = run_entropy_test(
             k=k,
             n=n,
             trials=args.trials,
-            samples=args.samples,
+            samples=samples,
             seed=args.seed,
-            verbose=args.verbose
+            verbose=args.verbose,
+            profiler=profiler,
+            workers=args.workers,
+            sequential=sequential,
+            min_trials=args.min_trials,
+            deadline=deadline,
+            trial_seconds=trial_seconds
         )
         
         # Analyze
-        status, conclusion = analyze_results(results, statistics, k, n, args.samples)
+        status, conclusion = analyze_results(results, statistics, k, n, samples, sequential)
         
         # Print results
         print(f"\n{status}: {conclusion}\n")
@@ -483,61 +873,136 @@ def main():
             configuration={
                 'k': k,
                 'n': n,
-                'trials': args.trials,
-                'samples': args.samples,
-                'seed': args.seed
+                'trials': args.trials if budget is None else len(results),
+                'samples': samples,
+                'seed': args.seed,
+                'sequential': args.sequential,
+                'time_budget': args.time_budget
             },
             results={
-                'trial_results': [
-                    {
-                        'trial': r.trial_number,
-                        'consistent': r.consistent_count,
-                        'ratio': r.consistency_ratio
-                    }
-                    for r in results[:10]  # First 10 for brevity
-                ] + ['... (truncated)']
+                'trial_results': {
+                    'data_file': 'trials',
+                    'rows': len(results),
+                    'columns': list(TRIAL_COLUMNS),
+                }
             },
             statistical_summary=statistics,
             conclusion=conclusion,
             pass_fail=status
         )
+        if sequential is not None:
+            report.results['sequential'] = dict(
+                sequential.to_dict(),
+                min_trials=args.min_trials,
+                stopped_at_trial=statistics['stopped_at_trial'],
+                trial_budget=args.trials
+            )
+        if budget is not None:
+            candidates = statistics['candidates_tested']
+            elapsed = sum(r.elapsed_seconds for r in results)
+            report.results['time_budget'] = dict(
+                budget,
+                trials_run=len(results),
+                candidates_tested=candidates,
+                wall_seconds=time.perf_counter() - config_start,
+                achieved_rate_per_worker=candidates / elapsed if elapsed else None,
+                **budget_power(candidates)
+            )
         
         # Save results
-        output_dir = args.output / f"{k}-of-{n}"
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        report.to_json(output_dir / f"report_{k}-of-{n}.json")
-        generate_summary(report, output_dir)
+        # Every trial goes to a columnar file (memory-mapped by load_data)
+        trials_file = f"trials_{k}-of-{n}.npz"
+        save_columns(
+            output_dir / trials_file,
+            trial_columns(results),
+            metadata={'k': k, 'n': n, 'samples': samples, 'seed': args.seed}
+        )
+        report.data_files = {'trials': trials_file}
         
-        # Generate plots
-        consistent_counts = [r.consistent_count for r in results]
-        plot_histogram(
-            consistent_counts,
-            f"Entropy Conservation: {k}-of-{n}",
-            "Consistent Mnemonics (out of {args.samples})",
-            output_dir / "consistency_histogram.png",
-            expected_value=args.samples
+        profiler.stop()
+        report.performance = profiler.to_dict(
+            wall_seconds=time.perf_counter() - config_start,
+            workers=args.workers or cpu_count()
         )
+        report.to_json(output_dir / report_file)
         
-        # Convergence plot
-        running_avg = np.cumsum(consistent_counts) / np.arange(1, len(consistent_counts) + 1)
-        plot_convergence(
-            list(range(1, len(running_avg) + 1)),
-            running_avg,
-            f"Convergence: {k}-of-{n}",
-            "Trial Number",
-            "Running Average Consistent",
-            output_dir / "convergence.png",
-            expected_value=args.samples
+        # Figures, summary.md and the results table are drawn by the
+        # rendering stage (shared/rendering.py) from these raw inputs
+        consistent_counts = {'file': trials_file, 'column': 'consistent'}
+        manifest = write_render_manifest(
+            output_dir,
+            report_file,
+            figures=[
+                FigureJob(
+                    kind='histogram',
+                    output='consistency_histogram.png',
+                    data=consistent_counts,
+                    options={
+                        'title': f"Entropy Conservation: {k}-of-{n}",
+                        'xlabel': f"Consistent Mnemonics (out of {samples})",
+                        'expected_value': samples,
+                    }
+                ),
+                FigureJob(
+                    kind='convergence',
+                    output='convergence.png',
+                    data=consistent_counts,
+                    options={
+                        'title': f"Convergence: {k}-of-{n}",
+                        'xlabel': "Trial Number",
+                        'ylabel': "Running Average Consistent",
+                        'expected_value': samples,
+                    }
+                ),
+            ],
+            table={
+                'title': "Experiment 1: Entropy Conservation",
+                'output': "results_table.png",
+                'columns': {
+                    'Mean ratio': 'mean_ratio',
+                    'Entropy reduction (bits)': 'entropy_reduction_bits',
+                    'p-value': 'p_value',
+                },
+            }
         )
         
+        if key is not None:
+            cache.put(key, [output_dir / trials_file, output_dir / report_file,
+                            manifest],
+                      output_dir, name=f"entropy/{k}-of-{n}/seed-{args.seed}")
+        
         all_reports.append(report)
+        report_paths.append(output_dir / report_file)
     
     print(f"\n{'='*60}")
     print("Experiment 1 Complete!")
     print(f"Results saved to: {args.output}")
     print(f"{'='*60}\n")
     
+    if args.warehouse:
+        with ResultsWarehouse(args.warehouse) as warehouse:
+            for path in report_paths:
+                c = warehouse.compare(path)
+                if c['history_trials']:
+                    print(f"{c['k']}-of-{c['n']}: mean ratio {c['run_mean']:.6f} vs "
+                          f"{c['history_mean']:.6f} over {c['history_runs']} earlier run(s)"
+                          + (f" (z = {c['z']:+.2f})" if c['z'] is not None else ""))
+                else:
+                    print(f"{c['k']}-of-{c['n']}: first run in the warehouse")
+        print(f"✓ Reports ingested into {args.warehouse}\n")
+    
+    if args.render == 'inline':
+        result = render_directory(args.output)
+        print(f"✓ Rendered {len(result['rendered'])} output(s) in {result['seconds']:.1f}s")
+    elif args.render == 'background':
+        process = launch_background(args.output)
+        print(f"Rendering figures and summaries in background (pid {process.pid}); "
+              f"log: {args.output / 'render.log'}")
+    else:
+        print(f"Rendering skipped; run: python -m shared.rendering {args.output}")
+    
     return all_reports
 
 
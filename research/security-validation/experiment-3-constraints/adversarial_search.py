@@ -4,14 +4,26 @@ Adversarial Search using Z3 SMT Solver
 
 Alternative to SageMath implementation using Z3 solver.
 Can handle mixed constraints (algebraic + boolean).
+
+The adversary's view is generated from real split output (the v0.7.0 Python
+reference implementation, shared.schiavinato_bridge.SchiavanatoPython): k-1
+shares with their word values, row checksums, column checksums and printed
+GIC. Every GF(2053) equation is encoded in linear integer arithmetic with an
+explicit, tightly bounded quotient variable (lhs = value + 2053*q), so the
+whole system stays in QF_LIA and 24-word instances answer well within the
+timeout.
 """
 
+import os
 import sys
 import time
 import json
+import random
 import argparse
+import itertools
+from multiprocessing import Pool, TimeoutError as PoolTimeout, cpu_count
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 try:
     from z3 import *
@@ -21,117 +33,256 @@ except ImportError:
     sys.exit(1)
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from shared.field_arithmetic import GF2053
+from shared.field_arithmetic import GF2053, GF
+from shared import gf_linalg
+from shared.bip39_utils import generate_random_bip39, mnemonic_to_indices
+from shared.schiavinato_bridge import (
+    SchiavanatoPython, Share, COLUMN_TAGS, COLUMN_TOTAL, row_total, split_indices
+)
+
+P = GF2053.PRIME
+
+# Portfolio members: (name, tactic pipeline or None for the default solver).
+# Each is paired with distinct random seeds and assertion orders per task.
+STRATEGIES = (
+    ('smt', None),
+    ('solve-eqs', ('simplify', 'propagate-values', 'solve-eqs', 'smt')),
+    ('propagate-ineqs', ('simplify', 'propagate-ineqs', 'smt')),
+)
+
+# Base (x = 0) checksum values the adversary may additionally know.
+# "gic" models the leak from aggregating >= k printed GICs of one session.
+REVEAL_CHOICES = ('none', 'gic', 'rows', 'all')
+
+
+def _mod_eq(s, lhs, rhs: int, bound: int, name: str, p: int = P):
+    """Assert lhs ≡ rhs (mod p) for a linear term with 0 <= lhs <= bound."""
+    q = Int(name)
+    s.add(q >= 0, q <= bound // p)
+    s.add(lhs == rhs + p * q)
+    return q
+
+
+def _vandermonde_inverse(share_indices: List[int], k: int, p: int = P) -> List[List[int]]:
+    """
+    Inverse mod p of V[j][d] = x_j^(d+1), d = 0..k-2.
+
+    Row d maps the k-1 values P(x_j) - P(0) to coefficient a_{d+1}.
+    """
+    powers = [[pow(x, d + 1, p) for d in range(k - 1)] for x in share_indices]
+    return gf_linalg.inv(powers, p).tolist()
 
 
-def build_z3_system(k: int, share_indices: List[int], share_values: Dict) -> tuple:
+def build_z3_system(
+    k: int,
+    share_indices: List[int],
+    share_values: Dict[int, Share],
+    revealed: Optional[Dict[str, List[int]]] = None,
+    timeout_seconds: int = 300,
+    encoding: str = 'solved',
+    p: int = P
+) -> tuple:
     """
     Build Z3 constraint system.
-    
+
+    Unknowns are the word values w_i ∈ [1, 2048] and the non-constant
+    coefficients a_{i,d} ∈ [0, 2052] of every word polynomial, with one
+    quotient variable per modular equation.
+
+    Encodings (equivalent solution sets over the words):
+    - 'solved': the k-1 evaluations P_i(x_j) = y_i[x_j] in solved form,
+      a_{i,d} ≡ alpha_{i,d} + beta_d*w_i (Vandermonde inverse over the
+      adversary's share indices). Printed row/column/GIC values are sums of
+      word evaluations plus public constants, so on the shares they reduce to
+      identities over the known values and are checked here directly.
+    - 'raw': the evaluation equations themselves, with the printed checksum
+      values linked to the word polynomials through the evaluation
+      quotients. Slower for k >= 4; kept to cross-check 'solved'.
+
     Args:
         k: Threshold
         share_indices: List of k-1 share indices
-        share_values: Known share values
-    
+        share_values: Share index -> Share (words, row/column checksums, GIC)
+        revealed: Optional base values known to the adversary:
+                  {'rows': [...], 'columns': [...], 'gic': [G]}
+        timeout_seconds: Per-check solver timeout
+        encoding: 'solved' (default) or 'raw'
+        p: Field prime (toy primes use words 1..GF(p).word_max)
+
     Returns:
         Tuple of (solver, word_variables)
     """
+    word_count = len(share_values[share_indices[0]].words)
+    rows = word_count // 3
+    word_max = GF(p).word_max
+    revealed = revealed or {}
     print(f"\nBuilding Z3 system for {k}-threshold (adversary has {k-1} shares)...")
-    
+
     # Create solver
-    s = Solver()
-    s.set("timeout", 300000)  # 300 seconds = 300000 ms
-    
-    # Create word variables (24 words, values 1-2048, mapped to GF(2053))
-    words = [Int(f'w{i}') for i in range(24)]
-    
-    # Constrain words to valid range [0, 2047]
+    s = SolverFor("QF_LIA")
+    s.set("timeout", timeout_seconds * 1000)
+
+    # Create word variables (BIP39 indices 1-2048 in GF(2053); 1..word_max in general)
+    words = [Int(f'w{i}') for i in range(word_count)]
+    coeffs = [[Int(f'a{i}_{d}') for d in range(1, k)] for i in range(word_count)]
+
+    # Constrain words to valid range [1, word_max]
     for w in words:
-        s.add(And(w >= 0, w <= 2047))
-    
-    print(f"  Variables: {len(words)} words")
-    
-    # Add polynomial evaluation constraints
-    # P_i(x) = a0 + a1*x + a2*x^2 + ... (in GF(2053))
-    # We know P_i(x_j) for j in share_indices
-    
-    # For simplicity in Z3, just add checksum constraints
-    # (Full polynomial constraints would require many auxiliary variables)
-    
-    # Add checksum constraints: c_r = w1 + w2 + w3 (mod 2053)
+        s.add(And(w >= 1, w <= word_max))
+    for row in coeffs:
+        for a in row:
+            s.add(And(a >= 0, a < p))
+
+    print(f"  Variables: {len(words)} words + {len(words) * (k - 1)} coefficients "
+          f"({encoding} encoding)")
+
+    # P_i(x) = w_i + a_{i,1}*x + ... + a_{i,k-1}*x^{k-1} = y_i[x] + 2053*q_i[x],
+    # powers reduced mod 2053
+    print("  Adding polynomial evaluation constraints...")
+    quotients = {}
+    if encoding == 'solved':
+        inverse = _vandermonde_inverse(share_indices, k, p)
+        beta = [(-sum(row)) % p for row in inverse]
+        for i in range(word_count):
+            ys = [share_values[x].words[i] for x in share_indices]
+            for d, a in enumerate(coeffs[i]):
+                alpha = sum(v * y for v, y in zip(inverse[d], ys)) % p
+                _mod_eq(s, alpha + beta[d] * words[i], a, (p - 1) * (word_max + 1),
+                        f'r_a{i}_{d + 1}', p)
+    elif encoding == 'raw':
+        for x in share_indices:
+            share = share_values[x]
+            powers = [pow(x, d, p) for d in range(1, k)]
+            bound = word_max + (p - 1) * sum(powers)
+            for i in range(word_count):
+                poly = words[i] + Sum([a * c for a, c in zip(coeffs[i], powers)])
+                quotients[i, x] = _mod_eq(s, poly, share.words[i], bound, f'q_w{i}_x{x}', p)
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}")
+
+    # Row, column and printed GIC values on each share:
+    # R_j[x] = (row sum + j), C_c[x] = (column sum + tauC_c),
+    # GIC[x] = (all words + T_R + T_C + x)   (all mod 2053)
     print("  Adding checksum constraints...")
-    
-    for r in range(8):
-        w1 = words[3*r]
-        w2 = words[3*r + 1]
-        w3 = words[3*r + 2]
-        
-        # Sum mod 2053 (Z3 doesn't have built-in finite field, so simulate)
-        # We'd need actual checksum values to constrain this properly
-        # For now, just demonstrate structure
-    
+    t_r = row_total(word_count)
+
+    def share_sum(positions, x, constant, value, name):
+        # sum_i P_i(x) + constant ≡ value, with P_i(x) = y_i + 2053*q_i
+        known = sum(share_values[x].words[i] for i in positions) + constant
+        if encoding == 'solved':
+            s.add(BoolVal((known - value) % p == 0))
+            return
+        lhs = known + p * Sum([quotients[i, x] for i in positions])
+        s.add(lhs == value + p * Int(name))
+
+    for x in share_indices:
+        checks = share_values[x].checksums
+        for j in range(rows):
+            share_sum(range(3 * j, 3 * j + 3), x, j + 1, checks[j], f't_r{j}_x{x}')
+        for c in range(3):
+            share_sum(range(c, word_count, 3), x, COLUMN_TAGS[c], checks[rows + c],
+                      f't_c{c}_x{x}')
+        share_sum(range(word_count), x, t_r + COLUMN_TOTAL + x, checks[rows + 3], f't_g_x{x}')
+
+    # Revealed base values constrain the words directly
+    for j, value in enumerate(revealed.get('rows', [])):
+        _mod_eq(s, Sum(words[3 * j:3 * j + 3]) + (j + 1), value, 3 * word_max + rows,
+                f'q_R{j}', p)
+    for c, value in enumerate(revealed.get('columns', [])):
+        _mod_eq(s, Sum(words[c::3]) + COLUMN_TAGS[c], value,
+                rows * word_max + COLUMN_TAGS[c], f'q_C{c}', p)
+    for value in revealed.get('gic', []):
+        _mod_eq(s, Sum(words) + t_r + COLUMN_TOTAL, value,
+                word_count * word_max + t_r + COLUMN_TOTAL, 'q_G', p)
+
     print(f"  Total constraints: {s.assertions().__len__()}")
-    
+
     return s, words
 
 
-def attempt_z3_solution(solver, word_vars, timeout_seconds=300):
+def attempt_z3_solution(
+    solver,
+    word_vars,
+    timeout_seconds=300,
+    max_solutions=10,
+    first_solution: Optional[Dict[str, int]] = None
+):
     """
     Attempt to solve using Z3.
-    
+
+    Enumeration is incremental: blocking clauses live in a push/pop scope,
+    each guarded by the `enumerate` assumption literal, so the solver keeps
+    its learned state between checks and the base system is untouched
+    afterwards.
+
     Args:
         solver: Z3 Solver object
         word_vars: List of word variables
         timeout_seconds: Maximum time
-    
+        max_solutions: Stop enumerating after this many distinct solutions
+        first_solution: Word assignment already found (e.g. by
+                        solve_parallel); skips the initial check
+
     Returns:
         Dict with results
     """
-    print(f"\nAttempting Z3 solve (timeout: {timeout_seconds}s)...")
-    
     start_time = time.time()
-    
-    # Check satisfiability
-    result = solver.check()
-    elapsed = time.time() - start_time
-    
-    print(f"  Result: {result}")
-    print(f"  Elapsed: {elapsed:.1f}s")
-    
+
+    if first_solution is not None:
+        result = sat
+        elapsed = 0.0
+    else:
+        print(f"\nAttempting Z3 solve (timeout: {timeout_seconds}s)...")
+
+        # Check satisfiability
+        result = solver.check()
+        elapsed = time.time() - start_time
+
+        print(f"  Result: {result}")
+        print(f"  Elapsed: {elapsed:.1f}s")
+
     if result == sat:
-        model = solver.model()
-        solution = {f'w{i}': model[word_vars[i]].as_long() for i in range(24)}
-        
+        if first_solution is None:
+            model = solver.model()
+            solution = {f'w{i}': model[w].as_long() for i, w in enumerate(word_vars)}
+        else:
+            solution = dict(first_solution)
+        values = [solution[f'w{i}'] for i in range(len(word_vars))]
+
         # Try to find multiple solutions
         print("  Finding additional solutions...")
         num_solutions = 1
-        
-        # Block current solution and try again (up to 10 times)
-        for attempt in range(10):
+        exhausted = False
+
+        solver.push()
+        enumerate_lit = Bool('enumerate')
+        while num_solutions < max_solutions and time.time() - start_time < timeout_seconds:
             # Add constraint blocking this solution
-            block = Or([word_vars[i] != model[word_vars[i]] for i in range(24)])
-            solver.add(block)
-            
-            if solver.check() == sat:
+            solver.add(Implies(enumerate_lit, Or([w != v for w, v in zip(word_vars, values)])))
+            check = solver.check(enumerate_lit)
+            if check == sat:
                 num_solutions += 1
                 model = solver.model()
+                values = [model.eval(w, model_completion=True) for w in word_vars]
             else:
+                exhausted = check == unsat
                 break
-        
+        solver.pop()
+
         return {
             'status': 'SOLVED',
-            'elapsed_seconds': elapsed,
-            'num_solutions': f'>={num_solutions}' if num_solutions >= 10 else num_solutions,
+            'elapsed_seconds': time.time() - start_time,
+            'num_solutions': num_solutions if exhausted else f'>={num_solutions}',
             'first_solution': solution
         }
-    
+
     elif result == unsat:
         return {
             'status': 'UNSATISFIABLE',
             'elapsed_seconds': elapsed,
             'message': 'No solutions exist (constraints contradictory)'
         }
-    
+
     else:  # unknown
         return {
             'status': 'TIMEOUT',
@@ -140,46 +291,368 @@ def attempt_z3_solution(solver, word_vars, timeout_seconds=300):
         }
 
 
+def make_cubes(
+    word_vars, cube_words: int, cube_bits: int, word_bits: int = 11
+) -> List[List[tuple]]:
+    """
+    Split the word space into cubes by fixing high bits of some words.
+
+    Each of the first `cube_words` words (0-based index w-1, `word_bits`
+    bits: 11 for BIP39) has its top `cube_bits` bits fixed, giving
+    2^(cube_words*cube_bits) disjoint cubes that together cover every
+    assignment.
+
+    Returns:
+        One list of (word name, low, high) range literals per cube
+    """
+    width = 1 << (word_bits - cube_bits)
+    names = [str(w) for w in word_vars[:cube_words]]
+    return [
+        [(name, 1 + v * width, (v + 1) * width) for name, v in zip(names, prefix)]
+        for prefix in itertools.product(range(1 << cube_bits), repeat=len(names))
+    ]
+
+
+def _solve_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Solve one cube or full instance with one strategy (pool task)."""
+    start = time.perf_counter()
+    name, tactics = STRATEGIES[task['strategy']]
+    set_param('smt.random_seed', task['seed'])
+    set_param('sat.random_seed', task['seed'])
+    parsed = parse_smt2_string(task['smt2'])
+    assertions = list(parsed)
+    random.Random(task['seed']).shuffle(assertions)  # per-task assertion order
+    solver = Then(*tactics).solver() if tactics else SolverFor("QF_LIA")
+    solver.set("timeout", max(1, int(task['timeout'] * 1000)))
+    solver.add(assertions)
+    for var, low, high in task['cube']:
+        v = Int(var)
+        solver.add(v >= low, v <= high)
+    result = solver.check()
+    outcome = {
+        'task': task['id'],
+        'cube': task['cube'],
+        'strategy': name,
+        'seed': task['seed'],
+        'result': str(result),
+        'seconds': time.perf_counter() - start,
+        'worker': os.getpid(),
+    }
+    if result == sat:
+        model = solver.model()
+        outcome['solution'] = {
+            str(d): model[d].as_long() for d in model.decls()
+            if str(d).startswith('w') and str(d)[1:].isdigit()
+        }
+    return outcome
+
+
+def solve_parallel(
+    solver,
+    word_vars,
+    timeout_seconds: int = 300,
+    workers: Optional[int] = None,
+    cube_words: int = 1,
+    cube_bits: int = 2,
+    seed: int = 0,
+    word_bits: int = 11
+) -> Dict[str, Any]:
+    """
+    Cube-and-conquer portfolio solve across a process pool.
+
+    The instance (serialized as SMT-LIB2) is solved as a whole by every
+    portfolio strategy, and split into cubes (see make_cubes) that are solved
+    with strategies and seeds assigned round-robin. The first SAT result, an
+    UNSAT on the whole instance, or UNSAT on every cube decides the instance;
+    remaining tasks are then cancelled by terminating the pool.
+
+    Args:
+        solver: Z3 Solver holding the adversary's system
+        word_vars: Word variables
+        timeout_seconds: Wall-clock budget (also each task's timeout)
+        workers: Pool size (default: CPU count)
+        cube_words: Number of words whose high bits define cubes
+        cube_bits: High bits fixed per cube word
+        seed: Base random seed for the portfolio
+        word_bits: Bits per word (11; fewer in toy fields)
+
+    Returns:
+        Dict with results, including per-task timings under 'cubes'
+    """
+    workers = workers or cpu_count()
+    smt2 = solver.sexpr()
+    tasks = [
+        {'cube': [], 'strategy': i, 'seed': seed + i} for i in range(len(STRATEGIES))
+    ] + [
+        {'cube': cube, 'strategy': i % len(STRATEGIES), 'seed': seed + len(STRATEGIES) + i}
+        for i, cube in enumerate(make_cubes(word_vars, cube_words, cube_bits, word_bits))
+    ]
+    for i, task in enumerate(tasks):
+        task.update(id=i, smt2=smt2, timeout=timeout_seconds)
+    n_cubes = len(tasks) - len(STRATEGIES)
+
+    print(f"\nCube-and-conquer: {n_cubes} cubes + {len(STRATEGIES)} full-instance "
+          f"portfolio runs on {workers} workers (timeout: {timeout_seconds}s)...")
+    start_time = time.time()
+    finished = []
+    status, decided_by, solution = 'TIMEOUT', None, None
+    unsat_cubes = 0
+
+    pool = Pool(workers)
+    try:
+        pending = pool.imap_unordered(_solve_task, tasks)
+        while True:
+            remaining = timeout_seconds - (time.time() - start_time)
+            if remaining <= 0:
+                break
+            try:
+                outcome = pending.next(timeout=remaining)
+            except (StopIteration, PoolTimeout):
+                break
+            finished.append(outcome)
+            if outcome['result'] == 'sat':
+                status, decided_by = 'SOLVED', outcome['task']
+                solution = outcome.pop('solution')
+                break
+            if outcome['result'] == 'unsat':
+                if not outcome['cube']:
+                    status, decided_by = 'UNSATISFIABLE', outcome['task']
+                    break
+                unsat_cubes += 1
+                if unsat_cubes == n_cubes:
+                    status, decided_by = 'UNSATISFIABLE', 'all cubes'
+                    break
+    finally:
+        pool.terminate()  # cancel everything still queued or running
+        pool.join()
+    elapsed = time.time() - start_time
+
+    done = {o['task'] for o in finished}
+    cubes = sorted(finished + [
+        {'task': t['id'], 'cube': t['cube'], 'strategy': STRATEGIES[t['strategy']][0],
+         'seed': t['seed'], 'result': 'cancelled', 'seconds': None}
+        for t in tasks if t['id'] not in done
+    ], key=lambda o: o['task'])
+    print(f"  Result: {status} after {elapsed:.1f}s "
+          f"({len(finished)}/{len(tasks)} tasks finished)")
+
+    result = {
+        'status': status,
+        'elapsed_seconds': elapsed,
+        'parallel': {
+            'workers': workers,
+            'cube_words': cube_words,
+            'cube_bits': cube_bits,
+            'decided_by': decided_by,
+            'tasks': len(tasks),
+            'finished': len(finished),
+        },
+        'cubes': cubes,
+    }
+    if solution is not None:
+        result['first_solution'] = {f'w{i}': solution[f'w{i}'] for i in range(len(word_vars))}
+    return result
+
+
+def probe_words(solver, word_vars, reference: List[int], timeout_seconds=300) -> Dict[str, Any]:
+    """
+    Check which word positions the constraints pin down.
+
+    For each word w_i, asks whether a solution with w_i != reference[i]
+    exists, using one assumption literal per probe (no re-assertion, no
+    solver reset). UNSAT means the adversary learns that word outright.
+
+    Args:
+        solver: Z3 Solver holding the adversary's system
+        word_vars: Word variables
+        reference: Candidate assignment (e.g. the true mnemonic)
+        timeout_seconds: Budget for all probes
+
+    Returns:
+        Dict with 'pinned' positions, counts per outcome and timing
+    """
+    print(f"\nProbing {len(word_vars)} word positions...")
+    start_time = time.time()
+    outcomes = {'pinned': [], 'free': [], 'unknown': []}
+    for i, (w, value) in enumerate(zip(word_vars, reference)):
+        remaining = timeout_seconds - (time.time() - start_time)
+        if remaining <= 0:
+            outcomes['unknown'].extend(range(i, len(word_vars)))
+            break
+        solver.set("timeout", max(1, int(remaining * 1000)))
+        probe = Bool(f'probe_{i}')
+        solver.add(Implies(probe, w != value))
+        result = solver.check(probe)
+        key = 'pinned' if result == unsat else 'free' if result == sat else 'unknown'
+        outcomes[key].append(i)
+    elapsed = time.time() - start_time
+    print(f"  Pinned: {len(outcomes['pinned'])}, free: {len(outcomes['free'])}, "
+          f"unknown: {len(outcomes['unknown'])} ({elapsed:.1f}s)")
+    return {
+        'pinned_positions': outcomes['pinned'],
+        'free': len(outcomes['free']),
+        'unknown': len(outcomes['unknown']),
+        'elapsed_seconds': elapsed,
+    }
+
+
+def make_adversary_view(
+    k: int,
+    n: int,
+    word_count: int = 24,
+    reveal: str = 'none',
+    seed: Optional[int] = None,
+    p: int = P
+) -> Dict[str, Any]:
+    """
+    Split a random mnemonic and hand the adversary shares 1..k-1.
+
+    Toy primes split uniform words in 1..GF(p).word_max instead.
+
+    Args:
+        k: Threshold
+        n: Total shares
+        word_count: Mnemonic length (12 or 24)
+        reveal: Which base checksum values the adversary also knows
+                (one of REVEAL_CHOICES)
+        seed: Seed for the mnemonic and the polynomial coefficients
+        p: Field prime
+
+    Returns:
+        Dict with 'source' indices, 'share_indices', 'share_values' and
+        'revealed' base values
+    """
+    rng = random.Random(seed)
+    if p == P:
+        mnemonic = generate_random_bip39(word_count, rng=rng)
+        shares = SchiavanatoPython().create_shares(mnemonic, k, n, seed=rng.getrandbits(64))
+        source = mnemonic_to_indices(mnemonic)
+    else:
+        source = GF(p).random_words(word_count, rng)
+        shares = split_indices(source, k, n, seed=rng.getrandbits(64), p=p)
+
+    rows = word_count // 3
+    # Base values: the x = 0 share-table row/column/GIC (without the +x term)
+    base = [(sum(source[3 * j:3 * j + 3]) + j + 1) % p for j in range(rows)]
+    columns = [(sum(source[c::3]) + COLUMN_TAGS[c]) % p for c in range(3)]
+    gic = (sum(source) + row_total(word_count) + COLUMN_TOTAL) % p
+    revealed = {
+        'none': {},
+        'gic': {'gic': [gic]},
+        'rows': {'rows': base},
+        'all': {'rows': base, 'columns': columns, 'gic': [gic]},
+    }[reveal]
+
+    share_indices = list(range(1, k))
+    return {
+        'source': source,
+        'share_indices': share_indices,
+        'share_values': {x: shares[x - 1] for x in share_indices},
+        'revealed': revealed,
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Experiment 3: Z3-based Adversarial Search"
     )
     parser.add_argument('--k', type=int, default=3, help='Threshold')
     parser.add_argument('--n', type=int, default=5, help='Total shares')
+    parser.add_argument('--words', type=int, choices=[12, 24], default=24,
+                        help='Mnemonic length (default: 24)')
+    parser.add_argument('--reveal', choices=REVEAL_CHOICES, default='none',
+                        help='Base checksum values also known to the adversary (default: none)')
+    parser.add_argument('--max-solutions', type=int, default=10,
+                        help='Stop enumerating after this many solutions (default: 10)')
+    parser.add_argument('--no-probes', action='store_true',
+                        help='Skip the per-word pinning probes')
+    parser.add_argument('--encoding', choices=['solved', 'raw'], default='solved',
+                        help='Polynomial encoding (default: solved; raw cross-checks it)')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
     parser.add_argument('--timeout', type=int, default=300, help='Timeout (seconds)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Cube-and-conquer portfolio across N processes '
+                             '(0 = all cores; default: 1, sequential)')
+    parser.add_argument('--cube-words', type=int, default=1,
+                        help='Words whose high bits split the search into cubes (default: 1)')
+    parser.add_argument('--cube-bits', type=int, default=2,
+                        help='High bits fixed per cube word (default: 2)')
+    parser.add_argument('--prime', type=int, default=P,
+                        help=f'Field prime (default: {P}); small primes run a toy field')
     parser.add_argument('--output', type=Path, default=Path('results/z3_output.json'))
-    
+
     args = parser.parse_args()
-    
+    field = GF(args.prime)
+
     print("="*60)
     print("Experiment 3: Adversarial Constraint Solver (Z3)")
-    print(f"Configuration: {args.k}-of-{args.n}")
+    print(f"Configuration: {args.k}-of-{args.n}, {args.words} words, reveal={args.reveal}, "
+          f"{field}")
     print("="*60)
-    
-    # Simulate adversary shares
-    share_indices = list(range(1, args.k))
-    share_values = {}  # Would be populated with actual values
-    
+
+    # Adversary shares from real split output
+    view = make_adversary_view(args.k, args.n, args.words, args.reveal, args.seed, field.p)
+    share_indices = view['share_indices']
+    share_values = view['share_values']
+
     # Build system
-    solver, words = build_z3_system(args.k, share_indices, share_values)
-    
+    solver, words = build_z3_system(
+        args.k, share_indices, share_values, view['revealed'], args.timeout, args.encoding,
+        field.p
+    )
+
+    # Encoding sanity check: the true mnemonic must satisfy the system
+    truth = Bool('truth')
+    solver.add(Implies(truth, And([w == v for w, v in zip(words, view['source'])])))
+    check = solver.check(truth)
+    if check == unsat:
+        raise RuntimeError("Encoding error: the source mnemonic does not satisfy the system")
+    if check != sat:
+        print("  Warning: encoding sanity check inconclusive within the timeout")
+
     # Solve
-    result = attempt_z3_solution(solver, words, args.timeout)
-    
+    start_time = time.time()
+    if args.workers != 1:
+        result = solve_parallel(
+            solver, words, args.timeout, args.workers or None,
+            args.cube_words, args.cube_bits, args.seed or 0, field.word_bits
+        )
+        if result['status'] == 'SOLVED':
+            remaining = max(1, int(args.timeout - (time.time() - start_time)))
+            enumeration = attempt_z3_solution(
+                solver, words, remaining, args.max_solutions, result['first_solution']
+            )
+            result['num_solutions'] = enumeration['num_solutions']
+    else:
+        result = attempt_z3_solution(solver, words, args.timeout, args.max_solutions)
+    if not args.no_probes and result['status'] == 'SOLVED':
+        remaining = max(1, int(args.timeout - (time.time() - start_time)))
+        result['word_probes'] = probe_words(solver, words, view['source'], remaining)
+    result['configuration'] = {
+        'k': args.k,
+        'n': args.n,
+        'words': args.words,
+        'reveal': args.reveal,
+        'encoding': args.encoding,
+        'seed': args.seed,
+        'prime': field.p,
+        'share_indices': share_indices,
+        'assertions': len(solver.assertions()),
+    }
+
     # Interpret
     print("\n" + "="*60)
     print("RESULTS")
     print("="*60)
     print(json.dumps(result, indent=2))
-    
+
     # Save
     args.output.parent.mkdir(parents=True, exist_ok=True)
     with open(args.output, 'w') as f:
         json.dump(result, f, indent=2)
-    
+
     print(f"\nResults saved to: {args.output}")
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Exact Solution Counter for Checksum Constraints
+
+Counts the word assignments w_1..w_l ∈ [1, 2048] consistent with given public
+v0.7.0 base checksum values (row checksums, column checksums, GIC) and
+reports the remaining entropy in bits. Exact, so it answers counting
+questions that the SMT search (adversarial_search.py) can only sample.
+
+Method
+------
+Row checksums couple only the three words of a row, so the count is a
+dynamic program over rows whose state is (column-1 sum, column-2 sum) mod p;
+the column-3 sum follows from the row totals. Each row applies the kernel
+
+    K(a, b) = 1_S(a) · 1_S(b) · 1_S(rho - a - b),   S = {1..2048} ⊂ GF(2053)
+
+as a 2-D cyclic convolution. Writing 1_S = 1 - 1_E with E = GF(2053) \\ S
+(five residues) expands K by inclusion-exclusion into marginal sums plus
+~50 shifted copies of the state, so one row costs O(p^2) instead of
+O(p^4).
+
+Counts reach 2048^24 ≈ 2^264, so the DP runs modulo several primes q and
+the count is rebuilt by CRT. The row DP never multiplies two residues; it
+only adds and subtracts shifted copies of a state with entries below q,
+reducing after every inclusion-exclusion block. Between reductions an
+int64 accumulator holds at most max(p, |E| + 1) values below q (a p-term
+marginal, or |E| shifted copies on top of a reduced entry), so the moduli
+are the largest primes with max(p, |E| + 1) · q < 2^63: 51-bit for
+GF(2053), smaller for toy fields with a large E. The one residue product,
+the meet-in-the-middle dot product, splits both factors into 14-bit limbs
+(_dot). Rows are split in two halves computed in parallel, one task per
+(half, prime), and combined with a single dot product at the target
+column sums (meet in the middle).
+
+Without row values the columns and GIC partition or cover the words, and
+the count has a closed form (see count_sum).
+
+Not modeled: BIP39's SHA-256 checksum (as in the rest of Experiment 3).
+
+Usage
+-----
+    python3 checksum_counter.py --seed 42 --reveal all
+    python3 checksum_counter.py --rows 1316,1661,649,603 --columns 305,1071,1390
+    python3 checksum_counter.py --prime 13 --words 6 --seed 1 --reveal rows   # toy field
+    python3 checksum_counter.py --self-test
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+from math import comb
+from pathlib import Path
+from multiprocessing import Pool, cpu_count
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared.field_arithmetic import GF
+from shared.schiavinato_bridge import COLUMN_TAGS, COLUMN_TOTAL, row_total, share_checksums
+
+P = 2053
+WORD_MAX = 2048
+
+
+def _primes_below(limit: int, count: int) -> List[int]:
+    """The `count` largest primes below `limit` (deterministic Miller-Rabin)."""
+    def is_prime(n: int) -> bool:
+        if n < 2:
+            return False
+        for small in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+            if n % small == 0:
+                return n == small
+        d, r = n - 1, 0
+        while d % 2 == 0:
+            d, r = d // 2, r + 1
+        for a in (2, 3, 5, 7, 11, 13, 17):
+            x = pow(a, d, n)
+            if x in (1, n - 1):
+                continue
+            for _ in range(r - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+    primes, n = [], limit - 1
+    while len(primes) < count:
+        if is_prime(n):
+            primes.append(n)
+        n -= 1
+    return primes
+
+
+def _headroom(p: int, excluded: int) -> int:
+    """Most values below q an int64 accumulator holds between reductions in the row DP."""
+    return max(p, excluded + 1)
+
+
+def _moduli(bound: int, headroom: int = 1) -> List[int]:
+    """Primes q < 2^51 with headroom · q < 2^63 whose product exceeds `bound`."""
+    bits = min(51, 63 - headroom.bit_length())
+    count = bound.bit_length() // (bits - 1) + 1
+    return _primes_below(2**bits, count)
+
+
+def _crt(residues: Sequence[int], moduli: Sequence[int]) -> int:
+    value, modulus = 0, 1
+    for r, q in zip(residues, moduli):
+        t = (r - value) * pow(modulus, -1, q) % q
+        value += modulus * t
+        modulus *= q
+    return value
+
+
+# ----------------------------------------------------------------------
+# Closed forms (no row values)
+# ----------------------------------------------------------------------
+
+def count_sum(m: int, target: int, p: int = P, word_max: int = WORD_MAX) -> int:
+    """
+    Number of m-tuples from S = {1..word_max} with sum ≡ target (mod p).
+
+    Expands 1_S = 1 - 1_E (E = Z_p \\ S): the m-fold convolution is
+    sum_i C(m,i) (-1)^i 1_E^{*i} * 1^{*(m-i)}, and 1^{*j} = p^{j-1} for j >= 1.
+    """
+    if m == 0:
+        return int(target % p == 0)
+    excluded = [e for e in range(p) if not 1 <= e <= word_max]
+    e_conv = [1] + [0] * (p - 1)  # 1_E^{*i}, as exact integers
+    total = 0
+    for i in range(m + 1):
+        if i < m:
+            total += comb(m, i) * (-1) ** i * len(excluded) ** i * p ** (m - i - 1)
+        else:
+            total += (-1) ** m * e_conv[target % p]
+        if i < m:
+            nxt = [0] * p
+            for t, c in enumerate(e_conv):
+                if c:
+                    for e in excluded:
+                        nxt[(t + e) % p] += c
+            e_conv = nxt
+    return total
+
+
+# ----------------------------------------------------------------------
+# Row DP (modulo one prime)
+# ----------------------------------------------------------------------
+
+def _shift_add(out: np.ndarray, src: np.ndarray, da: int, db: int, sign: int = 1):
+    """out[x, y] += sign * src[x - da, y - db] (cyclic), in place without copies."""
+    n0, n1 = src.shape
+    da, db = da % n0, db % n1
+    for o0, s0 in ((slice(da, None), slice(None, n0 - da)), (slice(None, da), slice(n0 - da, None))):
+        for o1, s1 in ((slice(db, None), slice(None, n1 - db)), (slice(None, db), slice(n1 - db, None))):
+            if sign > 0:
+                out[o0, o1] += src[s0, s1]
+            else:
+                out[o0, o1] -= src[s0, s1]
+
+
+def _apply_row(state: np.ndarray, rho: int, q: int, excluded: Sequence[int],
+               plus_index: np.ndarray, minus_index: np.ndarray) -> np.ndarray:
+    """
+    One row: new[x, y] = sum_{a,b} state[x-a, y-b] K(a, b)  (mod q).
+
+    K = (1 - 1_E(a))(1 - 1_E(b))(1 - 1_E(c)), c = rho - a - b, expanded by
+    inclusion-exclusion. State entries are below q; every block is reduced
+    before the next, so no accumulator exceeds _headroom(p, |E|) · q, which
+    the caller keeps below 2^63.
+    """
+    p = state.shape[0]
+    roll = np.roll
+    buffer = np.empty_like(state)
+
+    row_m = state.sum(axis=1) % q  # over y -> function of x
+    total = int(row_m.sum() % q)
+    col_m = state.sum(axis=0) % q  # over x -> function of y
+    # diag_m[t] = sum_u state[u, t - u]
+    diag_m = np.take_along_axis(state, minus_index, axis=1).sum(axis=0) % q
+
+    t_a = sum(roll(row_m, e) for e in excluded) % q
+    t_b = sum(roll(col_m, e) for e in excluded) % q
+    t_c = sum(roll(diag_m, rho - e) for e in excluded) % q  # index x + y
+
+    new = (total - t_a[:, None] - t_b[None, :] - t_c[plus_index]) % q
+
+    # 1_E(a) 1_E(b): separable shifts
+    buffer[:] = 0
+    for a in excluded:
+        _shift_add(buffer, state, a, 0)
+    buffer %= q
+    for b in excluded:
+        _shift_add(new, buffer, 0, b)
+    new %= q
+
+    # 1_E(a) 1_E(c): b = rho - e - a  ->  state[x - a, y - rho + e + a]
+    buffer[:] = 0
+    for e in excluded:
+        _shift_add(buffer, state, 0, rho - e)
+    buffer %= q
+    for a in excluded:
+        _shift_add(new, buffer, a, -a)
+    new %= q
+
+    # 1_E(b) 1_E(c): a = rho - e - b  ->  state[x - rho + e + b, y - b]
+    buffer[:] = 0
+    for e in excluded:
+        _shift_add(buffer, state, rho - e, 0)
+    buffer %= q
+    for b in excluded:
+        _shift_add(new, buffer, -b, b)
+    new %= q
+
+    # 1_E(a) 1_E(b) 1_E(c): up to |E|^2 terms, reduced every |E|
+    excluded_set = set(excluded)
+    for a in excluded:
+        for b in excluded:
+            if (rho - a - b) % p in excluded_set:
+                _shift_add(new, state, a, b, sign=-1)
+        new %= q
+    return new
+
+
+def _row_kernel(rho: int, p: int, word_max: int) -> np.ndarray:
+    """State after one row from the zero state: K(a, b) itself."""
+    idx = np.arange(p)
+    valid = (idx >= 1) & (idx <= word_max)
+    third = valid[(rho - idx[:, None] - idx[None, :]) % p]
+    return (valid[:, None] & valid[None, :] & third).astype(np.int64)
+
+
+def _half_task(args) -> np.ndarray:
+    """DP over a block of rows from the zero state, modulo one prime (pool task)."""
+    rhos, q, p, word_max = args
+    excluded = [e for e in range(p) if not 1 <= e <= word_max]
+    if _headroom(p, len(excluded)) * q >= 2**63:
+        raise ValueError(f"Modulus {q} overflows int64 in the row DP for GF({p})")
+    idx = np.arange(p)
+    plus_index = (idx[:, None] + idx[None, :]) % p
+    minus_index = (idx[None, :] - idx[:, None]) % p
+    if not rhos:
+        state = np.zeros((p, p), dtype=np.int64)
+        state[0, 0] = 1
+        return state
+    state = _row_kernel(rhos[0], p, word_max)
+    for rho in rhos[1:]:
+        state = _apply_row(state, rho, q, excluded, plus_index, minus_index)
+    return state
+
+
+def _dot(a: np.ndarray, b: np.ndarray, q: int) -> int:
+    """sum(a * b) mod q for entries below 2^56, exact via 14-bit limbs."""
+    limbs_a = [(a >> (14 * i)) & 0x3FFF for i in range(4)]
+    limbs_b = [(b >> (14 * i)) & 0x3FFF for i in range(4)]
+    total = 0
+    for i, la in enumerate(limbs_a):
+        for j, lb in enumerate(limbs_b):
+            # < 2^28 per product; fine in int64 for up to 2^35 entries
+            total += int((la * lb).sum()) << (14 * (i + j))
+    return total % q
+
+
+def _combine(left: np.ndarray, right: np.ndarray, targets: Dict[str, int], q: int) -> int:
+    """
+    Sum of (left ⊛ right) over the target column sums, modulo q.
+
+    targets: 'point' (s1, s2), or one line: 's1', 's2' or 'diag' (s1 + s2).
+    """
+    p = left.shape[0]
+    idx = np.arange(p)
+
+    if 'point' in targets:
+        t1, t2 = targets['point']
+        aligned = right[(t1 - idx) % p][:, (t2 - idx) % p]
+        return _dot(left, aligned, q)
+    if 's1' in targets:
+        l, r, t = left.sum(axis=1) % q, right.sum(axis=1) % q, targets['s1']
+    elif 's2' in targets:
+        l, r, t = left.sum(axis=0) % q, right.sum(axis=0) % q, targets['s2']
+    else:
+        minus_index = (idx[None, :] - idx[:, None]) % p
+        l = np.take_along_axis(left, minus_index, axis=1).sum(axis=0) % q
+        r = np.take_along_axis(right, minus_index, axis=1).sum(axis=0) % q
+        t = targets['diag']
+    return _dot(l, r[(t - idx) % p], q)
+
+
+def count_solutions(
+    word_count: int = 24,
+    rows: Optional[Sequence[int]] = None,
+    columns: Optional[Sequence[Optional[int]]] = None,
+    gic: Optional[int] = None,
+    p: int = P,
+    word_max: int = WORD_MAX,
+    workers: Optional[int] = None
+) -> int:
+    """
+    Count word assignments consistent with the given base checksum values.
+
+    Values are as printed in the v0.7.0 table at x = 0 (tags included):
+    R_j = row sum + j, C_c = column sum + tauC_c, G = word sum + T_R + T_C.
+
+    Args:
+        word_count: Number of words l (multiple of 3)
+        rows: All r = l/3 row checksums, or None if unknown
+        columns: Three column checksums (None for unknown ones), or None
+        gic: Base GIC, or None if unknown
+        p: Field prime
+        word_max: Words range over 1..word_max
+        workers: Pool size for the row DP (default: CPU count)
+
+    Returns:
+        Exact number of consistent assignments in [1, word_max]^l
+    """
+    r = word_count // 3
+    if word_count % 3 or (rows is not None and len(rows) != r):
+        raise ValueError(f"Need word_count divisible by 3 and {r} row values")
+    columns = list(columns) if columns is not None else [None, None, None]
+    tags = [t % p for t in COLUMN_TAGS]
+    gamma = {c: (v - tags[c]) % p for c, v in enumerate(columns) if v is not None}
+    g = None if gic is None else (gic - row_total(word_count) - COLUMN_TOTAL) % p
+
+    if rows is None:
+        # Columns partition the words; the GIC ties the remaining ones
+        count = 1
+        for c in gamma:
+            count *= count_sum(r, gamma[c], p, word_max)
+        free = (3 - len(gamma)) * r
+        if g is None:
+            return count * word_max ** free
+        return count * count_sum(free, g - sum(gamma.values()), p, word_max)
+
+    rhos = [(v - (j + 1)) % p for j, v in enumerate(rows)]
+    total = sum(rhos) % p  # sum of all words
+    if g is not None and g != total:
+        return 0
+    if len(gamma) == 3 and sum(gamma.values()) % p != total:
+        return 0
+    if not gamma:
+        count = 1
+        for rho in rhos:
+            count *= count_sum(3, rho, p, word_max)
+        return count
+
+    if 0 in gamma and 1 in gamma:
+        targets = {'point': (gamma[0], gamma[1])}
+    elif 0 in gamma and 2 in gamma:
+        targets = {'point': (gamma[0], (total - gamma[0] - gamma[2]) % p)}
+    elif 1 in gamma and 2 in gamma:
+        targets = {'point': ((total - gamma[1] - gamma[2]) % p, gamma[1])}
+    elif 0 in gamma:
+        targets = {'s1': gamma[0]}
+    elif 1 in gamma:
+        targets = {'s2': gamma[1]}
+    else:
+        targets = {'diag': (total - gamma[2]) % p}
+
+    moduli = _moduli(word_max ** word_count, _headroom(p, p - word_max))
+    halves = [rhos[:r // 2], rhos[r // 2:]]
+    tasks = [(half, q, p, word_max) for q in moduli for half in halves]
+    workers = min(workers or cpu_count(), len(tasks))
+    if workers > 1:
+        with Pool(workers) as pool:
+            states = pool.map(_half_task, tasks)
+    else:
+        states = [_half_task(t) for t in tasks]
+
+    residues = [
+        _combine(states[2 * i], states[2 * i + 1], targets, q)
+        for i, q in enumerate(moduli)
+    ]
+    return _crt(residues, moduli)
+
+
+def entropy_report(count: int, word_count: int, word_max: int = WORD_MAX) -> Dict[str, Any]:
+    """Remaining entropy of a uniformly chosen consistent assignment."""
+    max_bits = word_count * math.log2(word_max)
+    bits = math.log2(count) if count else 0.0
+    return {
+        'count': str(count),
+        'entropy_bits': bits,
+        'max_bits': max_bits,
+        'reduction_bits': max_bits - bits,
+    }
+
+
+def _brute_force(word_count, rows, columns, gic, p, word_max) -> int:
+    """Direct enumeration over [1, word_max]^l (toy parameters only)."""
+    grids = np.meshgrid(*[np.arange(1, word_max + 1)] * word_count, indexing='ij')
+    words = np.stack([g.ravel() for g in grids], axis=1)
+    keep = np.ones(len(words), dtype=bool)
+    if rows is not None:
+        for j, v in enumerate(rows):
+            keep &= (words[:, 3 * j:3 * j + 3].sum(axis=1) + j + 1) % p == v % p
+    for c, v in enumerate(columns or []):
+        if v is not None:
+            keep &= (words[:, c::3].sum(axis=1) + COLUMN_TAGS[c]) % p == v % p
+    if gic is not None:
+        keep &= (words.sum(axis=1) + row_total(word_count) + COLUMN_TOTAL) % p == gic % p
+    return int(keep.sum())
+
+
+def self_test():
+    import random
+
+    print("Checksum Counter Self-Test")
+    print("=" * 60)
+
+    # Toy fields, exhaustive comparison over every reveal combination
+    rng = random.Random(0)
+    for p, word_max, l in ((13, 8, 6), (7, 4, 9)):
+        for _ in range(2):
+            words = [rng.randint(1, word_max) for _ in range(l)]
+            rows = [(sum(words[3 * j:3 * j + 3]) + j + 1) % p for j in range(l // 3)]
+            cols = [(sum(words[c::3]) + COLUMN_TAGS[c]) % p for c in range(3)]
+            gic = (sum(words) + row_total(l) + COLUMN_TOTAL) % p
+            for known in ([0, 1], [2], [0], [1], [1, 2], [0, 2], [0, 1, 2], []):
+                columns = [v if c in known else None for c, v in enumerate(cols)]
+                for rows_arg, gic_arg in ((rows, None), (rows, gic), (None, gic), (None, None)):
+                    args = (l, rows_arg, columns, gic_arg)
+                    fast = count_solutions(*args, p=p, word_max=word_max, workers=1)
+                    slow = _brute_force(*args, p, word_max)
+                    assert fast == slow, (p, args, fast, slow)
+        print(f"✓ Toy field p={p}, words 1..{word_max}, {l} words: matches enumeration")
+
+    assert sum(count_sum(3, t) for t in range(P)) == WORD_MAX ** 3
+    print("✓ Closed-form row counts cover all 2048^3 triples")
+
+    # Toy fields with a large E: saturated states must not overflow int64
+    for p, l in ((127, 42), (251, 36)):
+        field = GF(p)
+        excluded = field.excluded
+        q = _moduli(field.word_max ** l, _headroom(p, len(excluded)))[0]
+        idx = np.arange(p)
+        plus_index = (idx[:, None] + idx[None, :]) % p
+        minus_index = (idx[None, :] - idx[:, None]) % p
+        rho = rng.randrange(p)
+        kernel = int(_row_kernel(rho, p, field.word_max).sum())
+        state = np.full((p, p), q - 1, dtype=np.int64)
+        new = _apply_row(state, rho, q, excluded, plus_index, minus_index)
+        assert (new == (q - 1) * kernel % q).all(), p
+        # Mass conservation over a half: the total is the product of the row counts
+        rhos = [rng.randrange(p) for _ in range(l // 6)]
+        state = _half_task((rhos, q, p, field.word_max))
+        assert int((state.sum(axis=1) % q).sum() % q) == math.prod(count_sum(3, r, p, field.word_max) for r in rhos) % q
+        print(f"✓ GF({p}), |E| = {len(excluded)}: saturated row and {len(rhos)}-row half "
+              f"exact modulo a {q.bit_length()}-bit prime")
+
+    # Published 12-word vector, every base checksum revealed
+    vectors = Path(__file__).resolve().parents[3] / "test_vectors" / "vectors.json"
+    with open(vectors) as f:
+        words = json.load(f)['vectors'][0]['mnemonic']['indices_1_based']
+    values = share_checksums(words, 0)
+    start = time.perf_counter()
+    count = count_solutions(12, values[:4], values[4:7], values[7])
+    report = entropy_report(count, 12)
+    print(f"✓ 12-word vector, all checksums revealed: 2^{report['entropy_bits']:.3f} "
+          f"solutions ({report['reduction_bits']:.2f} bits revealed) "
+          f"in {time.perf_counter() - start:.1f}s")
+    # 4 rows + 2 independent columns: about 6 * log2(2053) bits
+    assert abs(report['reduction_bits'] - 6 * math.log2(P)) < 0.5
+
+    print("\nAll checksum counter tests passed!")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Experiment 3: exact solution count for checksum constraints"
+    )
+    parser.add_argument('--words', type=int, default=24,
+                        help='Word count, a multiple of 3 (default: 24)')
+    parser.add_argument('--rows', type=str, default=None,
+                        help='Comma-separated base row checksums R_1..R_r')
+    parser.add_argument('--columns', type=str, default=None,
+                        help='Comma-separated C_1,C_2,C_3 (use "-" for unknown)')
+    parser.add_argument('--gic', type=int, default=None, help='Base GIC')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Derive values from a random mnemonic instead')
+    parser.add_argument('--reveal', choices=['gic', 'rows', 'columns', 'all'], default='all',
+                        help='Which values to derive with --seed (default: all)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel DP tasks (default: CPU count)')
+    parser.add_argument('--output', type=Path, default=None, help='Write results JSON')
+    parser.add_argument('--prime', type=int, default=P,
+                        help=f'Field prime (default: {P}); small primes run a toy field '
+                             'with words 1..2^floor(log2(p-1))')
+    parser.add_argument('--self-test', action='store_true')
+    args = parser.parse_args()
+    if args.words % 3:
+        parser.error("--words must be a multiple of 3")
+    field = GF(args.prime)
+    p, word_max = field.p, field.word_max
+
+    if args.self_test:
+        self_test()
+        return
+
+    rows = [int(v) for v in args.rows.split(',')] if args.rows else None
+    columns = (
+        [None if v.strip() == '-' else int(v) for v in args.columns.split(',')]
+        if args.columns else None
+    )
+    gic = args.gic
+    if args.seed is not None:
+        import random
+        rng = random.Random(args.seed)
+        if p == P:
+            from shared.bip39_utils import generate_random_bip39, mnemonic_to_indices
+            words = mnemonic_to_indices(generate_random_bip39(args.words, rng=rng))
+        else:
+            words = field.random_words(args.words, rng)
+        values = share_checksums(words, 0, p)  # base (x = 0) values
+        r = args.words // 3
+        all_rows, all_cols, all_gic = values[:r], values[r:r + 3], values[r + 3]
+        rows = all_rows if args.reveal in ('rows', 'all') else None
+        columns = all_cols if args.reveal in ('columns', 'all') else None
+        gic = all_gic if args.reveal in ('gic', 'all') else None
+
+    print("=" * 60)
+    print(f"Experiment 3: Exact Checksum Solution Count over {field}")
+    print(f"Words: {args.words} (1..{word_max}), rows: {rows}, columns: {columns}, GIC: {gic}")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    count = count_solutions(args.words, rows, columns, gic, p, word_max, args.workers)
+    result = entropy_report(count, args.words, word_max)
+    result['elapsed_seconds'] = time.perf_counter() - start
+    result['configuration'] = {
+        'words': args.words, 'rows': rows, 'columns': columns, 'gic': gic,
+        'seed': args.seed, 'prime': p, 'word_max': word_max,
+    }
+    if word_max ** args.words <= 2_000_000:
+        # Toy fields: confirm against direct enumeration
+        result['exhaustive_count'] = _brute_force(args.words, rows, columns, gic, p, word_max)
+        assert result['exhaustive_count'] == count, "DP disagrees with enumeration"
+        print(f"Exhaustive enumeration agrees: {result['exhaustive_count']} assignments")
+
+    print(f"\nConsistent assignments: {count}")
+    print(f"Entropy: {result['entropy_bits']:.3f} bits "
+          f"(of {result['max_bits']:.1f}; {result['reduction_bits']:.3f} bits revealed)")
+    print(f"Elapsed: {result['elapsed_seconds']:.1f}s")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Linear Leakage Dimension
+
+Dimension over GF(2053) (or a toy GF(p), --prime) of the word vectors consistent with what an
+adversary holds: some shares (each word value plus its printed row, column
+and GIC checksums) and optionally the public base checksum values.
+
+Unknowns are the l words w_i and the (k-1) random coefficients a_{i,d} of
+every word polynomial. Each held share x contributes
+
+    w_i + sum_d a_{i,d} x^d = y_i[x]                         (l equations)
+    sum_{i in row j} P_i(x) + j = R_j[x], columns likewise,  (share checks)
+    sum_i P_i(x) + T_R + T_C + x = GIC[x]
+
+and revealed base values add the same sums with x = 0 applied to w alone.
+The leaked information is l minus the dimension of the projection of the
+affine solution space onto the word coordinates. This is linear algebra
+over the full field: the 1..2048 range and the BIP39 checksum are ignored
+(see checksum_counter.py for the exact count with the range).
+
+Usage:
+    python3 leakage_dimension.py --k 3 --n 5 --reveal all
+    python3 leakage_dimension.py --k 3 --n 5 --shares 3       # k shares: dimension 0
+    python3 leakage_dimension.py --k 3 --n 5 --prime 13       # toy field GF(13)
+"""
+
+import sys
+import json
+import time
+import argparse
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from shared import gf_linalg
+from shared.bip39_utils import generate_random_bip39, mnemonic_to_indices
+from shared.field_arithmetic import GF
+from shared.schiavinato_bridge import (
+    COLUMN_TAGS, COLUMN_TOTAL, row_total, share_checksums, split_indices
+)
+
+P = 2053
+REVEAL_CHOICES = ('none', 'gic', 'rows', 'columns', 'all')
+
+
+def build_system(
+    k: int,
+    shares: List[Any],
+    revealed: Dict[str, List[int]],
+    word_count: int,
+    p: int = P
+):
+    """
+    Linear system A u = b over GF(p) for u = (w, a_{., 1}, ..., a_{., k-1}).
+
+    Returns:
+        (A, b) as int64 arrays
+    """
+    l = word_count
+    unknowns = l * k  # words, then one block of l coefficients per degree
+    rows_a: List[np.ndarray] = []
+    rows_b: List[int] = []
+
+    def poly_row(positions, x):
+        # sum over positions of P_i(x) as a row of coefficients on u
+        row = np.zeros(unknowns, dtype=np.int64)
+        for d in range(k):
+            row[[d * l + i for i in positions]] = pow(x, d, p)
+        return row
+
+    groups = [list(range(3 * j, 3 * j + 3)) for j in range(l // 3)]
+    groups += [list(range(c, l, 3)) for c in range(3)]
+    constants = [j + 1 for j in range(l // 3)] + list(COLUMN_TAGS)
+    t_total = row_total(l) + COLUMN_TOTAL
+
+    for share in shares:
+        x = share.index
+        for i, y in enumerate(share.words):
+            rows_a.append(poly_row([i], x))
+            rows_b.append(y)
+        for positions, constant, value in zip(groups, constants, share.checksums):
+            rows_a.append(poly_row(positions, x))
+            rows_b.append(value - constant)
+        rows_a.append(poly_row(range(l), x))
+        rows_b.append(share.checksums[-1] - t_total - x)
+
+    r = l // 3
+    for j, value in enumerate(revealed.get('rows', [])):
+        rows_a.append(poly_row(groups[j], 0))
+        rows_b.append(value - (j + 1))
+    for c, value in enumerate(revealed.get('columns', [])):
+        rows_a.append(poly_row(groups[r + c], 0))
+        rows_b.append(value - COLUMN_TAGS[c])
+    for value in revealed.get('gic', []):
+        rows_a.append(poly_row(range(l), 0))
+        rows_b.append(value - t_total)
+
+    return np.array(rows_a), np.array(rows_b, dtype=np.int64) % p
+
+
+def leakage_dimension(
+    k: int,
+    shares: List[Any],
+    revealed: Dict[str, List[int]],
+    word_count: int,
+    p: int = P
+) -> Dict[str, Any]:
+    """
+    Rank analysis of the adversary's linear system.
+
+    Returns:
+        Dict with equation/unknown counts, rank, solution-space dimension,
+        word-space dimension and leaked dimensions (l - word dimension)
+    """
+    a, b = build_system(k, shares, revealed, word_count, p)
+    gf_linalg.solve(a, b, p)  # raises if the view is inconsistent
+    kernel = gf_linalg.nullspace(a, p)
+    word_dim = gf_linalg.rank(kernel[:, :word_count], p) if len(kernel) else 0
+    return {
+        'equations': int(a.shape[0]),
+        'unknowns': int(a.shape[1]),
+        'rank': int(a.shape[1] - len(kernel)),
+        'solution_dimension': int(len(kernel)),
+        'word_dimension': int(word_dim),
+        'leaked_dimensions': int(word_count - word_dim),
+    }
+
+
+def make_view(k: int, n: int, word_count: int, shares: int, reveal: str,
+              seed: Optional[int] = None, p: int = P):
+    """
+    Split random words; return (held shares, revealed base values).
+
+    GF(2053) uses a random BIP39 mnemonic; toy primes use uniform words in
+    1..GF(p).word_max.
+    """
+    rng = random.Random(seed)
+    if p == P:
+        words = mnemonic_to_indices(generate_random_bip39(word_count, rng=rng))
+    else:
+        words = GF(p).random_words(word_count, rng)
+    all_shares = split_indices(words, k, n, seed=rng.getrandbits(64), p=p)
+    base = share_checksums(words, 0, p)
+    r = word_count // 3
+    parts = {'rows': base[:r], 'columns': base[r:r + 3], 'gic': [base[r + 3]]}
+    revealed = {
+        'none': {},
+        'gic': {'gic': parts['gic']},
+        'rows': {'rows': parts['rows']},
+        'columns': {'columns': parts['columns']},
+        'all': parts,
+    }[reveal]
+    return all_shares[:shares], revealed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Experiment 3: linear leakage dimension over GF(2053)"
+    )
+    parser.add_argument('--k', type=int, default=3, help='Threshold')
+    parser.add_argument('--n', type=int, default=5, help='Total shares')
+    parser.add_argument('--words', type=int, choices=[12, 15, 18, 21, 24], default=24)
+    parser.add_argument('--shares', type=int, default=None,
+                        help='Shares held by the adversary (default: k-1)')
+    parser.add_argument('--reveal', choices=REVEAL_CHOICES, default=None,
+                        help='Public base values also known (default: sweep all)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--prime', type=int, default=P,
+                        help=f'Field prime (default: {P}); small primes run a toy field')
+    parser.add_argument('--output', type=Path, default=None, help='Write results JSON')
+    args = parser.parse_args()
+
+    field = GF(args.prime)
+    held = args.k - 1 if args.shares is None else args.shares
+    reveals = [args.reveal] if args.reveal else list(REVEAL_CHOICES)
+
+    print("=" * 60)
+    print(f"Linear leakage over {field}: {args.k}-of-{args.n}, {args.words} words, "
+          f"{held} share(s) held")
+    print("=" * 60)
+    print(f"{'reveal':<10}{'equations':>10}{'unknowns':>10}{'rank':>7}{'word dim':>10}{'leaked':>8}")
+
+    results = []
+    for reveal in reveals:
+        shares, revealed = make_view(args.k, args.n, args.words, held, reveal, args.seed, field.p)
+        start = time.perf_counter()
+        row = leakage_dimension(args.k, shares, revealed, args.words, field.p)
+        row.update(reveal=reveal, seconds=time.perf_counter() - start)
+        results.append(row)
+        print(f"{reveal:<10}{row['equations']:>10}{row['unknowns']:>10}{row['rank']:>7}"
+              f"{row['word_dimension']:>10}{row['leaked_dimensions']:>8}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({
+                'configuration': {'k': args.k, 'n': args.n, 'words': args.words,
+                                  'shares': held, 'seed': args.seed, 'prime': field.p},
+                'results': results,
+            }, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,7 @@ N=5
 TIMEOUT=300
 TRIALS=1000
 CONFIGS="2-3,3-5"
+WORKERS=0  # Z3 cube-and-conquer processes (0 = all cores)
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -50,6 +51,10 @@ while [[ $# -gt 0 ]]; do
             TRIALS="$2"
             shift 2
             ;;
+        --workers)
+            WORKERS="$2"
+            shift 2
+            ;;
         *)
             shift
             ;;
@@ -74,7 +79,7 @@ for config in "${CONFIG_ARRAY[@]}"; do
     if [ "$SOLVER" = "sage" ]; then
         sage constraint_solver.sage --k $K --n $N --timeout $TIMEOUT --trials $TRIALS --output "results/$K-of-$N/sage_output.json"
     else
-        python3 adversarial_search.py --k $K --n $N --timeout $TIMEOUT --output "results/$K-of-$N/z3_output.json"
+        python3 adversarial_search.py --k $K --n $N --timeout $TIMEOUT --workers $WORKERS --output "results/$K-of-$N/z3_output.json"
     fi
     
     echo ""
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Validate and benchmark nested custody layouts (manual_spec, "Nesting").
+
+For each layout the script builds full custody trees with shared/nested.py
+and then, per trial, recovers the secret through a random minimal set of
+leaves (k random children at every node). It also confirms that the same
+set with one leaf removed fails to recover. Path fields are round-tripped
+through the profile's payload encoding. Trials are spread across a process
+pool; within a trial every independent sub-tree of a layer is recovered in
+one batched product.
+
+Usage
+-----
+    python3 nested_custody.py                                  # default layouts
+    python3 nested_custody.py --layouts "3-of-5,3-of-5,3-of-5,3-of-5" --trials 1000
+    python3 nested_custody.py --profile compact --layouts "2-of-3,2-of-3;15-of-15,15-of-15"
+    python3 nested_custody.py --check
+
+License: MIT (see repository root).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.nested import (NestedShare, build_tree, minimal_cover, parse_layout, recover_tree,
+                           validate_layout)
+from shared.reporting import parse_count
+
+DEFAULT_LAYOUTS = {
+    'full': ["2-of-3", "2-of-3,2-of-3", "2-of-3,3-of-5,2-of-3", "3-of-5,3-of-5,3-of-5,3-of-5",
+             "2-of-3[1],2-of-2[2],1-of-3", "15-of-15,15-of-15,2-of-3,2-of-2"],
+    'compact': ["2-of-3", "3-of-5,2-of-3", "15-of-15,15-of-15"],
+}
+
+
+def _task(args: tuple) -> dict:
+    """Pool task: build `trials` trees of one layout and recover each through random paths."""
+    text, profile, words, trials, paths, seed = args
+    rng = np.random.default_rng(seed)
+    layers = parse_layout(text)
+    counts = {"trials": 0, "recovered": 0, "short_rejected": 0, "paths_ok": 0,
+              "build_s": 0.0, "recover_s": 0.0, "recover_all_s": 0.0, "leaves": 0, "cover": 0}
+    for _ in range(trials):
+        secret = [int(w) for w in rng.integers(1, 2049, size=words)]
+        start = time.perf_counter()
+        leaves = build_tree(secret, layers, profile, rng)
+        counts["build_s"] += time.perf_counter() - start
+        counts["leaves"] = len(leaves)
+        counts["paths_ok"] += all(
+            NestedShare.decode_paths(*leaf.encode_paths(profile), leaf.depth, leaf.share,
+                                     profile).path == leaf.path for leaf in leaves)
+        start = time.perf_counter()
+        counts["recovered"] += recover_tree(leaves) == secret
+        counts["recover_all_s"] += time.perf_counter() - start
+        for _ in range(paths):
+            cover = minimal_cover(leaves, rng, layers)
+            counts["cover"] = len(cover)
+            start = time.perf_counter()
+            ok = recover_tree(cover) == secret
+            counts["recover_s"] += time.perf_counter() - start
+            counts["recovered"] += ok
+            cover.pop(int(rng.integers(len(cover))))
+            try:
+                recover_tree(cover)
+            except ValueError:
+                counts["short_rejected"] += 1
+        counts["trials"] += 1
+    return {"layout": text, **counts}
+
+
+def run(layouts: list[str], profile: str = 'full', words: int = 24, trials: int = 100,
+        paths: int = 10, workers: int | None = None, seed: int | None = None) -> list[dict]:
+    """
+    Build and recover every layout across a process pool.
+
+    Args:
+        layouts: Layout strings (see shared.nested.parse_layout)
+        profile: 'full' or 'compact'
+        words: Secret word count
+        trials: Trees built per layout
+        paths: Random minimal recovery paths tried per tree
+        workers: Pool size (default: all CPU cores)
+        seed: Master seed (None: fresh entropy)
+
+    Returns:
+        One dict per layout with leaf counts, success counts and timings
+
+    Raises:
+        ValueError: If a layout is invalid for the profile
+    """
+    for text in layouts:
+        validate_layout(parse_layout(text), profile)
+    workers = workers or os.cpu_count()
+    chunk = max(1, -(-trials // workers))
+    master = np.random.SeedSequence(seed)
+    tasks = []
+    for text in layouts:
+        for start in range(0, trials, chunk):
+            task_seed = int(master.spawn(1)[0].generate_state(1, dtype=np.uint64)[0])
+            tasks.append((text, profile, words, min(chunk, trials - start), paths, task_seed))
+
+    totals: dict[str, dict] = {}
+    with Pool(processes=workers) as pool:
+        for part in pool.imap_unordered(_task, tasks):
+            total = totals.setdefault(part["layout"], dict.fromkeys(part, 0))
+            for name, value in part.items():
+                if name in ("leaves", "cover"):
+                    total[name] = value
+                elif name != "layout":
+                    total[name] += value
+
+    results = []
+    for text in layouts:
+        t = totals[text]
+        n, attempts = t["trials"], t["trials"] * paths
+        results.append({
+            "layout": text, "profile": profile, "depth": len(parse_layout(text)) - 1,
+            "words": words, "trees": n, "leaves": t["leaves"], "minimal_cover": t["cover"],
+            "recoveries": n + attempts, "recovered": t["recovered"],
+            "short_sets_rejected": t["short_rejected"], "short_sets": attempts,
+            "paths_round_trip": t["paths_ok"] == n,
+            "build_ms": 1e3 * t["build_s"] / n,
+            "recover_all_ms": 1e3 * t["recover_all_s"] / n,
+            "recover_cover_ms": 1e3 * t["recover_s"] / attempts if attempts else None,
+        })
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    print(f"{'layout':<36}{'depth':>6}{'leaves':>8}{'cover':>7}{'recovered':>14}{'short rej.':>14}"
+          f"{'build ms':>10}{'all ms':>9}{'cover ms':>10}")
+    for r in results:
+        cover = "-" if r["recover_cover_ms"] is None else f"{r['recover_cover_ms']:.2f}"
+        print(f"{r['layout']:<36}{r['depth']:>6}{r['leaves']:>8}{r['minimal_cover']:>7}"
+              f"{r['recovered']:>7}/{r['recoveries']:<6}{r['short_sets_rejected']:>7}/{r['short_sets']:<6}"
+              f"{r['build_ms']:>10.2f}{r['recover_all_ms']:>9.2f}{cover:>10}")
+
+
+def check() -> None:
+    """Small runs of every default layout must recover every time and reject every short set."""
+    for profile, layouts in DEFAULT_LAYOUTS.items():
+        for r in run(layouts, profile, words=12, trials=2, paths=3, workers=1, seed=1):
+            assert r["recovered"] == r["recoveries"], r
+            assert r["short_sets_rejected"] == r["short_sets"], r
+            assert r["paths_round_trip"], r
+            print(f"✓ {profile} {r['layout']}: {r['leaves']} leaves, {r['recoveries']} recoveries, "
+                  f"{r['short_sets']} short sets rejected")
+    for profile, text in (('compact', "2-of-3,2-of-3,2-of-3"), ('full', "2-of-3,2-of-3,2-of-16")):
+        try:
+            run([text], profile, trials=1, workers=1)
+        except ValueError:
+            print(f"✓ {profile} rejects {text}")
+        else:
+            raise AssertionError(f"{profile} accepted {text}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=("full", "compact"), default="full")
+    parser.add_argument("--layouts", default=None,
+                        help="semicolon-separated layouts, e.g. '2-of-3,3-of-5[1,2];3-of-5,2-of-2' "
+                             "(default: a set per profile)")
+    parser.add_argument("--words", type=int, default=24, choices=(12, 15, 18, 21, 24))
+    parser.add_argument("--trials", type=parse_count, default=100,
+                        help="trees per layout, e.g. 1e3 (default: 100)")
+    parser.add_argument("--paths", type=int, default=10,
+                        help="random minimal recovery paths per tree (default: 10)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--check", action="store_true", help="run the small validation runs and exit")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    layouts = args.layouts.split(";") if args.layouts else DEFAULT_LAYOUTS[args.profile]
+    try:
+        results = run(layouts, args.profile, args.words, args.trials, args.paths,
+                      args.workers, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    print_results(results)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
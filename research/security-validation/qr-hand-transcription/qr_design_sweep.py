@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""Payload/QR design-space sweep for the minimum hand-transcription burden.
+
+Enumerates share payload layouts (profile, word count, Session Batch ID,
+RBT and Transport Hash lengths) against QR error-correction levels. For
+every variant it computes the payload size from the spec layout, the
+smallest QR version that holds it in byte mode, and the expected number of
+dark hand-marks under the encoder's mask choice, then reports the Pareto
+frontier of hand-marks against the integrity the layout keeps.
+Requires: pip install qrcode
+
+See README.md in this directory.
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+from qr_hand_transcription_estimate import (
+    EC_LEVELS, PERCENTILES, analyze, mask_counts, representative_payload,
+)
+from qrcode.util import BIT_LIMIT_TABLE, MODE_8BIT_BYTE, mode_sizes_for_version
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.payload import (
+    BATCH_BYTES, HASH_BYTES, PATH_BYTES, RBT_BYTES, WORD_COUNT_CODES, payload_size,
+    random_payload,
+)
+
+EC_ORDER = "LMQH"  # increasing recovery capacity
+OBJECTIVES = ("ec", "hash", "rbt", "batch", "checksums")
+
+DEFAULT_BATCH = (4, 8)
+DEFAULT_RBT = (6, 12)
+DEFAULT_HASH = (0, 8, 16)
+
+
+def share_data_bytes(profile: str, words: int) -> int:
+    """ShareData bytes: the full arithmetic table (Full) or word shares only (Compact)."""
+    count = words + (words // 3 + 4 if profile == "full" else 0)
+    return (12 * count + 7) // 8
+
+
+def header_bytes(profile: str) -> int:
+    """Prefix, V, F, L and the K/X path fields."""
+    return 2 + 3 + 2 * PATH_BYTES[profile]
+
+
+def layout_size(profile: str, words: int, batch: int, rbt: int, hash_bytes: int) -> int:
+    """Payload bytes of a layout; the spec lengths reproduce `payload_size`."""
+    return header_bytes(profile) + batch + rbt + share_data_bytes(profile, words) + hash_bytes
+
+
+def min_version(size: int, ec: str) -> int | None:
+    """Smallest QR version holding `size` bytes in byte mode at `ec`, or None."""
+    for version in range(1, 41):
+        bits = 4 + mode_sizes_for_version(version)[MODE_8BIT_BYTE] + 8 * size
+        if bits <= BIT_LIMIT_TABLE[EC_LEVELS[ec]][version]:
+            return version
+    return None
+
+
+def layout_payload(profile: str, words: int, opaque: int, rng: random.Random) -> bytes:
+    """
+    A realistic payload whose Session Batch ID, RBT and Transport Hash
+    together take `opaque` bytes.
+
+    Those three fields are uniformly random bytes in a real payload, so only
+    their total length matters to the encoded symbol: the header and
+    ShareData come from a spec payload and the rest is random.
+    """
+    spec = random_payload(profile, words, rng)
+    head = header_bytes(profile)
+    start = head + BATCH_BYTES[profile] + RBT_BYTES[profile]
+    share = spec[start:start + share_data_bytes(profile, words)]
+    return spec[:head] + share + rng.randbytes(opaque)
+
+
+def _estimate_task(args: tuple) -> tuple[tuple, np.ndarray]:
+    """Pool task: encoder-picked hand-marks for `count` payloads of one encoding key."""
+    key, count, seed = args
+    profile, words, opaque, version, ec = key
+    rng = random.Random(seed)
+    picked = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        dark, chosen = mask_counts(version, EC_LEVELS[ec], layout_payload(profile, words, opaque, rng))
+        picked[i] = dark[chosen]
+    return key, picked
+
+
+def enumerate_variants(profiles, words, batches, rbts, hashes, ecs, extra_versions: int = 0) -> list[dict]:
+    """Every layout x EC level x version (the smallest fit plus `extra_versions` more)."""
+    variants = []
+    for profile, w, batch, rbt, h, ec in itertools.product(profiles, words, batches, rbts, hashes, ecs):
+        size = layout_size(profile, w, batch, rbt, h)
+        first = min_version(size, ec)
+        if first is None:
+            continue
+        for version in range(first, min(first + extra_versions, 40) + 1):
+            variants.append({
+                "profile": profile, "words": w, "batch": batch, "rbt": rbt, "hash": h,
+                "ec": ec, "version": version, "payload_bytes": size,
+                "spec": (batch, rbt, h) == (BATCH_BYTES[profile], RBT_BYTES[profile],
+                                            HASH_BYTES if profile == "full" else 0),
+            })
+    return variants
+
+
+def encoding_key(v: dict) -> tuple:
+    return (v["profile"], v["words"], v["batch"] + v["rbt"] + v["hash"], v["version"], v["ec"])
+
+
+def estimate(variants: list[dict], samples: int, workers: int | None = None,
+             seed: int | None = None, chunk: int = 25) -> dict[tuple, dict]:
+    """
+    Expected hand-marks per distinct encoding.
+
+    Variants that differ only in how the opaque bytes are split between the
+    Batch ID, RBT and Hash encode identically, so each (profile, words,
+    opaque bytes, version, EC) key is sampled once and shared.
+
+    Args:
+        variants: Output of `enumerate_variants`
+        samples: Random payloads per distinct encoding
+        workers: Pool size (default: all CPU cores)
+        seed: Master seed (None: fresh entropy)
+        chunk: Payloads per pool task
+
+    Returns:
+        Encoding key -> hand-mark statistics under the encoder's mask choice,
+        plus the representative (byte-ramp) count from `analyze`
+    """
+    keys = sorted({encoding_key(v) for v in variants})
+    master = np.random.SeedSequence(seed)
+    tasks = []
+    for key in keys:
+        for start in range(0, samples, chunk):
+            task_seed = int(master.spawn(1)[0].generate_state(1, dtype=np.uint64)[0])
+            tasks.append((key, min(chunk, samples - start), task_seed))
+    picked: dict[tuple, list] = {key: [] for key in keys}
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for key, counts in pool.imap_unordered(_estimate_task, tasks):
+            picked[key].append(counts)
+
+    results = {}
+    for key in keys:
+        profile, words, opaque, version, ec = key
+        d = np.concatenate(picked[key])
+        size = header_bytes(profile) + share_data_bytes(profile, words) + opaque
+        rep = analyze("", version, EC_LEVELS[ec], representative_payload(profile, size), quiet=True)
+        stats = {"mean": float(d.mean()), "std": float(d.std()),
+                 "sem": float(d.std(ddof=1) / np.sqrt(len(d))) if len(d) > 1 else 0.0,
+                 "max": int(d.max())}
+        stats.update({f"p{q}": float(np.percentile(d, q)) for q in PERCENTILES})
+        stats.update({"hand_cells": rep["hand_cells"], "representative": rep["hand_dark"]})
+        results[key] = stats
+    return results
+
+
+def _objective_values(v: dict, objectives) -> tuple:
+    values = {
+        "ec": EC_ORDER.index(v["ec"]),
+        "hash": v["hash"],
+        "rbt": v["rbt"],
+        "batch": v["batch"],
+        "checksums": int(v["profile"] == "full"),
+    }
+    return tuple(values[o] for o in objectives)
+
+
+def pareto_front(variants: list[dict], objectives=OBJECTIVES, sigmas: float = 2.0) -> list[dict]:
+    """
+    Non-dominated variants per word count.
+
+    A variant dominates another of the same word count if it keeps at least
+    as much of every objective (EC level, Transport Hash / RBT / Batch ID
+    length, row and column checksums) and needs no more expected hand-marks,
+    with at least one strict improvement. Mean hand-marks within `sigmas`
+    combined standard errors count as equal, so sampling noise between
+    variants on the same QR version does not keep dominated layouts alive.
+    """
+    front = []
+    for words in sorted({v["words"] for v in variants}):
+        group = [v for v in variants if v["words"] == words]
+        scored = [(v["hand_marks"]["mean"], v["hand_marks"]["sem"],
+                   _objective_values(v, objectives), v) for v in group]
+        for cost, sem, gain, v in scored:
+            dominated = any(
+                all(g >= h for g, h in zip(o, gain))
+                and c <= cost + sigmas * np.hypot(s, sem)
+                and (c < cost or o != gain)
+                for c, s, o, other in scored if other is not v
+            )
+            if not dominated:
+                front.append(v)
+    return sorted(front, key=lambda v: (v["words"], v["hand_marks"]["mean"]))
+
+
+def _describe(v: dict) -> str:
+    return (f"{v['profile']:<8}{v['words']:>3}w  B{v['batch']:>2} R{v['rbt']:>2} H{v['hash']:>2}  "
+            f"{v['payload_bytes']:>4} B  V{v['version']}-{v['ec']}")
+
+
+def print_front(front: list[dict]) -> None:
+    print(f"{'layout':<44}{'mean':>8}{'p95':>7}{'max':>6}{'cells':>7}")
+    words = None
+    for v in front:
+        if v["words"] != words:
+            words = v["words"]
+            print()
+        h = v["hand_marks"]
+        print(f"{_describe(v) + (' *' if v['spec'] else ''):<44}{h['mean']:>8.1f}"
+              f"{h['p95']:>7.0f}{h['max']:>6}{h['hand_cells']:>7}")
+    print("\n* spec layout")
+
+
+def check() -> None:
+    """Cross-check sizes, versions and the opaque-byte equivalence."""
+    for profile in ("full", "compact"):
+        for words in WORD_COUNT_CODES:
+            spec = (BATCH_BYTES[profile], RBT_BYTES[profile], HASH_BYTES if profile == "full" else 0)
+            assert layout_size(profile, words, *spec) == payload_size(profile, words)
+    print("✓ Spec layouts reproduce the payload size tables")
+
+    import qrcode
+    for size in (20, 53, 99, 150, 400):
+        for ec in EC_ORDER:
+            qr = qrcode.QRCode(error_correction=EC_LEVELS[ec])
+            qr.add_data(b"\xff" * size)
+            assert min_version(size, ec) == qr.best_fit(), (size, ec)
+    print("✓ Minimum versions match the encoder's best fit")
+
+    rng = random.Random(0)
+    for profile in ("full", "compact"):
+        opaque = BATCH_BYTES[profile] + RBT_BYTES[profile] + (HASH_BYTES if profile == "full" else 0)
+        payload = layout_payload(profile, 24, opaque, rng)
+        assert len(payload) == payload_size(profile, 24)
+    print("✓ Layout payloads have the layout size")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+
+    def ints(text: str) -> list[int]:
+        return [int(x) for x in text.split(",")]
+
+    parser.add_argument("--profiles", default="full,compact", help="comma-separated profiles")
+    parser.add_argument("--words", type=ints, default=list(WORD_COUNT_CODES),
+                        help="comma-separated word counts (default: all)")
+    parser.add_argument("--batch", type=ints, default=list(DEFAULT_BATCH),
+                        help="Session Batch ID lengths in bytes (default: 4,8)")
+    parser.add_argument("--rbt", type=ints, default=list(DEFAULT_RBT),
+                        help="RBT lengths in bytes (default: 6,12)")
+    parser.add_argument("--hash", type=ints, default=list(DEFAULT_HASH),
+                        help="Transport Hash lengths in bytes (default: 0,8,16)")
+    parser.add_argument("--ec", default=EC_ORDER, help="EC levels to sweep (default: LMQH)")
+    parser.add_argument("--extra-versions", type=int, default=0,
+                        help="also try this many versions above the smallest fit")
+    parser.add_argument("--objectives", default=",".join(OBJECTIVES),
+                        help=f"Pareto objectives besides hand-marks (default: {','.join(OBJECTIVES)})")
+    parser.add_argument("--sigmas", type=float, default=2.0,
+                        help="hand-mark means within this many standard errors tie (default: 2)")
+    parser.add_argument("--samples", type=int, default=50,
+                        help="random payloads per distinct encoding (default: 50)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--all", action="store_true", help="print every variant, not only the frontier")
+    parser.add_argument("--check", action="store_true", help="run the consistency checks and exit")
+    parser.add_argument("--output", type=Path, default=None, help="write all variants as JSON")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    profiles = args.profiles.split(",")
+    objectives = args.objectives.split(",")
+    for name in profiles:
+        if name not in PATH_BYTES:
+            parser.error(f"unknown profile: {name}")
+    for name in objectives:
+        if name not in OBJECTIVES:
+            parser.error(f"unknown objective: {name}")
+    if set(args.ec) - set(EC_ORDER):
+        parser.error(f"EC levels must be drawn from {EC_ORDER}")
+
+    variants = enumerate_variants(profiles, args.words, args.batch, args.rbt, args.hash,
+                                  args.ec, args.extra_versions)
+    distinct = len({encoding_key(v) for v in variants})
+    print(f"DuraShare payload/QR design sweep: {len(variants)} variants, "
+          f"{distinct} distinct encodings x {args.samples} payloads")
+    start = time.perf_counter()
+    stats = estimate(variants, args.samples, args.workers, args.seed)
+    for v in variants:
+        v["hand_marks"] = stats[encoding_key(v)]
+    front = pareto_front(variants, objectives, args.sigmas)
+    for v in variants:
+        v["pareto"] = any(v is f for f in front)
+    print(f"Estimated in {time.perf_counter() - start:.1f}s; "
+          f"{len(front)} variants on the frontier\n")
+
+    print_front(sorted(variants, key=lambda v: (v["words"], v["hand_marks"]["mean"]))
+                if args.all else front)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"samples": args.samples, "seed": args.seed, "objectives": objectives,
+                       "sigmas": args.sigmas,
+                       "variants": variants}, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
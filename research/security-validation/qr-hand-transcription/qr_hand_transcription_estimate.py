@@ -2,15 +2,32 @@
 """Structural estimate of QR hand-mark burden for DuraShare share payloads.
 
 Reproduces the v0.7.0 whitepaper's representative Full vs Compact
-QR hand-transcription workload estimate. Requires: pip install qrcode
+QR hand-transcription workload estimate, for every baseline profile in the
+software spec (V3-L/M, V5-M, V6-M) or any QR version 1-40 and EC level.
+With --monte-carlo N, encodes N realistic random payloads per baseline
+across a process pool and reports the distribution of dark hand-marks per
+mask pattern and for the mask the encoder picks.
+Requires: pip install qrcode
 
 See README.md in this directory.
 """
 from __future__ import annotations
 
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
 try:
     import qrcode
-    from qrcode.constants import ERROR_CORRECT_L, ERROR_CORRECT_M
+    from qrcode.constants import ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H
 except ModuleNotFoundError as exc:
     raise SystemExit(
         "Missing optional dependency 'qrcode'. Install research dependencies with "
@@ -18,82 +35,340 @@ except ModuleNotFoundError as exc:
         "or run `pip install qrcode` for this script only."
     ) from exc
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.payload import payload_size, random_payload
+
+EC_LEVELS = {
+    "L": ERROR_CORRECT_L,
+    "M": ERROR_CORRECT_M,
+    "Q": ERROR_CORRECT_Q,
+    "H": ERROR_CORRECT_H,
+}
+
+# Alignment-pattern center coordinates per version (ISO/IEC 18004, Annex E)
+ALIGNMENT_CENTERS: dict[int, tuple[int, ...]] = {
+    1: (),
+    2: (6, 18), 3: (6, 22), 4: (6, 26), 5: (6, 30), 6: (6, 34),
+    7: (6, 22, 38), 8: (6, 24, 42), 9: (6, 26, 46), 10: (6, 28, 50),
+    11: (6, 30, 54), 12: (6, 32, 58), 13: (6, 34, 62),
+    14: (6, 26, 46, 66), 15: (6, 26, 48, 70), 16: (6, 26, 50, 74),
+    17: (6, 30, 54, 78), 18: (6, 30, 56, 82), 19: (6, 30, 58, 86),
+    20: (6, 34, 62, 90),
+    21: (6, 28, 50, 72, 94), 22: (6, 26, 50, 74, 98), 23: (6, 30, 54, 78, 102),
+    24: (6, 28, 54, 80, 106), 25: (6, 32, 58, 84, 110), 26: (6, 30, 58, 86, 114),
+    27: (6, 34, 62, 90, 118),
+    28: (6, 26, 50, 74, 98, 122), 29: (6, 30, 54, 78, 102, 126),
+    30: (6, 26, 52, 78, 104, 130), 31: (6, 30, 56, 82, 108, 134),
+    32: (6, 34, 60, 86, 112, 138), 33: (6, 30, 58, 86, 114, 142),
+    34: (6, 34, 62, 90, 118, 146),
+    35: (6, 30, 54, 78, 102, 126, 150), 36: (6, 24, 50, 76, 102, 128, 154),
+    37: (6, 28, 54, 80, 106, 132, 158), 38: (6, 32, 58, 84, 110, 136, 162),
+    39: (6, 26, 54, 82, 110, 138, 166), 40: (6, 30, 58, 86, 114, 142, 170),
+}
+
+# Baseline share QRs from the software spec: (profile, word count, version, EC)
+BASELINES = [
+    ("full", 12, 5, "M"),
+    ("full", 15, 5, "M"),
+    ("full", 18, 6, "M"),
+    ("full", 21, 6, "M"),
+    ("full", 24, 6, "M"),
+    ("compact", 12, 3, "M"),
+    ("compact", 15, 3, "M"),
+    ("compact", 18, 3, "L"),
+    ("compact", 21, 3, "L"),
+    ("compact", 24, 3, "L"),
+]
+
+PERCENTILES = (5, 50, 95, 99)
+
 
-def structural_modules(version: int) -> set[tuple[int, int]]:
-    n = 17 + 4 * version
-    s: set[tuple[int, int]] = set()
+def symbol_size(version: int) -> int:
+    if not 1 <= version <= 40:
+        raise ValueError(f"QR version must be 1-40, got {version}")
+    return 17 + 4 * version
 
-    def box(r0: int, c0: int, h: int, w: int) -> None:
-        for r in range(r0, r0 + h):
-            for c in range(c0, c0 + w):
-                if 0 <= r < n and 0 <= c < n:
-                    s.add((r, c))
 
-    for r0, c0 in [(0, 0), (0, n - 7), (n - 7, 0)]:
-        box(r0 - 1, c0 - 1, 9, 9)
-    for i in range(8, n - 8):
-        s.add((6, i))
-        s.add((i, 6))
-    centers = {3: [6, 22], 5: [6, 30]}[version]
+def _frozen(mask: np.ndarray) -> np.ndarray:
+    mask.setflags(write=False)
+    return mask
+
+
+@lru_cache(maxsize=None)
+def structural_mask(version: int) -> np.ndarray:
+    """Finders with separators, timing strips, alignment patterns and the dark module."""
+    n = symbol_size(version)
+    m = np.zeros((n, n), dtype=bool)
+    m[:8, :8] = m[:8, n - 8:] = m[n - 8:, :8] = True  # finders + separators
+    m[6, 8:n - 8] = m[8:n - 8, 6] = True  # timing strips
+    centers = ALIGNMENT_CENTERS[version]
+    last = centers[-1] if centers else None
     for r in centers:
         for c in centers:
-            if r == 6 and c == 6:
-                continue
-            in_finder = (
-                (r <= 8 and c <= 8)
-                or (r <= 8 and c >= n - 9)
-                or (r >= n - 9 and c <= 8)
-            )
-            if in_finder or r == 6 or c == 6:
+            if (r, c) in ((6, 6), (6, last), (last, 6)):  # would overlap a finder
                 continue
-            box(r - 2, c - 2, 5, 5)
-    s.add((4 * version + 9, 8))
-    return s
-
-
-def format_modules(version: int) -> set[tuple[int, int]]:
-    n = 17 + 4 * version
-    s: set[tuple[int, int]] = set()
-    for c in range(9):
-        s.add((8, c))
-    for r in range(9):
-        s.add((r, 8))
-    for c in range(n - 8, n):
-        s.add((8, c))
-    for r in range(n - 7, n):
-        s.add((r, 8))
-    return s
-
-
-def analyze(label: str, version: int, ec, payload: bytes) -> None:
-    n = 17 + 4 * version
-    template = structural_modules(version) | format_modules(version)
-    qr = qrcode.QRCode(version=version, error_correction=ec, box_size=1, border=0)
+            m[r - 2:r + 3, c - 2:c + 3] = True
+    m[4 * version + 9, 8] = True  # dark module
+    return _frozen(m)
+
+
+@lru_cache(maxsize=None)
+def format_mask(version: int) -> np.ndarray:
+    """Both copies of the 15-bit format information."""
+    n = symbol_size(version)
+    m = np.zeros((n, n), dtype=bool)
+    m[8, :9] = m[:9, 8] = True
+    m[8, n - 8:] = m[n - 7:, 8] = True
+    return _frozen(m)
+
+
+@lru_cache(maxsize=None)
+def version_mask(version: int) -> np.ndarray:
+    """Both 6x3 copies of the 18-bit version information (versions 7+)."""
+    n = symbol_size(version)
+    m = np.zeros((n, n), dtype=bool)
+    if version >= 7:
+        m[:6, n - 11:n - 8] = m[n - 11:n - 8, :6] = True
+    return _frozen(m)
+
+
+@lru_cache(maxsize=None)
+def template_mask(version: int) -> np.ndarray:
+    """Every module a pre-printed template fixes; the rest is the hand region."""
+    return _frozen(structural_mask(version) | format_mask(version) | version_mask(version))
+
+
+def data_module_count(version: int) -> int:
+    """Data + EC + remainder modules of a version (ISO/IEC 18004 formula)."""
+    n = symbol_size(version)
+    count = n * n - 3 * 64 - 31 - 2 * (n - 16)
+    if version >= 2:
+        k = version // 7 + 2
+        count -= 25 * (k * k - 3) - 10 * (k - 2)
+    if version >= 7:
+        count -= 36
+    return count
+
+
+def qr_matrix(version: int, ec, payload: bytes, mask_pattern: int | None = None) -> np.ndarray:
+    """Module matrix (True = dark) of a byte-mode QR without quiet zone."""
+    qr = qrcode.QRCode(version=version, error_correction=ec, box_size=1, border=0,
+                       mask_pattern=mask_pattern)
     qr.add_data(payload)
     qr.make(fit=False)
-    mat = qr.get_matrix()
-    hand = [(r, c) for r in range(n) for c in range(n) if (r, c) not in template]
-    hand_dark = sum(1 for r, c in hand if mat[r][c])
-    print(
-        f"{label}: symbol {n}x{n}={n*n}; template {len(template)} modules; "
-        f"hand region {len(hand)} cells; hand dark marks {hand_dark}"
-    )
+    return np.array(qr.get_matrix(), dtype=bool)
+
+
+def analyze(label: str, version: int, ec, payload: bytes, quiet: bool = False) -> dict:
+    n = symbol_size(version)
+    template = template_mask(version)
+    hand = ~template
+    hand_dark = int(np.count_nonzero(qr_matrix(version, ec, payload) & hand))
+    result = {
+        "label": label,
+        "version": version,
+        "symbol": n,
+        "template": int(np.count_nonzero(template)),
+        "hand_cells": int(np.count_nonzero(hand)),
+        "hand_dark": hand_dark,
+    }
+    if not quiet:
+        print(
+            f"{label}: symbol {n}x{n}={n*n}; template {result['template']} modules; "
+            f"hand region {result['hand_cells']} cells; hand dark marks {hand_dark}"
+        )
+    return result
+
+
+def baseline_label(profile: str, words: int, version: int, ec: str) -> str:
+    return (f"{profile.capitalize()} {words}-word "
+            f"(V{version}-{ec}, {payload_size(profile, words)} B payload)")
+
+
+def representative_payload(profile: str, size: int) -> bytes:
+    """`SF`/`SC` prefix followed by a fixed byte ramp, `size` bytes in total."""
+    prefix = b"SC" if profile == "compact" else b"SF"
+    return prefix + bytes(i % 256 for i in range(size - 2))
+
+
+def mask_counts(version: int, ec, payload: bytes) -> tuple[np.ndarray, int]:
+    """
+    Hand dark marks under each of the 8 mask patterns, and the encoder's pick.
+
+    The pick replicates qrcode's best_mask_pattern: the first mask with the
+    lowest penalty score on a test matrix (format/version bits light).
+    Format and version bits lie in the template, so the counts do not
+    depend on them.
+    """
+    hand = ~template_mask(version)
+    qr = qrcode.QRCode(version=version, error_correction=ec, box_size=1, border=0)
+    qr.add_data(payload)
+    dark = np.empty(8, dtype=np.int64)
+    best, best_penalty = 0, None
+    for mask in range(8):
+        qr.makeImpl(True, mask)
+        dark[mask] = np.count_nonzero(np.array(qr.modules, dtype=bool) & hand)
+        penalty = qrcode.util.lost_point(qr.modules)
+        if best_penalty is None or penalty < best_penalty:
+            best, best_penalty = mask, penalty
+    return dark, best
+
+
+def _monte_carlo_task(args: tuple) -> tuple[int, np.ndarray, np.ndarray]:
+    """Pool task: `count` random payloads of one baseline."""
+    index, (profile, words, version, ec), count, seed = args
+    rng = random.Random(seed)
+    dark = np.empty((count, 8), dtype=np.int64)
+    chosen = np.empty(count, dtype=np.int64)
+    for i in range(count):
+        payload = random_payload(profile, words, rng)
+        dark[i], chosen[i] = mask_counts(version, EC_LEVELS[ec], payload)
+    return index, dark, chosen
+
+
+def _distribution(values: np.ndarray) -> dict:
+    stats = {"mean": float(values.mean()), "std": float(values.std()),
+             "min": int(values.min()), "max": int(values.max())}
+    stats.update({f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES})
+    return stats
+
+
+def monte_carlo(baselines: list, samples: int, workers: int | None = None,
+                seed: int | None = None, chunk: int = 50) -> list[dict]:
+    """
+    Dark hand-mark distribution over random payloads for each baseline.
+
+    Args:
+        baselines: (profile, word count, version, EC) tuples
+        samples: Random payloads per baseline
+        workers: Pool size (default: all CPU cores)
+        seed: Master seed (None: fresh entropy)
+        chunk: Payloads per pool task
+
+    Returns:
+        One dict per baseline: the distribution under the encoder's mask
+        choice, per-mask means and maxima, how often each mask is chosen,
+        and the worst case over all masks
+    """
+    master = np.random.SeedSequence(seed)
+    tasks = []
+    for index, baseline in enumerate(baselines):
+        for start in range(0, samples, chunk):
+            task_seed = int(master.spawn(1)[0].generate_state(1, dtype=np.uint64)[0])
+            tasks.append((index, baseline, min(chunk, samples - start), task_seed))
+    dark = [[] for _ in baselines]
+    chosen = [[] for _ in baselines]
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for index, d, c in pool.imap_unordered(_monte_carlo_task, tasks):
+            dark[index].append(d)
+            chosen[index].append(c)
+
+    results = []
+    for index, (profile, words, version, ec) in enumerate(baselines):
+        d = np.concatenate(dark[index])
+        c = np.concatenate(chosen[index])
+        picked = d[np.arange(len(c)), c]
+        results.append({
+            "label": baseline_label(profile, words, version, ec),
+            "profile": profile, "words": words, "version": version, "ec": ec,
+            "payload_bytes": payload_size(profile, words),
+            "samples": int(len(c)),
+            "hand_cells": int(np.count_nonzero(~template_mask(version))),
+            "encoder_mask": _distribution(picked),
+            "per_mask_mean": [float(m) for m in d.mean(axis=0)],
+            "per_mask_max": [int(m) for m in d.max(axis=0)],
+            "mask_chosen_frequency": [float(f) for f in np.bincount(c, minlength=8) / len(c)],
+            "worst_case_any_mask": int(d.max()),
+            "best_case_any_mask": int(d.min()),
+        })
+    return results
+
+
+def print_monte_carlo(results: list[dict]) -> None:
+    print(f"{'baseline':<42}{'mean':>8}{'std':>7}{'p5':>6}{'p50':>6}{'p95':>6}"
+          f"{'p99':>6}{'max':>6}{'worst':>7}")
+    for r in results:
+        e = r["encoder_mask"]
+        print(f"{r['label']:<42}{e['mean']:>8.1f}{e['std']:>7.1f}{e['p5']:>6.0f}"
+              f"{e['p50']:>6.0f}{e['p95']:>6.0f}{e['p99']:>6.0f}{e['max']:>6}"
+              f"{r['worst_case_any_mask']:>7}")
+    print("\nmean / max and encoder choice frequency per mask pattern:")
+    for r in results:
+        cells = "  ".join(f"{m}:{mean:.0f}/{mx} {f:4.0%}" for m, (mean, mx, f) in enumerate(
+            zip(r["per_mask_mean"], r["per_mask_max"], r["mask_chosen_frequency"])))
+        print(f"  {r['label']:<40} {cells}")
+
+
+def check() -> None:
+    """Cross-check the templates for all 40 versions."""
+    from qrcode.util import PATTERN_POSITION_TABLE
+
+    for version in range(1, 41):
+        assert list(ALIGNMENT_CENTERS[version]) == list(PATTERN_POSITION_TABLE[version - 1]), version
+        hand = int(np.count_nonzero(~template_mask(version)))
+        assert hand == data_module_count(version), (version, hand, data_module_count(version))
+    print("✓ Alignment tables match qrcode for versions 1-40")
+    print("✓ Hand region equals the data+EC+remainder module count for versions 1-40")
+
+    rng = random.Random(0)
+    for profile, words, version, ec in BASELINES:
+        payload = random_payload(profile, words, rng)
+        dark, chosen = mask_counts(version, EC_LEVELS[ec], payload)
+        encoded = qr_matrix(version, EC_LEVELS[ec], payload)
+        assert dark[chosen] == np.count_nonzero(encoded & ~template_mask(version)), profile
+    print("✓ Per-mask counts and mask choice match the encoder for every baseline")
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", type=int, default=None,
+                        help="analyze one QR version (1-40) instead of the spec baselines")
+    parser.add_argument("--ec", choices=sorted(EC_LEVELS), default="M",
+                        help="error-correction level for --version (default: M)")
+    parser.add_argument("--bytes", type=int, default=None,
+                        help="payload size for --version (default: 99)")
+    parser.add_argument("--check", action="store_true",
+                        help="verify the structural templates for all versions and exit")
+    parser.add_argument("--monte-carlo", type=int, default=None, metavar="N",
+                        help="encode N random payloads per baseline and report distributions")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --monte-carlo (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for --monte-carlo")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="write --monte-carlo results as JSON")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    if args.monte_carlo:
+        baselines = ([("full", 24, args.version, args.ec)] if args.version is not None
+                     else BASELINES)
+        print(f"DuraShare share QR hand-mark distribution: {args.monte_carlo} random "
+              f"payloads per baseline\n")
+        start = time.perf_counter()
+        results = monte_carlo(baselines, args.monte_carlo, args.workers, args.seed)
+        print_monte_carlo(results)
+        print(f"\n{len(baselines) * args.monte_carlo} payloads x 8 masks in "
+              f"{time.perf_counter() - start:.1f}s")
+        if args.output:
+            args.output.parent.mkdir(parents=True, exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump({"samples": args.monte_carlo, "seed": args.seed,
+                           "results": results}, f, indent=2)
+            print(f"Results saved to: {args.output}")
+        return
+
     print("DuraShare share QR hand-mark estimate (template-assisted)\n")
-    analyze(
-        "Full 24-word (V6-M, 99 B payload)",
-        6,
-        ERROR_CORRECT_M,
-        b"SF" + bytes(range(97)),
-    )
-    analyze(
-        "Compact 24-word (V3-L, 53 B payload)",
-        3,
-        ERROR_CORRECT_L,
-        b"SC" + bytes(range(51)),
-    )
+    if args.version is not None:
+        size = args.bytes or 99
+        analyze(f"Custom {size} B payload (V{args.version}-{args.ec})", args.version,
+                EC_LEVELS[args.ec], representative_payload("Full", size))
+        return
+    for profile, words, version, ec in BASELINES:
+        analyze(baseline_label(profile, words, version, ec), version, EC_LEVELS[ec],
+                representative_payload(profile, payload_size(profile, words)))
 
 
 if __name__ == "__main__":
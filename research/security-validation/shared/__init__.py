@@ -4,26 +4,52 @@ Shared utilities for DuraShare security validation experiments.
 This module provides common functionality used across all three experiments:
 - Bridge to JavaScript reference implementation
 - BIP39 utilities
-- Finite field arithmetic
+- Finite field arithmetic (GF2053, and GF(p) toy fields) and GF(p) linear
+  algebra (gf_linalg)
 - Result reporting and visualization
+- Columnar per-trial result storage
+- Cross-run results warehouse (SQLite)
+- Per-stage profiling
+
+Submodules are imported lazily on first attribute access, so spawned pool
+workers and short CLI runs do not pay for plotting libraries (matplotlib,
+seaborn) or the BIP39 wordlist unless they actually use them. Run
+`python -m shared` to check the import-time budget.
 """
 
-from .schiavinato_bridge import SchiavatoJS, Share
-from .bip39_utils import generate_random_bip39, is_valid_bip39, mnemonic_to_indices
-from .field_arithmetic import GF2053
-from .reporting import ExperimentReport, save_results, generate_summary
-
-__all__ = [
-    'SchiavatoJS',
-    'Share',
-    'generate_random_bip39',
-    'is_valid_bip39',
-    'mnemonic_to_indices',
-    'GF2053',
-    'ExperimentReport',
-    'save_results',
-    'generate_summary',
-]
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    'SchiavatoJS': 'schiavinato_bridge',
+    'Share': 'schiavinato_bridge',
+    'generate_random_bip39': 'bip39_utils',
+    'is_valid_bip39': 'bip39_utils',
+    'mnemonic_to_indices': 'bip39_utils',
+    'GF2053': 'field_arithmetic',
+    'GF': 'field_arithmetic',
+    'ExperimentReport': 'reporting',
+    'save_results': 'reporting',
+    'generate_summary': 'reporting',
+    'Profiler': 'profiling',
+    'save_columns': 'columnar',
+    'load_columns': 'columnar',
+    'ResultsWarehouse': 'warehouse',
+}
+
+__all__ = list(_LAZY_EXPORTS)
 
 __version__ = '0.1.0'
 
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache: later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
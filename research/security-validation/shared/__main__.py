@@ -0,0 +1,14 @@
+"""
+Package self-check: `python -m shared`.
+
+Confirms that the lazy imports in shared/__init__ hold: `import shared` and
+the helpers pool workers use must stay within the import-time budget and
+must not pull in plotting or other heavy libraries.
+"""
+
+from .profiling import IMPORT_BUDGET_SECONDS, verify_import_budget
+
+print("Shared Package Self-Check")
+print("=" * 60)
+verify_import_budget()
+print(f"✓ Import-time budget passed ({IMPORT_BUDGET_SECONDS * 1000:.0f} ms)")
@@ -4,23 +4,45 @@ BIP39 mnemonic utilities for validation experiments.
 Provides functions for generating, validating, and manipulating BIP39 mnemonics.
 """
 
+import random
 import secrets
-from typing import List, Optional
-from mnemonic import Mnemonic
+import functools
+from typing import Dict, List, Optional
 
 
-# Initialize BIP39 wordlist (English)
-_mnemonic_generator = Mnemonic("english")
-WORDLIST = _mnemonic_generator.wordlist
+@functools.lru_cache(maxsize=None)
+def _mnemonic_generator():
+    """BIP39 (English) helper, built on first use rather than at import."""
+    from mnemonic import Mnemonic
+    return Mnemonic("english")
 
 
-def generate_random_bip39(word_count: int = 24, entropy_bits: Optional[int] = None) -> str:
+@functools.lru_cache(maxsize=None)
+def _word_to_index() -> Dict[str, int]:
+    """Word -> 0-based wordlist position (constant-time lookups)."""
+    return {word: i for i, word in enumerate(_mnemonic_generator().wordlist)}
+
+
+def __getattr__(name):
+    # WORDLIST stays available as a module attribute without eager loading
+    if name == "WORDLIST":
+        return _mnemonic_generator().wordlist
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def generate_random_bip39(
+    word_count: int = 24,
+    entropy_bits: Optional[int] = None,
+    rng: Optional[random.Random] = None
+) -> str:
     """
     Generate a random valid BIP39 mnemonic.
     
     Args:
         word_count: Number of words (12 or 24)
         entropy_bits: Override entropy bits (default: 128 for 12 words, 256 for 24)
+        rng: Seeded generator for reproducible experiments (default: the
+             `secrets` CSPRNG). Never use a seeded generator for real backups.
     
     Returns:
         Valid BIP39 mnemonic string
@@ -34,11 +56,14 @@ def generate_random_bip39(word_count: int = 24, entropy_bits: Optional[int] = No
     if entropy_bits is None:
         entropy_bits = 128 if word_count == 12 else 256
     
-    # Generate cryptographically secure random entropy
-    entropy = secrets.token_bytes(entropy_bits // 8)
+    # Generate cryptographically secure random entropy (or seeded, for experiments)
+    if rng is None:
+        entropy = secrets.token_bytes(entropy_bits // 8)
+    else:
+        entropy = rng.randbytes(entropy_bits // 8)
     
     # Generate mnemonic with proper checksum
-    mnemonic = _mnemonic_generator.to_mnemonic(entropy)
+    mnemonic = _mnemonic_generator().to_mnemonic(entropy)
     
     return mnemonic
 
@@ -54,7 +79,7 @@ def is_valid_bip39(mnemonic: str) -> bool:
         True if valid, False otherwise
     """
     try:
-        return _mnemonic_generator.check(mnemonic)
+        return _mnemonic_generator().check(mnemonic)
     except Exception:
         return False
 
@@ -73,15 +98,15 @@ def mnemonic_to_indices(mnemonic: str) -> List[int]:
         ValueError: If mnemonic contains invalid words
     """
     words = mnemonic.strip().lower().split()
+    word_to_index = _word_to_index()
     indices = []
     
     for word in words:
-        try:
-            index = WORDLIST.index(word)
-            # Convert from 0-based array index to 1-based BIP39 index
-            indices.append(index + 1)
-        except ValueError:
+        index = word_to_index.get(word)
+        if index is None:
             raise ValueError(f"Invalid BIP39 word: '{word}'")
+        # Convert from 0-based array index to 1-based BIP39 index
+        indices.append(index + 1)
     
     return indices
 
@@ -103,7 +128,8 @@ def indices_to_mnemonic(indices: List[int]) -> str:
         raise ValueError("All indices must be in range 1-2048")
     
     # Convert from 1-based BIP39 indices to 0-based array indices
-    words = [WORDLIST[i - 1] for i in indices]
+    wordlist = _mnemonic_generator().wordlist
+    words = [wordlist[i - 1] for i in indices]
     return " ".join(words)
 
 
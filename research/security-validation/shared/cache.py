@@ -0,0 +1,430 @@
+"""
+Content-addressed cache for experiment results.
+
+A cache key is the SHA-256 of everything that determines a result: the
+contents of the experiment's source files and of every shared module, the
+configuration (including the seed), and the Python and library versions.
+A library imported from a source checkout rather than installed (the
+sibling schiavinato-sharing-py) has no version, so its source files are
+hashed instead.
+Editing a README changes none of these, so a re-run is served from the
+cache; editing any shared module invalidates every entry that depends on it.
+
+Entries hold the output files (reports, columnar trials, logs) relative to a
+results directory and are restored by copying them back:
+
+    python -m shared.cache stats
+    python -m shared.cache list --limit 10
+    python -m shared.cache invalidate --match "entropy/*"
+    python -m shared.cache invalidate --all
+    python -m shared.cache evict --max-size 500M
+    python -m shared.cache check
+
+The cache is bounded by total size; the least recently used entries are
+evicted first. Only seeded (reproducible) runs should be cached.
+"""
+
+import argparse
+import datetime
+import fnmatch
+import functools
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+SHARED_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = SHARED_DIR.parent / "results" / "cache"
+DEFAULT_MAX_BYTES = 5 << 30
+ENTRY_FILE = "entry.json"
+
+# Libraries whose versions can change a result
+DEFAULT_PACKAGES = ('numpy', 'scipy', 'z3-solver', 'pyarrow', 'schiavinato-sharing')
+
+# Source checkouts the experiments put on sys.path themselves (not installed)
+LIBRARY_PATHS = (SHARED_DIR.parents[2] / 'schiavinato-sharing-py',)
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, mtime_ns: int, size: int) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _package_version(name: str) -> Optional[str]:
+    from importlib import metadata
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _package_sources(name: str) -> Optional[Dict[str, str]]:
+    """
+    Digests of a library's Python sources, for libraries without metadata.
+
+    Looks the import name up on sys.path and then in LIBRARY_PATHS (the
+    sibling checkouts the experiments import from) without importing it.
+    """
+    import importlib.machinery
+    import importlib.util
+
+    module = name.replace('-', '_')
+    try:
+        spec = importlib.util.find_spec(module)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        spec = importlib.machinery.PathFinder.find_spec(module, [str(p) for p in LIBRARY_PATHS])
+    if spec is None or spec.origin in (None, 'built-in', 'frozen'):
+        return None
+    origin = Path(spec.origin)
+    if spec.submodule_search_locations:
+        files, root = sorted(origin.parent.rglob('*.py')), origin.parent
+    else:
+        files, root = [origin], origin.parent
+    digests = {}
+    for path in files:
+        stat = path.stat()
+        digests[path.relative_to(root).as_posix()] = _file_digest(str(path), stat.st_mtime_ns,
+                                                                  stat.st_size)
+    return digests
+
+
+def _package_fingerprint(name: str) -> Any:
+    """Installed version, or the source digests of an uninstalled checkout."""
+    version = _package_version(name)
+    return version if version is not None else _package_sources(name)
+
+
+def shared_sources() -> List[Path]:
+    """All shared Python modules (every experiment imports from them)."""
+    return sorted(SHARED_DIR.glob("*.py"))
+
+
+def cache_key(
+    sources: Iterable[Path],
+    config: Mapping[str, Any],
+    packages: Sequence[str] = DEFAULT_PACKAGES
+) -> str:
+    """
+    Content hash identifying one experiment result.
+
+    Args:
+        sources: Experiment source files; shared modules are always added
+        config: JSON-serializable configuration, including the seed
+        packages: Distributions whose installed versions enter the key; for
+                  one without metadata (e.g. the schiavinato-sharing-py
+                  checkout) its source files are hashed instead
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    files = {Path(p).resolve() for p in sources} | set(shared_sources())
+    root = SHARED_DIR.parent
+    digests = {}
+    for path in sorted(files):
+        stat = path.stat()
+        name = os.path.relpath(path, root)
+        digests[name] = _file_digest(str(path), stat.st_mtime_ns, stat.st_size)
+    material = {
+        'sources': digests,
+        'config': config,
+        'python': platform.python_version(),
+        'packages': {name: _package_fingerprint(name) for name in packages},
+    }
+    blob = json.dumps(material, sort_keys=True, default=str).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+def parse_size(text: str) -> int:
+    """'500M', '2G', '64K' or a plain byte count -> bytes."""
+    text = text.strip().upper()
+    for suffix, shift in (('K', 10), ('M', 20), ('G', 30)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * (1 << shift))
+    return int(text)
+
+
+class ResultCache:
+    """
+    Directory of cache entries, one subdirectory per key.
+
+    Each entry holds `entry.json` (name, configuration, size, creation and
+    last-use times) and a `files/` tree mirroring the results directory.
+    """
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._dir(key) / ENTRY_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, key: str, entry: Dict[str, Any]):
+        path = self._dir(key) / ENTRY_FILE
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp, path)
+
+    def has(self, key: str) -> bool:
+        return self._read_entry(key) is not None
+
+    def get(self, key: str, dest: Path) -> Optional[List[Path]]:
+        """
+        Restore an entry's files under `dest`.
+
+        Args:
+            key: Cache key
+            dest: Results directory the files were stored relative to
+
+        Returns:
+            Restored paths, or None on a miss (or an incomplete entry)
+        """
+        entry = self._read_entry(key)
+        files_dir = self._dir(key) / "files"
+        if entry is None or not files_dir.is_dir():
+            return None
+        restored = []
+        for rel in entry['files']:
+            src = files_dir / rel
+            if not src.is_file():
+                return None
+            target = Path(dest) / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, target)
+            restored.append(target)
+        entry['last_used'] = time.time()
+        entry['hits'] = entry.get('hits', 0) + 1
+        self._write_entry(key, entry)
+        return restored
+
+    def put(
+        self,
+        key: str,
+        paths: Iterable[Path],
+        base: Path,
+        name: str = "",
+        config: Optional[Mapping[str, Any]] = None
+    ) -> int:
+        """
+        Store files (directories are stored recursively) under a key.
+
+        Args:
+            key: Cache key
+            paths: Output files or directories, all inside `base`
+            base: Directory the stored paths are made relative to
+            name: Human-readable label (used by `list` and `--match`)
+            config: Configuration recorded alongside the entry
+
+        Returns:
+            Bytes stored
+        """
+        base = Path(base).resolve()
+        files = []
+        for path in paths:
+            path = Path(path).resolve()
+            if path.is_dir():
+                files.extend(p for p in sorted(path.rglob("*")) if p.is_file())
+            elif path.is_file():
+                files.append(path)
+
+        staging = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        size = 0
+        rels = []
+        for path in files:
+            rel = path.relative_to(base).as_posix()
+            target = staging / "files" / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, target)
+            size += path.stat().st_size
+            rels.append(rel)
+        (staging / "files").mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        with open(staging / ENTRY_FILE, 'w') as f:
+            json.dump({
+                'key': key, 'name': name, 'config': dict(config or {}),
+                'files': rels, 'bytes': size,
+                'created': now, 'last_used': now, 'hits': 0,
+            }, f, indent=2)
+
+        shutil.rmtree(self._dir(key), ignore_errors=True)
+        os.replace(staging, self._dir(key))
+        self.evict()
+        return size
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All readable entries, most recently used first."""
+        found = []
+        for path in self.root.iterdir():
+            if path.is_dir() and not path.name.startswith('.'):
+                entry = self._read_entry(path.name)
+                if entry is not None:
+                    found.append(entry)
+        return sorted(found, key=lambda e: e['last_used'], reverse=True)
+
+    def evict(self, max_bytes: Optional[int] = None) -> List[str]:
+        """
+        Drop least recently used entries until the cache fits.
+
+        Returns:
+            Evicted keys
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(e['bytes'] for e in entries)
+        evicted = []
+        while entries and total > limit:
+            entry = entries.pop()
+            shutil.rmtree(self._dir(entry['key']), ignore_errors=True)
+            total -= entry['bytes']
+            evicted.append(entry['key'])
+        return evicted
+
+    def invalidate(
+        self,
+        keys: Sequence[str] = (),
+        match: Optional[str] = None,
+        older_than: Optional[float] = None,
+        everything: bool = False
+    ) -> int:
+        """
+        Remove entries by key prefix, name glob, age (days) or all of them.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        cutoff = time.time() - older_than * 86400 if older_than is not None else None
+        for entry in self.entries():
+            if (everything
+                    or any(entry['key'].startswith(k) for k in keys)
+                    or (match is not None and fnmatch.fnmatch(entry['name'], match))
+                    or (cutoff is not None and entry['created'] < cutoff)):
+                shutil.rmtree(self._dir(entry['key']), ignore_errors=True)
+                removed += 1
+        for stale in self.root.glob(".*.tmp"):  # interrupted puts
+            shutil.rmtree(stale, ignore_errors=True)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self.entries()
+        return {
+            'root': str(self.root),
+            'entries': len(entries),
+            'bytes': sum(e['bytes'] for e in entries),
+            'max_bytes': self.max_bytes,
+            'hits': sum(e.get('hits', 0) for e in entries),
+        }
+
+
+def check() -> None:
+    """Key changes on source, configuration and uninstalled-library edits; README edits do not matter."""
+    import tempfile
+
+    global LIBRARY_PATHS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        script = tmp / "experiment.py"
+        script.write_text("print('trial')\n")
+        library = tmp / "lib" / "cache_check_library"
+        library.mkdir(parents=True)
+        (library / "__init__.py").write_text("")
+        (library / "core.py").write_text("P = 2053\n")
+        (tmp / "README.md").write_text("notes\n")
+        saved, LIBRARY_PATHS = LIBRARY_PATHS, (tmp / "lib",)  # a checkout not on sys.path
+        try:
+            def key() -> str:
+                return cache_key([script], {'seed': 1}, packages=('cache-check-library',))
+
+            base = key()
+            assert key() == base
+            (tmp / "README.md").write_text("more notes\n")
+            assert key() == base
+            print("✓ Key is stable across runs and documentation edits")
+
+            assert cache_key([script], {'seed': 2}, packages=('cache-check-library',)) != base
+            script.write_text("print('trial', 2)\n")
+            edited = key()
+            assert edited != base
+            print("✓ Key changes with the configuration and the experiment source")
+
+            (library / "core.py").write_text("P = 13  # toy field\n")
+            assert key() != edited
+            print("✓ Key changes when an uninstalled library's source is edited")
+        finally:
+            LIBRARY_PATHS = saved
+
+
+def _when(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp).isoformat(sep=' ', timespec='seconds')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the experiment result cache")
+    parser.add_argument('--dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('stats', help='Entry count and total size')
+
+    p = sub.add_parser('list', help='List entries, most recently used first')
+    p.add_argument('--limit', type=int, default=20)
+
+    p = sub.add_parser('invalidate', help='Remove entries')
+    p.add_argument('keys', nargs='*', help='Key prefixes')
+    p.add_argument('--match', help='Glob on the entry name, e.g. "z3/*"')
+    p.add_argument('--older-than', type=float, metavar='DAYS')
+    p.add_argument('--all', action='store_true')
+
+    p = sub.add_parser('evict', help='Evict least recently used entries down to a size')
+    p.add_argument('--max-size', required=True, help='e.g. 500M, 2G')
+
+    sub.add_parser('check', help='Self-check the cache key in a temporary directory')
+
+    args = parser.parse_args(argv)
+    if args.command == 'check':
+        check()
+        return 0
+    cache = ResultCache(args.dir)
+
+    if args.command == 'stats':
+        s = cache.stats()
+        print(f"{s['entries']} entries, {s['bytes'] / 2**20:.1f} MiB "
+              f"(limit {s['max_bytes'] / 2**20:.0f} MiB), {s['hits']} hits in {s['root']}")
+    elif args.command == 'list':
+        for e in cache.entries()[:args.limit]:
+            print(f"{e['key'][:12]}  {_when(e['last_used'])}  {e['bytes'] / 1024:>9.1f} KiB  "
+                  f"{e.get('hits', 0):>4} hits  {e['name']}")
+    elif args.command == 'invalidate':
+        if not (args.keys or args.match or args.older_than is not None or args.all):
+            parser.error("invalidate needs keys, --match, --older-than or --all")
+        removed = cache.invalidate(args.keys, args.match, args.older_than, args.all)
+        print(f"✓ Removed {removed} entr{'y' if removed == 1 else 'ies'}")
+    elif args.command == 'evict':
+        evicted = cache.evict(parse_size(args.max_size))
+        print(f"✓ Evicted {len(evicted)} entr{'y' if len(evicted) == 1 else 'ies'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,11 +6,18 @@ Provides field operations used in DuraShare:
 - Multiplication (modulo 2053)
 - Modular inverse
 - Polynomial evaluation
+- Evaluation at / interpolation from every field point via a mixed-radix
+  number-theoretic transform (p - 1 = 2052 = 2^2 * 3^3 * 19)
+- `GF(p)`: the same operations over any small prime, table-backed and
+  cached, for scaled-down "toy DuraShare" runs (e.g. GF(13) with words
+  1..8, a 3-bit wordlist analogue) where exhaustive enumeration is feasible
 """
 
 from typing import List, Tuple
 import functools
 
+import numpy as np
+
 
 class GF2053:
     """
@@ -177,6 +184,315 @@ class GF2053:
         for i in range(1, GF2053.PRIME):
             table.append(GF2053.inv(i))
         return table
+    
+    @staticmethod
+    def evaluate_all(coefficients) -> np.ndarray:
+        """
+        Evaluate polynomial(s) at every x in GF(2053) with one NTT.
+        
+        Args:
+            coefficients: [a0, a1, ...] or an array (..., degree+1) of many
+        
+        Returns:
+            Array (..., 2053) whose entry x is P(x)
+        """
+        return evaluate_everywhere(coefficients, GF2053.PRIME)
+    
+    @staticmethod
+    def interpolate_all(values) -> np.ndarray:
+        """
+        Coefficients of the polynomial(s) taking the given values.
+        
+        Args:
+            values: Array (..., 2052) of P(1..2052), or (..., 2053) of P(0..2052)
+        
+        Returns:
+            Coefficients (constant term first), same length as values
+        """
+        return interpolate_everywhere(values, GF2053.PRIME)
+
+
+# ----------------------------------------------------------------------
+# Mixed-radix NTT over the multiplicative group GF(p)* (cyclic, order p-1)
+# ----------------------------------------------------------------------
+
+def _factorize(n: int) -> List[int]:
+    """Prime factors of n with multiplicity, ascending."""
+    factors, d = [], 2
+    while d * d <= n:
+        while n % d == 0:
+            factors.append(d)
+            n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+@functools.lru_cache(maxsize=None)
+def primitive_root(p: int = GF2053.PRIME) -> int:
+    """Smallest generator of GF(p)* (2 for p = 2053)."""
+    order = p - 1
+    primes = set(_factorize(order))
+    for g in range(2, p):
+        if all(pow(g, order // q, p) != 1 for q in primes):
+            return g
+    return 1  # p = 2
+
+
+@functools.lru_cache(maxsize=None)
+def _dft_matrix(r: int, root: int, p: int) -> np.ndarray:
+    exponents = np.outer(np.arange(r), np.arange(r)) % r
+    powers = np.array([pow(root, e, p) for e in range(r)], dtype=np.int64)
+    return powers[exponents]
+
+
+@functools.lru_cache(maxsize=None)
+def _twiddles(r: int, m: int, root: int, p: int) -> np.ndarray:
+    # T[s, k] = root^(s*k), s < r, k < m
+    powers = np.array([pow(root, e, p) for e in range(r * m)], dtype=np.int64)
+    return powers[np.outer(np.arange(r), np.arange(m)) % (r * m)]
+
+
+def _ntt(a: np.ndarray, root: int, factors: Tuple[int, ...], p: int) -> np.ndarray:
+    """
+    X[j] = sum_k a[k] root^(jk) over the last axis (length prod(factors)).
+
+    Decimation in time: split a into r interleaved subsequences, transform
+    each (recursively, batched together), apply twiddles, then combine with
+    an r-point DFT. Intermediate values stay below r * p^2, which fits int64.
+    """
+    r = factors[0]
+    n = a.shape[-1]
+    if len(factors) == 1:
+        return np.einsum('...k,jk->...j', a, _dft_matrix(r, root, p)) % p
+    m = n // r
+    # sub[..., s, i] = a[..., r*i + s]
+    sub = np.swapaxes(a.reshape(a.shape[:-1] + (m, r)), -1, -2)
+    y = _ntt(sub, pow(root, r, p), factors[1:], p)
+    z = y * _twiddles(r, m, root, p) % p
+    # X[t*m + k] = sum_s (root^m)^(t*s) z[s, k]
+    x = np.einsum('ts,...sk->...tk', _dft_matrix(r, pow(root, m, p), p), z) % p
+    return x.reshape(a.shape[:-1] + (n,))
+
+
+def ntt(a, p: int = GF2053.PRIME, inverse: bool = False) -> np.ndarray:
+    """
+    Length-(p-1) number-theoretic transform over GF(p), mixed radix.
+
+    Forward: A[j] = sum_k a[k] g^(jk) = a(g^j) for the primitive root g.
+    Inverse: a[k] = (p-1)^(-1) sum_j A[j] g^(-jk).
+
+    Args:
+        a: Array (..., p-1); leading axes are transformed independently
+        p: Field prime
+        inverse: Apply the inverse transform
+
+    Returns:
+        Transformed array, same shape
+    """
+    a = np.asarray(a, dtype=np.int64) % p
+    n = p - 1
+    if a.shape[-1] != n:
+        raise ValueError(f"Expected last axis of length {n}, got {a.shape[-1]}")
+    g = primitive_root(p)
+    root = pow(g, -1, p) if inverse else g
+    result = _ntt(a, root, tuple(_factorize(n)), p)
+    if inverse:
+        result = result * pow(n, -1, p) % p
+    return result
+
+
+@functools.lru_cache(maxsize=None)
+def _generator_powers(p: int) -> np.ndarray:
+    """x = g^j for j = 0..p-2."""
+    g = primitive_root(p)
+    powers = np.empty(p - 1, dtype=np.int64)
+    value = 1
+    for j in range(p - 1):
+        powers[j] = value
+        value = value * g % p
+    return powers
+
+
+def evaluate_everywhere(coefficients, p: int = GF2053.PRIME) -> np.ndarray:
+    """
+    Evaluate polynomial(s) at all p field elements.
+
+    Coefficients of degree >= p-1 fold onto degree mod (p-1) (x^(p-1) = 1
+    on GF(p)*), so any length is accepted.
+
+    Args:
+        coefficients: Array (..., d+1), constant term first
+        p: Field prime
+
+    Returns:
+        Array (..., p); entry x holds P(x)
+    """
+    c = np.asarray(coefficients, dtype=np.int64) % p
+    n = p - 1
+    folded = np.zeros(c.shape[:-1] + (n,), dtype=np.int64)
+    for start in range(0, c.shape[-1], n):
+        block = c[..., start:start + n]
+        folded[..., :block.shape[-1]] += block
+    folded %= p
+    values = np.empty(c.shape[:-1] + (p,), dtype=np.int64)
+    values[..., _generator_powers(p)] = ntt(folded, p)
+    values[..., 0] = c[..., 0] if c.shape[-1] else 0
+    return values
+
+
+def interpolate_everywhere(values, p: int = GF2053.PRIME) -> np.ndarray:
+    """
+    Coefficients from values at every nonzero point (or every point).
+
+    Args:
+        values: Array (..., p-1) of P(1..p-1): returns the unique polynomial
+                of degree < p-1; or (..., p) of P(0..p-1): returns the
+                unique polynomial of degree < p
+        p: Field prime
+
+    Returns:
+        Coefficients, constant term first, same shape as values
+    """
+    v = np.asarray(values, dtype=np.int64) % p
+    n = p - 1
+    if v.shape[-1] not in (n, p):
+        raise ValueError(f"Expected {n} or {p} values, got {v.shape[-1]}")
+    offset = v.shape[-1] - n  # 1 when P(0) is included
+    coefficients = ntt(v[..., offset + _generator_powers(p) - 1], p, inverse=True)
+    if not offset:
+        return coefficients
+    # Add lam * (x^(p-1) - 1), which vanishes on GF(p)*, to match P(0)
+    lam = (coefficients[..., 0] - v[..., 0]) % p
+    full = np.concatenate([coefficients, lam[..., None]], axis=-1)
+    full[..., 0] = v[..., 0]
+    return full
+
+
+# ----------------------------------------------------------------------
+# Parametric prime fields
+# ----------------------------------------------------------------------
+
+MAX_TABLE_PRIME = 1 << 16
+
+
+class PrimeField:
+    """
+    Table-backed GF(p) for a small prime p. Create through GF(p).
+
+    Mirrors the GF2053 operations as instance methods. The word range is
+    1..word_max, with word_max the largest power of two below p: 2048
+    (11-bit BIP39 indices) for p = 2053 and 8 (3-bit words) for p = 13.
+    Residues outside it (`excluded`) play the role of {0, 2049..2052}.
+    """
+    
+    def __init__(self, p: int):
+        self.p = p
+        self.word_bits = (p - 1).bit_length() - 1
+        self.word_max = 1 << self.word_bits
+        self.generator = primitive_root(p)
+        # exp[j] = g^j (j = 0..2p-3, doubled to skip a reduction), log[g^j] = j
+        exp = np.empty(2 * (p - 1), dtype=np.int64)
+        exp[:p - 1] = _generator_powers(p)
+        exp[p - 1:] = exp[:p - 1]
+        log = np.zeros(p, dtype=np.int64)
+        log[exp[:p - 1]] = np.arange(p - 1)
+        inverse = np.zeros(p, dtype=np.int64)
+        inverse[1:] = exp[(p - 1 - log[1:]) % (p - 1)]
+        for table in (exp, log, inverse):
+            table.setflags(write=False)
+        self.exp, self.log, self.inverse = exp, log, inverse
+    
+    def __repr__(self) -> str:
+        return f"GF({self.p})"
+    
+    @property
+    def excluded(self) -> List[int]:
+        """Residues that are not valid words (0 and word_max+1..p-1)."""
+        return [0] + list(range(self.word_max + 1, self.p))
+    
+    def add(self, a: int, b: int) -> int:
+        return (a + b) % self.p
+    
+    def sub(self, a: int, b: int) -> int:
+        return (a - b) % self.p
+    
+    def mul(self, a: int, b: int) -> int:
+        return (a * b) % self.p
+    
+    def inv(self, a: int) -> int:
+        """Multiplicative inverse (table lookup). Raises ValueError for 0."""
+        a %= self.p
+        if a == 0:
+            raise ValueError("Cannot compute inverse of 0")
+        return int(self.inverse[a])
+    
+    def div(self, a: int, b: int) -> int:
+        return self.mul(a, self.inv(b))
+    
+    def pow(self, a: int, n: int) -> int:
+        return pow(a, n, self.p)
+    
+    def polynomial_eval(self, coefficients: List[int], x: int) -> int:
+        """Horner evaluation of [a0, a1, ...] at x."""
+        result = 0
+        for c in reversed(coefficients):
+            result = (result * x + c) % self.p
+        return result
+    
+    def lagrange_coefficient(self, x_values: List[int], x_target: int, j: int) -> int:
+        """L_j(x_target) = prod(i != j) (x_target - x_i) / (x_j - x_i)."""
+        numerator = denominator = 1
+        for i, x_i in enumerate(x_values):
+            if i != j:
+                numerator = numerator * (x_target - x_i) % self.p
+                denominator = denominator * (x_values[j] - x_i) % self.p
+        return numerator * self.inv(denominator) % self.p
+    
+    def interpolate(self, points: List[Tuple[int, int]]) -> int:
+        """Lagrange interpolation at x = 0."""
+        if not points:
+            raise ValueError("Need at least one point")
+        xs = [x for x, _ in points]
+        return sum(
+            self.lagrange_coefficient(xs, 0, j) * y for j, (_, y) in enumerate(points)
+        ) % self.p
+    
+    def evaluate_all(self, coefficients) -> np.ndarray:
+        """Polynomial(s) at every x in GF(p) (NTT); see evaluate_everywhere."""
+        return evaluate_everywhere(coefficients, self.p)
+    
+    def interpolate_all(self, values) -> np.ndarray:
+        """Coefficients from values at every (nonzero) point; see interpolate_everywhere."""
+        return interpolate_everywhere(values, self.p)
+    
+    def random_words(self, count: int, rng) -> List[int]:
+        """`count` uniform words in 1..word_max from a random.Random."""
+        return [rng.randint(1, self.word_max) for _ in range(count)]
+
+
+def _is_prime(n: int) -> bool:
+    return n >= 2 and all(n % d for d in range(2, int(n ** 0.5) + 1))
+
+
+@functools.lru_cache(maxsize=None)
+def GF(p: int = GF2053.PRIME) -> PrimeField:
+    """
+    Cached table-backed field for a small prime.
+    
+    Args:
+        p: Prime, 5 <= p <= 65536 (GF(2053) is the protocol field)
+    
+    Returns:
+        The PrimeField for p (the same object on every call)
+    
+    Raises:
+        ValueError: If p is not a prime in range
+    """
+    if not (5 <= p <= MAX_TABLE_PRIME and _is_prime(p)):
+        raise ValueError(f"Need a prime 5 <= p <= {MAX_TABLE_PRIME}, got {p}")
+    return PrimeField(p)
 
 
 def verify_field_properties():
@@ -215,6 +531,29 @@ def verify_field_properties():
     recovered = GF2053.interpolate(points)
     assert recovered == secret, f"Lagrange interpolation failed: got {recovered}, expected {secret}"
     
+    # NTT evaluation / interpolation at every point
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, GF2053.PRIME, (8, 5))
+    values = GF2053.evaluate_all(batch)
+    for x in (0, 1, 2, 1000, 2052):
+        assert all(values[i, x] == GF2053.polynomial_eval(batch[i].tolist(), x) for i in range(8))
+    padded = np.zeros((8, GF2053.PRIME - 1), dtype=np.int64)
+    padded[:, :5] = batch
+    assert np.array_equal(GF2053.interpolate_all(values[:, 1:]), padded)
+    full = rng.integers(0, GF2053.PRIME, GF2053.PRIME)
+    assert np.array_equal(GF2053.evaluate_all(GF2053.interpolate_all(full)), full)
+    
+    # Parametric fields agree with GF2053 and scale down to toy sizes
+    field = GF(2053)
+    assert field is GF(2053) and field.word_max == 2048 and field.excluded == [0, 2049, 2050, 2051, 2052]
+    assert all(field.inv(a) == GF2053.inv(a) for a in (1, 2, 42, 1000, 2052))
+    assert field.interpolate(points) == secret
+    toy = GF(13)
+    assert toy.word_max == 8 and toy.excluded == [0, 9, 10, 11, 12]
+    assert all(toy.mul(a, toy.inv(a)) == 1 for a in range(1, 13))
+    assert toy.interpolate([(1, 5), (2, 7)]) == 3  # P(x) = 3 + 2x
+    assert list(toy.evaluate_all([3, 2])) == [(3 + 2 * x) % 13 for x in range(13)]
+    
     print("✓ All field property tests passed")
 
 
@@ -237,5 +576,12 @@ if __name__ == "__main__":
     print(f"\nb^(-1) = {inv_b}")
     print(f"b × b^(-1) = {GF2053.mul(b, inv_b)} (should be 1)")
     
+    # Full-field sweep: 1000 degree-23 polynomials at all 2053 points
+    import time
+    polys = np.random.default_rng(1).integers(0, GF2053.PRIME, (1000, 24))
+    start = time.perf_counter()
+    GF2053.evaluate_all(polys)
+    print(f"\nNTT: 1000 polynomials x 2053 points in {time.perf_counter() - start:.2f}s")
+    
     print("\nAll arithmetic operations working correctly!")
 
@@ -0,0 +1,474 @@
+"""
+Linear algebra over GF(p), NumPy-backed.
+
+Row reduction, rank, nullspace, determinant, inverse and solves for
+matrices over a prime field (GF(2053) by default), plus O(k²) solvers for
+the structured systems Shamir sharing produces:
+
+- `vandermonde_solve`: interpolation coefficients from k points
+  (Björck-Pereyra: Newton divided differences, then monomial form)
+- `confluent_vandermonde_solve`: Hermite interpolation from values and
+  (Hasse) derivatives at repeated nodes
+- `solve_batched`: many independent square systems eliminated together
+- `rref_batched`: many matrices of any rank reduced together
+
+Matrices are int64 arrays reduced mod p; products of two residues must fit
+in int64, so p < 2^31. Nothing here needs SageMath.
+"""
+
+import functools
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+P = 2053
+
+
+def as_field(a, p: int = P) -> np.ndarray:
+    """Copy `a` to an int64 array of residues mod p."""
+    return np.array(a, dtype=np.int64) % p
+
+
+def inv_mod(a, p: int = P) -> np.ndarray:
+    """
+    Elementwise inverse mod p (Fermat, vectorized square-and-multiply).
+
+    Raises:
+        ZeroDivisionError: If any element is 0 mod p
+    """
+    a = as_field(a, p)
+    if np.any(a == 0):
+        raise ZeroDivisionError("0 has no inverse mod p")
+    result = np.ones_like(a)
+    base, e = a, p - 2
+    while e:
+        if e & 1:
+            result = result * base % p
+        base = base * base % p
+        e >>= 1
+    return result
+
+
+def rref(a, p: int = P) -> Tuple[np.ndarray, List[int]]:
+    """
+    Reduced row echelon form.
+
+    Args:
+        a: Matrix (m x n)
+        p: Field prime
+
+    Returns:
+        (R, pivot columns)
+    """
+    m = as_field(a, p)
+    if m.ndim != 2:
+        raise ValueError(f"Expected a matrix, got shape {m.shape}")
+    rows, cols = m.shape
+    pivots = []
+    r = 0
+    for c in range(cols):
+        if r == rows:
+            break
+        nonzero = np.flatnonzero(m[r:, c])
+        if nonzero.size == 0:
+            continue
+        i = r + nonzero[0]
+        if i != r:
+            m[[r, i]] = m[[i, r]]
+        m[r] = m[r] * pow(int(m[r, c]), -1, p) % p
+        factors = m[:, c].copy()
+        factors[r] = 0
+        m = (m - np.outer(factors, m[r])) % p
+        pivots.append(c)
+        r += 1
+    return m, pivots
+
+
+def rank(a, p: int = P) -> int:
+    """Rank of a matrix over GF(p)."""
+    return len(rref(a, p)[1])
+
+
+def nullspace(a, p: int = P) -> np.ndarray:
+    """
+    Basis of the right kernel {v : A v = 0}.
+
+    Returns:
+        Array of shape (n - rank, n); each row is a basis vector
+    """
+    r, pivots = rref(a, p)
+    n = r.shape[1]
+    free = [c for c in range(n) if c not in set(pivots)]
+    basis = np.zeros((len(free), n), dtype=np.int64)
+    for row, f in enumerate(free):
+        basis[row, f] = 1
+        for i, c in enumerate(pivots):
+            basis[row, c] = -r[i, f] % p
+    return basis
+
+
+def det(a, p: int = P) -> int:
+    """Determinant of a square matrix over GF(p)."""
+    m = as_field(a, p)
+    n = m.shape[0]
+    if m.shape != (n, n):
+        raise ValueError(f"Expected a square matrix, got shape {m.shape}")
+    result = 1
+    for c in range(n):
+        nonzero = np.flatnonzero(m[c:, c])
+        if nonzero.size == 0:
+            return 0
+        i = c + nonzero[0]
+        if i != c:
+            m[[c, i]] = m[[i, c]]
+            result = -result
+        pivot = int(m[c, c])
+        result = result * pivot % p
+        factors = m[c + 1:, c] * pow(pivot, -1, p) % p
+        m[c + 1:] = (m[c + 1:] - np.outer(factors, m[c])) % p
+    return result % p
+
+
+def inv(a, p: int = P) -> np.ndarray:
+    """
+    Inverse of a square matrix over GF(p).
+
+    Raises:
+        ValueError: If the matrix is singular
+    """
+    m = as_field(a, p)
+    n = m.shape[0]
+    if m.shape != (n, n):
+        raise ValueError(f"Expected a square matrix, got shape {m.shape}")
+    r, pivots = rref(np.hstack([m, np.eye(n, dtype=np.int64)]), p)
+    if pivots[:n] != list(range(n)):
+        raise ValueError("Matrix is singular over GF(p)")
+    return r[:, n:]
+
+
+def solve(a, b, p: int = P) -> np.ndarray:
+    """
+    One solution of A x = b over GF(p).
+
+    For underdetermined systems the free variables are set to 0; add any
+    combination of nullspace(A) for the others.
+
+    Args:
+        a: Matrix (m x n)
+        b: Right-hand side, vector (m,) or matrix (m x j) of several
+        p: Field prime
+
+    Returns:
+        x with shape (n,) or (n, j)
+
+    Raises:
+        ValueError: If the system is inconsistent
+    """
+    a = as_field(a, p)
+    b = as_field(b, p)
+    vector = b.ndim == 1
+    if vector:
+        b = b[:, None]
+    n = a.shape[1]
+    r, pivots = rref(np.hstack([a, b]), p)
+    if pivots and pivots[-1] >= n:
+        raise ValueError("Inconsistent system over GF(p)")
+    x = np.zeros((n, b.shape[1]), dtype=np.int64)
+    for i, c in enumerate(pivots):
+        x[c] = r[i, n:]
+    return x[:, 0] if vector else x
+
+
+def solve_batched(a, b, p: int = P) -> np.ndarray:
+    """
+    Solve many independent square systems A[t] x[t] = b[t] at once.
+
+    Gaussian elimination runs over the whole batch with one vectorized step
+    per column, so thousands of small systems cost about as much as a few
+    large ones.
+
+    Args:
+        a: Matrices, shape (batch, n, n)
+        b: Right-hand sides, shape (batch, n) or (batch, n, j)
+        p: Field prime
+
+    Returns:
+        Solutions with the shape of b
+
+    Raises:
+        ValueError: If any system is singular (lists the batch indices)
+    """
+    a = as_field(a, p)
+    b = as_field(b, p)
+    vector = b.ndim == 2
+    if vector:
+        b = b[:, :, None]
+    batch, n, _ = a.shape
+    m = np.concatenate([a, b], axis=2)
+    ar = np.arange(batch)
+    for c in range(n):
+        candidates = m[:, c:, c] != 0
+        singular = ~candidates.any(axis=1)
+        if singular.any():
+            raise ValueError(f"Singular systems at batch indices {np.flatnonzero(singular).tolist()}")
+        pivot = c + candidates.argmax(axis=1)
+        pivot_rows = m[ar, pivot].copy()
+        m[ar, pivot] = m[:, c]
+        m[:, c] = pivot_rows * inv_mod(pivot_rows[:, c], p)[:, None] % p
+        factors = m[:, :, c].copy()
+        factors[:, c] = 0
+        m = (m - factors[:, :, None] * m[:, c][:, None, :]) % p
+    x = m[:, :, n:]
+    return x[:, :, 0] if vector else x
+
+
+def rref_batched(a, p: int = P) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduced row echelon form of many matrices at once, any rank.
+
+    Unlike solve_batched, systems may be singular or rectangular: each
+    matrix keeps its own pivot row counter, and a column without a pivot in
+    one matrix is simply skipped for it.
+
+    Args:
+        a: Matrices, shape (batch, m, n)
+        p: Field prime
+
+    Returns:
+        (R, pivots): the reduced matrices and, per matrix and row, the pivot
+        column of that row (-1 below the rank)
+    """
+    m = as_field(a, p)
+    batch, rows, cols = m.shape
+    pivots = np.full((batch, rows), -1, dtype=np.int64)
+    r = np.zeros(batch, dtype=np.int64)
+    row_ids = np.arange(rows)
+    for c in range(cols):
+        candidates = (m[:, :, c] != 0) & (row_ids >= r[:, None])
+        has = candidates.any(axis=1)
+        if not has.any():
+            continue
+        b, target = np.flatnonzero(has), r[has]
+        source = candidates[has].argmax(axis=1)
+        pivot_rows = m[b, source]
+        m[b, source] = m[b, target]
+        m[b, target] = pivot_rows * inv_mod(pivot_rows[:, c], p)[:, None] % p
+        factors = m[b, :, c]
+        factors[np.arange(len(b)), target] = 0
+        m[b] = (m[b] - factors[:, :, None] * m[b, target][:, None, :]) % p
+        pivots[b, target] = c
+        r[has] += 1
+    return m, pivots
+
+
+def vandermonde(xs: Sequence[int], columns: Optional[int] = None, p: int = P) -> np.ndarray:
+    """V[i, d] = xs[i]^d for d = 0..columns-1 (default: square)."""
+    xs = as_field(xs, p)
+    columns = len(xs) if columns is None else columns
+    v = np.ones((len(xs), columns), dtype=np.int64)
+    for d in range(1, columns):
+        v[:, d] = v[:, d - 1] * xs % p
+    return v
+
+
+def _newton_to_monomial(z: np.ndarray, c: np.ndarray, p: int) -> np.ndarray:
+    """Monomial coefficients from Newton coefficients on nodes z (in place)."""
+    k = len(z)
+    for j in range(k - 2, -1, -1):
+        c[j:k - 1] = (c[j:k - 1] - z[j] * c[j + 1:k]) % p
+    return c
+
+
+def vandermonde_solve(xs: Sequence[int], ys, p: int = P) -> np.ndarray:
+    """
+    Coefficients c with sum_d c[d] xs[i]^d = ys[i], in O(k²).
+
+    Björck-Pereyra: Newton divided differences, then expansion to monomial
+    form. Both passes are vectorized across several right-hand sides.
+
+    Args:
+        xs: k distinct nodes
+        ys: Values, shape (k,) or (k, j) for j polynomials at once
+        p: Field prime
+
+    Returns:
+        Coefficients (constant term first), shape of ys
+
+    Raises:
+        ValueError: If the nodes are not distinct mod p
+    """
+    z = as_field(xs, p)
+    c = as_field(ys, p)
+    k = len(z)
+    if len(set(z.tolist())) != k:
+        raise ValueError("Vandermonde nodes must be distinct mod p")
+    vector = c.ndim == 1
+    if vector:
+        c = c[:, None]
+    for j in range(1, k):
+        scale = inv_mod(z[j:] - z[:-j], p)
+        c[j:] = (c[j:] - c[j - 1:-1]) * scale[:, None] % p
+    c = _newton_to_monomial(z, c, p)
+    return c[:, 0] if vector else c
+
+
+@functools.lru_cache(maxsize=None)
+def comb_mod(n: int, r: int, p: int = P) -> int:
+    """Binomial coefficient C(n, r) mod p."""
+    from math import comb
+    return comb(n, r) % p
+
+
+def confluent_vandermonde(
+    nodes: Sequence[int],
+    multiplicities: Sequence[int],
+    columns: Optional[int] = None,
+    p: int = P
+) -> np.ndarray:
+    """
+    Confluent Vandermonde matrix with Hasse-derivative rows.
+
+    For node x with multiplicity m, rows j = 0..m-1 hold C(d, j) x^(d-j),
+    i.e. the j-th Hasse derivative (f^(j) / j!) of x^d. Hasse derivatives
+    avoid dividing by j!, which vanishes mod p once j >= p.
+    """
+    total = sum(multiplicities)
+    columns = total if columns is None else columns
+    rows = []
+    for x, mult in zip(nodes, multiplicities):
+        for j in range(mult):
+            rows.append([
+                comb_mod(d, j, p) * pow(x, d - j, p) % p if d >= j else 0
+                for d in range(columns)
+            ])
+    return np.array(rows, dtype=np.int64).reshape(total, columns)
+
+
+def confluent_vandermonde_solve(
+    nodes: Sequence[int],
+    derivatives: Sequence[Sequence[int]],
+    p: int = P
+) -> np.ndarray:
+    """
+    Hermite interpolation: the polynomial of degree < sum(m_i) matching
+    values and Hasse derivatives at each node, in O(K²).
+
+    Generalized divided differences: on a run of j+1 equal nodes the j-th
+    difference is the j-th Hasse derivative there.
+
+    Args:
+        nodes: Distinct nodes x_i
+        derivatives: Per node, [f(x_i), D^1 f(x_i), ..., D^(m_i - 1) f(x_i)]
+                     (Hasse derivatives, D^j = f^(j) / j!); each entry may
+                     be a vector to solve several polynomials at once
+        p: Field prime
+
+    Returns:
+        Monomial coefficients (constant term first)
+
+    Raises:
+        ValueError: If nodes repeat mod p
+    """
+    if len(set(int(x) % p for x in nodes)) != len(nodes):
+        raise ValueError("Confluent Vandermonde nodes must be distinct mod p")
+    z = np.array([x for x, ds in zip(nodes, derivatives) for _ in ds], dtype=np.int64) % p
+    # hasse[j, i] = D^j f at the node of position i (where defined)
+    k = len(z)
+    values = [as_field(ds, p) for ds in derivatives]
+    vector = values[0].ndim == 1
+    width = 1 if vector else values[0].shape[1]
+    hasse = np.zeros((k, k, width), dtype=np.int64)
+    pos = 0
+    for ds in values:
+        ds = ds.reshape(len(ds), width)
+        for _ in range(len(ds)):
+            hasse[:len(ds), pos] = ds
+            pos += 1
+    c = hasse[0].copy()
+    for j in range(1, k):
+        same = z[j:] == z[:-j]
+        diff = np.where(same, 1, z[j:] - z[:-j])
+        divided = (c[j:] - c[j - 1:-1]) * inv_mod(diff, p)[:, None] % p
+        c[j:] = np.where(same[:, None], hasse[j, j:], divided)
+    c = _newton_to_monomial(z, c, p)
+    return c[:, 0] if vector else c
+
+
+if __name__ == "__main__":
+    # Self-test
+    import time
+
+    print("GF(p) Linear Algebra Self-Test")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    a = rng.integers(0, P, (6, 6))
+    a_inv = inv(a)
+    assert np.array_equal(a @ a_inv % P, np.eye(6, dtype=np.int64))
+    assert det(a) * det(a_inv) % P == 1
+    print("✓ Inverse and determinant")
+
+    # Rank-deficient: third row = row0 + 2*row1
+    b = rng.integers(0, P, (4, 7))
+    b[2] = (b[0] + 2 * b[1]) % P
+    assert rank(b) == 3
+    kernel = nullspace(b)
+    assert kernel.shape == (4, 7) and not np.any(b @ kernel.T % P)
+    x = solve(b, b @ np.arange(7) % P)
+    assert np.array_equal(b @ x % P, b @ np.arange(7) % P)
+    try:
+        solve(b, [0, 0, 1, 0])
+        raise AssertionError("Inconsistent system not detected")
+    except ValueError:
+        pass
+    print("✓ Rank, nullspace, solve and inconsistency detection")
+
+    # Nonsingular by construction: unit lower x upper with nonzero diagonal
+    lower = np.tril(rng.integers(0, P, (2000, 5, 5)), -1) + np.eye(5, dtype=np.int64)
+    upper = np.triu(rng.integers(0, P, (2000, 5, 5)), 1) + np.eye(5, dtype=np.int64) * rng.integers(1, P, (2000, 1, 5))
+    batch = lower @ upper % P
+    rhs = rng.integers(0, P, (2000, 5))
+    start = time.perf_counter()
+    xs = solve_batched(batch, rhs)
+    elapsed = time.perf_counter() - start
+    assert np.array_equal(np.einsum('bij,bj->bi', batch, xs) % P, rhs)
+    batch[17] = 0
+    try:
+        solve_batched(batch, rhs)
+        raise AssertionError("Singular system not detected")
+    except ValueError as exc:
+        assert "[17]" in str(exc)
+    print(f"✓ Batched solve: 2000 5x5 systems in {elapsed * 1000:.1f} ms")
+
+    mixed = rng.integers(0, P, (50, 6, 8))
+    mixed[::2, 3] = (mixed[::2, 0] + 5 * mixed[::2, 1]) % P  # rank 5 in every other matrix
+    mixed[::3, :, 2] = 0                                       # and a dead column
+    reduced, pivots = rref_batched(mixed)
+    for i in range(len(mixed)):
+        expected, expected_pivots = rref(mixed[i])
+        assert np.array_equal(reduced[i], expected)
+        assert pivots[i].tolist() == expected_pivots + [-1] * (6 - len(expected_pivots))
+    print("✓ Batched RREF matches rref on singular and rectangular matrices")
+
+    # Shamir: interpolate degree-(k-1) polynomials for 24 words at once
+    k = 5
+    coeffs = rng.integers(0, P, (k, 24))
+    nodes = [1, 2, 3, 7, 2052]
+    values = vandermonde(nodes, k) @ coeffs % P
+    assert np.array_equal(vandermonde_solve(nodes, values), coeffs)
+    assert np.array_equal(vandermonde_solve(nodes, values[:, 0]), coeffs[:, 0])
+    print("✓ Vandermonde solve (Björck-Pereyra)")
+
+    nodes, mults = [3, 10, 500], [2, 1, 3]
+    v = confluent_vandermonde(nodes, mults)
+    poly = rng.integers(0, P, 6)
+    hermite = v @ poly % P
+    derivatives, pos = [], 0
+    for m in mults:
+        derivatives.append(hermite[pos:pos + m].tolist())
+        pos += m
+    assert np.array_equal(confluent_vandermonde_solve(nodes, derivatives), poly)
+    assert det(v) != 0
+    print("✓ Confluent (Hermite) Vandermonde solve")
+
+    print("\nAll linear algebra tests passed!")
@@ -0,0 +1,336 @@
+"""
+Manual Authentication Layer (MAT) tags, NumPy-backed (manual_spec, "MAT").
+
+For Share x, word row j and MAT column c:
+
+    MAT_j = (u_1*W_{j,1} + u_2*W_{j,2} + u_3*W_{j,3} + b_j) mod 2053
+
+with per-Share, per-column weights u and per-row Row Pads b. Split-Key
+Manifests hold additive halves of every key value:
+
+    z_A = rho,  z_B = z - rho mod 2053,  z = z_A + z_B mod 2053
+
+The array core works on whole inventories at once:
+
+    rows     (S, r, 3)  word values per Share and row
+    weights  (S, C, 3)  u_1..u_3 per Share and MAT column
+    pads     (S, C, r)  b_1..b_r per Share and MAT column
+    tags     (S, C, r)  printed MAT tags
+
+`MatKey` is the Manifest-side record for one Share; `Share.mat` holds the
+printed tags. `audit` checks a list of Shares against their keys (whole or
+split) and reports every failing (Share, column, row).
+
+Key values here come from NumPy generators, which is fine for simulation
+but not for a real ceremony.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .schiavinato_bridge import PRIME, Share
+except ImportError:  # executed directly for the self-test below
+    from schiavinato_bridge import PRIME, Share
+
+
+@dataclass
+class MatKey:
+    """Complete (or one Split-Key half of the) MAT key material for one Share."""
+
+    index: int
+    weights: List[List[int]]  # per MAT column: u_1, u_2, u_3
+    row_pads: List[List[int]]  # per MAT column: b_1..b_r
+
+    @property
+    def columns(self) -> int:
+        return len(self.weights)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'index': self.index, 'weights': self.weights, 'row_pads': self.row_pads}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MatKey':
+        return cls(index=data['index'], weights=data['weights'], row_pads=data['row_pads'])
+
+
+@dataclass
+class MatAudit:
+    """
+    Outcome of a MAT audit.
+
+    Attributes:
+        indices: Share indices in audit order
+        ok: Per Share, per column, per row verification result (S, C, r)
+        failures: (Share index, MAT column, word row) of every failing tag,
+                  columns and rows 1-based
+    """
+    indices: List[int]
+    ok: np.ndarray
+    failures: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    @property
+    def failed_shares(self) -> List[int]:
+        return sorted({index for index, _, _ in self.failures})
+
+
+def compute_tags(rows, weights, pads, p: int = PRIME) -> np.ndarray:
+    """
+    MAT tags for a batch of Shares.
+
+    Args:
+        rows: Word values (S, r, 3)
+        weights: Weights (S, C, 3)
+        pads: Row Pads (S, C, r)
+        p: Field prime
+
+    Returns:
+        Tags (S, C, r)
+    """
+    rows = np.asarray(rows, dtype=np.int64) % p
+    weights = np.asarray(weights, dtype=np.int64) % p
+    pads = np.asarray(pads, dtype=np.int64)
+    if rows.ndim != 3 or rows.shape[2] != 3:
+        raise ValueError(f"Expected rows of shape (S, r, 3), got {rows.shape}")
+    if weights.shape != (rows.shape[0], weights.shape[1], 3) or \
+            pads.shape != (rows.shape[0], weights.shape[1], rows.shape[1]):
+        raise ValueError(f"Key shapes {weights.shape} / {pads.shape} do not match rows {rows.shape}")
+    return (np.einsum('sck,srk->scr', weights, rows) + pads) % p
+
+
+def verify_tags(rows, weights, pads, tags, p: int = PRIME) -> np.ndarray:
+    """Elementwise tag check: True where the printed tag matches (S, C, r)."""
+    return compute_tags(rows, weights, pads, p) == np.asarray(tags, dtype=np.int64)
+
+
+def random_keys(shares: int, rows: int, columns: int = 1,
+                rng: Optional[np.random.Generator] = None,
+                p: int = PRIME) -> Tuple[np.ndarray, np.ndarray]:
+    """Uniform weights (S, C, 3) and Row Pads (S, C, r)."""
+    rng = rng or np.random.default_rng()
+    return (rng.integers(0, p, size=(shares, columns, 3), dtype=np.int64),
+            rng.integers(0, p, size=(shares, columns, rows), dtype=np.int64))
+
+
+def split_values(values, rng: Optional[np.random.Generator] = None,
+                 p: int = PRIME) -> Tuple[np.ndarray, np.ndarray]:
+    """Split-Key halves (z_A, z_B) of an array of key values."""
+    values = np.asarray(values, dtype=np.int64) % p
+    rng = rng or np.random.default_rng()
+    rho = rng.integers(0, p, size=values.shape, dtype=np.int64)
+    return rho, (values - rho) % p
+
+
+def combine_values(half_a, half_b, p: int = PRIME) -> np.ndarray:
+    """z = z_A + z_B mod p, elementwise."""
+    return (np.asarray(half_a, dtype=np.int64) + np.asarray(half_b, dtype=np.int64)) % p
+
+
+def word_rows(shares: Sequence[Share]) -> np.ndarray:
+    """Word values of Shares with equal word counts as (S, r, 3)."""
+    words = np.array([share.words for share in shares], dtype=np.int64)
+    if words.ndim != 2 or words.shape[1] % 3:
+        raise ValueError("Shares must have equal word counts divisible by 3")
+    return words.reshape(len(shares), -1, 3)
+
+
+def stack_keys(keys: Sequence[MatKey]) -> Tuple[np.ndarray, np.ndarray]:
+    """Weights (S, C, 3) and Row Pads (S, C, r) of MatKeys with equal shapes."""
+    weights = np.array([key.weights for key in keys], dtype=np.int64)
+    pads = np.array([key.row_pads for key in keys], dtype=np.int64)
+    if weights.ndim != 3 or pads.ndim != 3:
+        raise ValueError("MAT keys must have equal column and row counts")
+    return weights, pads
+
+
+def _unstack_keys(indices: Sequence[int], weights: np.ndarray, pads: np.ndarray) -> List[MatKey]:
+    return [MatKey(index, w.tolist(), b.tolist()) for index, w, b in zip(indices, weights, pads)]
+
+
+def generate_keys(shares: Sequence[Share], columns: int = 1,
+                  rng: Optional[np.random.Generator] = None) -> List[MatKey]:
+    """
+    Fresh MAT keys for each Share.
+
+    Args:
+        shares: Shares with equal word counts
+        columns: 1 (single MAT) or 2 (dual MAT)
+        rng: NumPy generator (default: fresh entropy)
+
+    Returns:
+        One MatKey per Share, in order
+    """
+    if columns not in (1, 2):
+        raise ValueError(f"MAT supports 1 or 2 columns, got {columns}")
+    rows = word_rows(shares)
+    weights, pads = random_keys(len(shares), rows.shape[1], columns, rng)
+    return _unstack_keys([s.index for s in shares], weights, pads)
+
+
+def tag_shares(shares: Sequence[Share], keys: Sequence[MatKey]) -> List[Share]:
+    """Copies of the Shares with their printed MAT tags filled in."""
+    _check_pairing(shares, keys)
+    tags = compute_tags(word_rows(shares), *stack_keys(keys))
+    return [replace(share, mat=t.tolist()) for share, t in zip(shares, tags)]
+
+
+def split_keys(keys: Sequence[MatKey], rng: Optional[np.random.Generator] = None
+               ) -> Tuple[List[MatKey], List[MatKey]]:
+    """Split-Key Manifest A and B halves of complete keys."""
+    weights, pads = stack_keys(keys)
+    rng = rng or np.random.default_rng()
+    weights_a, weights_b = split_values(weights, rng)
+    pads_a, pads_b = split_values(pads, rng)
+    indices = [key.index for key in keys]
+    return _unstack_keys(indices, weights_a, pads_a), _unstack_keys(indices, weights_b, pads_b)
+
+
+def combine_keys(half_a: Sequence[MatKey], half_b: Sequence[MatKey]) -> List[MatKey]:
+    """
+    Complete keys from Split-Key Manifest halves.
+
+    Raises:
+        ValueError: If the halves do not pair up by Share index and shape
+    """
+    if [k.index for k in half_a] != [k.index for k in half_b]:
+        raise ValueError("Split-Key halves cover different Shares")
+    weights_a, pads_a = stack_keys(half_a)
+    weights_b, pads_b = stack_keys(half_b)
+    if weights_a.shape != weights_b.shape or pads_a.shape != pads_b.shape:
+        raise ValueError("Split-Key halves have different MAT shapes")
+    return _unstack_keys([k.index for k in half_a], combine_values(weights_a, weights_b),
+                         combine_values(pads_a, pads_b))
+
+
+def _check_pairing(shares: Sequence[Share], keys: Sequence[MatKey]) -> None:
+    if [s.index for s in shares] != [k.index for k in keys]:
+        raise ValueError("MAT keys do not match the Shares by index")
+
+
+def audit(shares: Sequence[Share], keys: Sequence[MatKey],
+          keys_b: Optional[Sequence[MatKey]] = None) -> MatAudit:
+    """
+    Verify every required MAT tag of a batch of Shares.
+
+    Shares are grouped by (word count, MAT columns) and each group is
+    checked with one array operation, so mixed inventories need one pass.
+
+    Args:
+        shares: Shares carrying printed tags in `Share.mat`
+        keys: Complete keys (Whole-Key Manifest) or Split-Key half A,
+              paired with `shares` by position
+        keys_b: Split-Key half B; when given, keys are recombined first
+
+    Returns:
+        MatAudit; `ok` is (S, C, r) when all Shares share one shape,
+        otherwise an object array of per-Share (C, r) results
+
+    Raises:
+        ValueError: If keys and Shares do not pair up, or a Share lacks
+                    the tags its key requires (a STOP condition)
+    """
+    _check_pairing(shares, keys)
+    if keys_b is not None:
+        _check_pairing(shares, keys_b)
+    groups: Dict[Tuple[int, int], List[int]] = {}
+    for i, (share, key) in enumerate(zip(shares, keys)):
+        if share.mat is None or len(share.mat) != key.columns:
+            raise ValueError(f"Share {share.index} lacks the {key.columns} required MAT column(s)")
+        groups.setdefault((len(share.words), key.columns), []).append(i)
+
+    results: List[Optional[np.ndarray]] = [None] * len(shares)
+    failures = []
+    for members in groups.values():
+        group = [shares[i] for i in members]
+        weights, pads = stack_keys([keys[i] for i in members])
+        if keys_b is not None:
+            weights_b, pads_b = stack_keys([keys_b[i] for i in members])
+            if weights_b.shape != weights.shape or pads_b.shape != pads.shape:
+                raise ValueError("Split-Key halves have different MAT shapes")
+            weights, pads = combine_values(weights, weights_b), combine_values(pads, pads_b)
+        ok = verify_tags(word_rows(group), weights, pads,
+                         np.array([s.mat for s in group], dtype=np.int64))
+        failures.extend((group[s].index, c + 1, j + 1) for s, c, j in zip(*np.nonzero(~ok)))
+        if len(groups) == 1:
+            results = ok
+        else:
+            for i, result in zip(members, ok):
+                results[i] = result
+
+    if len(groups) > 1:
+        ok = np.empty(len(shares), dtype=object)
+        ok[:] = results
+    else:
+        ok = results if groups else np.zeros((0, 0, 0), dtype=bool)
+    return MatAudit([s.index for s in shares], ok, failures)
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+    import time
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from shared.schiavinato_bridge import split_indices
+
+    print("MAT Self-Test")
+    print("=" * 60)
+
+    vectors = Path(__file__).resolve().parents[3] / "test_vectors" / "vectors.json"
+    with open(vectors) as f:
+        data = json.load(f)['vectors']
+    source, vector = data[0], data[1]
+    expected = source['shares'][vector['share_index'] - 1]
+    assert [w for row in vector['row_values'] for w in row] == expected['word_values']
+    share = Share(vector['share_index'], expected['word_values'],
+                  expected['row_checksums'] + expected['column_checksums'] + [expected['printed_gic']])
+    key = MatKey(share.index, [c['weights'] for c in vector['mat_columns']],
+                 [c['row_pads'] for c in vector['mat_columns']])
+    tagged = tag_shares([share], [key])[0]
+    assert tagged.mat == [c['tags'] for c in vector['mat_columns']]
+    assert audit([tagged], [key]).passed
+    print(f"✓ {vector['id']}: dual MAT tags match and verify")
+
+    half_a, half_b = split_keys([key], np.random.default_rng(0))
+    assert combine_keys(half_a, half_b) == [key]
+    assert audit([tagged], half_a, half_b).passed
+    assert not audit([tagged], half_a).passed
+    print("✓ Split-Key halves recombine and verify; one half alone fails")
+
+    forged = replace(tagged, words=tagged.words[:4] + [(tagged.words[4] + 1) % PRIME] + tagged.words[5:])
+    report = audit([forged], [key])
+    assert report.failures == [(1, 1, 2), (1, 2, 2)], report.failures
+    print("✓ A corrupted word fails both MAT columns on its row only")
+
+    assert Share.from_dict(tagged.to_dict()) == tagged
+    assert 'mat' not in share.to_dict()
+    print("✓ Share round-trips its MAT tags through to_dict/from_dict")
+
+    count = 100_000
+    rng = np.random.default_rng(1)
+    inventory = split_indices(list(range(1, 25)), 2, 3, seed=1) * (count // 3)
+    inventory = [replace(s, index=i + 1) for i, s in enumerate(inventory)]
+    keys = generate_keys(inventory, columns=2, rng=rng)
+    inventory = tag_shares(inventory, keys)
+    inventory[12345] = replace(inventory[12345], mat=[[0] * 8, inventory[12345].mat[1]])
+    half_a, half_b = split_keys(keys, rng)
+    start = time.perf_counter()
+    report = audit(inventory, half_a, half_b)
+    elapsed = time.perf_counter() - start
+    assert report.failed_shares == [12346] and report.ok.shape == (len(inventory), 2, 8)
+    assert len(report.failures) == int((~report.ok).sum())
+    print(f"✓ Split-Key audit of {len(inventory):,} 24-word dual-MAT Shares in {elapsed:.2f}s "
+          f"found the one tampered Share")
+
+    mixed = split_indices(list(range(1, 13)), 2, 3, seed=2)
+    mixed_keys = generate_keys(mixed, columns=1, rng=rng)
+    report = audit(inventory[:3] + tag_shares(mixed, mixed_keys), keys[:3] + mixed_keys)
+    assert report.passed and report.ok.dtype == object
+    print("✓ Mixed word counts and column counts audit in one call")
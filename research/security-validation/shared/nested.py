@@ -0,0 +1,442 @@
+"""
+Nested custody trees, NumPy-backed (manual_spec, "Nesting").
+
+A layout is one (k, n) per layer, outermost first. Layer 0 splits the
+secret word values; each layer-0 Share selected for nesting has its word
+values split again at layer 1, and so on. At layers L > 0 the values
+shared are GF(2053) elements, so 0 and 2049..2052 are valid; k = 1 gives
+identical copies. Every Share, leaf or not, carries its own share table
+(row/column checksums and printed GIC on its last index).
+
+A leaf is addressed by its threshold and Share-index paths, outermost
+first, exactly as the payload encodes them (`encode_path`). Full payloads
+hold up to four layers, Compact up to two; nibble-packed depths limit
+every path value to 15.
+
+Splitting runs one Vandermonde product per layer over every parent at
+once. Recovery works bottom-up one layer at a time: the sub-trees of a
+layer are independent, so all of them are combined in one batched
+product per distinct set of chosen indices, with the Lagrange weights of
+each index set cached.
+
+Coefficients come from NumPy generators, which is fine for simulation but
+not for a real ceremony.
+"""
+
+import functools
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .field_arithmetic import GF2053
+    from .gf_linalg import vandermonde
+    from .payload import MAX_DEPTH, SharePayload, decode_path, encode_path
+    from .schiavinato_bridge import COLUMN_TOTAL, PRIME, Share, row_total, share_checksums
+except ImportError:  # executed directly for the self-test below
+    from field_arithmetic import GF2053
+    from gf_linalg import vandermonde
+    from payload import MAX_DEPTH, SharePayload, decode_path, encode_path
+    from schiavinato_bridge import COLUMN_TOTAL, PRIME, Share, row_total, share_checksums
+
+Path = Tuple[Tuple[int, ...], Tuple[int, ...]]  # (thresholds, indices), outermost first
+
+
+@dataclass(frozen=True)
+class Layer:
+    """One nesting layer: k-of-n, and which of its Shares are split again."""
+    k: int
+    n: int
+    nest: Optional[Tuple[int, ...]] = None  # indices split at the next layer (None: all)
+
+    def nested(self, x: int) -> bool:
+        return self.nest is None or x in self.nest
+
+    def __str__(self) -> str:
+        nest = "" if self.nest is None else "[" + ",".join(map(str, self.nest)) + "]"
+        return f"{self.k}-of-{self.n}{nest}"
+
+
+def parse_layout(text: str) -> List[Layer]:
+    """
+    Parse a layout such as "2-of-3,3-of-5[1,2],2-of-2".
+
+    A bracketed index list after a layer limits nesting to those Shares of
+    that layer; without it every Share of the layer is split again.
+
+    Raises:
+        ValueError: On malformed text (values are checked by validate_layout)
+    """
+    layers = []
+    for spec in re.findall(r"[^,\[]+(?:\[[^\]]*\])?", text.replace(" ", "")):
+        match = re.fullmatch(r"(\d+)-of-(\d+)(?:\[([\d,]*)\])?", spec)
+        if match is None:
+            raise ValueError(f"Malformed layer {spec!r}; expected k-of-n or k-of-n[i,j,...]")
+        k, n, nest = match.groups()
+        layers.append(Layer(int(k), int(n),
+                            None if nest is None else tuple(int(x) for x in nest.split(",") if x)))
+    return layers
+
+
+def validate_layout(layers: Sequence[Layer], profile: str = 'full') -> None:
+    """
+    Check a layout against the threshold rules and the profile's path fields.
+
+    Raises:
+        ValueError: On a depth the profile cannot encode, an invalid k/n, a
+                    path value too large for its field, or a nest list
+                    naming Shares that do not exist
+    """
+    if not layers:
+        raise ValueError("A layout needs at least one layer")
+    if len(layers) - 1 > MAX_DEPTH[profile]:
+        raise ValueError(f"{profile} payloads hold at most {MAX_DEPTH[profile] + 1} layers, "
+                         f"got {len(layers)}")
+    for depth, layer in enumerate(layers):
+        if not 1 <= layer.k <= layer.n < PRIME:
+            raise ValueError(f"Layer {depth}: invalid threshold {layer.k}-of-{layer.n}")
+        if layer.nest is not None and not set(layer.nest) <= set(range(1, layer.n + 1)):
+            raise ValueError(f"Layer {depth}: nest list {list(layer.nest)} outside 1..{layer.n}")
+    # The widest paths a leaf can carry must encode at every depth that occurs
+    for depth in range(len(layers)):
+        encode_path([layer.n for layer in layers[:depth + 1]], profile)
+
+
+@dataclass
+class NestedShare:
+    """A leaf of a custody tree: its layer paths and its share table."""
+    thresholds: List[int]
+    indices: List[int]
+    share: Share
+
+    @property
+    def depth(self) -> int:
+        return len(self.indices) - 1
+
+    @property
+    def path(self) -> Path:
+        return tuple(self.thresholds), tuple(self.indices)
+
+    def encode_paths(self, profile: str = 'full') -> Tuple[bytes, bytes]:
+        """Threshold and Share-index path fields as they appear in a payload."""
+        return encode_path(self.thresholds, profile), encode_path(self.indices, profile)
+
+    @classmethod
+    def decode_paths(cls, thresholds: bytes, indices: bytes, depth: int, share: Share,
+                     profile: str = 'full') -> 'NestedShare':
+        """Inverse of encode_paths for a known depth."""
+        return cls(decode_path(thresholds, depth, profile), decode_path(indices, depth, profile),
+                   share)
+
+    def payload(self, profile: str = 'full', batch_id: bytes = b'', rbt: bytes = b'',
+                language: int = 0x01, wallet_hint: int = 0) -> SharePayload:
+        """The Share Payload for this leaf (batch ID and RBT as given by the caller)."""
+        return SharePayload(
+            profile=profile,
+            word_count=len(self.share.words),
+            wallet_hint=wallet_hint,
+            language=language,
+            thresholds=list(self.thresholds),
+            indices=list(self.indices),
+            batch_id=batch_id,
+            rbt=rbt,
+            words=list(self.share.words),
+            checksums=list(self.share.checksums) if profile == 'full' else None,
+        )
+
+    @classmethod
+    def from_payload(cls, payload: SharePayload) -> 'NestedShare':
+        """Leaf from a decoded Share Payload (Full: with its printed checksums)."""
+        words = list(payload.words)
+        checksums = (list(payload.checksums) if payload.checksums is not None
+                     else share_checksums(words, payload.indices[-1]))
+        return cls(list(payload.thresholds), list(payload.indices),
+                   Share(payload.indices[-1], words, checksums))
+
+
+# ----------------------------------------------------------------------------
+# Array kernels
+# ----------------------------------------------------------------------------
+
+def table_checksums(words: np.ndarray, xs, p: int = PRIME) -> np.ndarray:
+    """
+    share_checksums over a batch: words (B, m), xs (B,) or scalar -> (B, m/3 + 4).
+    """
+    words = np.asarray(words, dtype=np.int64)
+    batch, m = words.shape
+    rows = words.reshape(batch, m // 3, 3).sum(axis=2) + np.arange(1, m // 3 + 1)
+    columns = words.reshape(batch, m // 3, 3).sum(axis=1) + np.array([100, 200, 300])
+    gic = words.sum(axis=1) + row_total(m) + COLUMN_TOTAL + np.asarray(xs, dtype=np.int64)
+    return np.concatenate([rows, columns, np.broadcast_to(gic, (batch,))[:, None]], axis=1) % p
+
+
+def split_values(values: np.ndarray, k: int, n: int, rng: np.random.Generator,
+                 p: int = PRIME) -> np.ndarray:
+    """
+    Shamir-split every row of values (B, m) k-of-n: (B, n, m), indices 1..n.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    batch, m = values.shape
+    polys = np.empty((batch, m, k), dtype=np.int64)
+    polys[:, :, 0] = values
+    polys[:, :, 1:] = rng.integers(0, p, size=(batch, m, k - 1))
+    return np.einsum('nk,bmk->bnm', vandermonde(range(1, n + 1), k, p), polys) % p
+
+
+@functools.lru_cache(maxsize=4096)
+def lagrange_weights(xs: Tuple[int, ...]) -> np.ndarray:
+    """Weights gamma_j with f(0) = sum_j gamma_j f(xs[j]) over GF(2053), cached per index set."""
+    weights = np.array([GF2053.lagrange_coefficient(list(xs), 0, j) for j in range(len(xs))],
+                       dtype=np.int64)
+    weights.setflags(write=False)
+    return weights
+
+
+# ----------------------------------------------------------------------------
+# Trees
+# ----------------------------------------------------------------------------
+
+def build_tree(secret: Sequence[int], layers: Sequence[Layer], profile: str = 'full',
+               rng: Optional[np.random.Generator] = None) -> List[NestedShare]:
+    """
+    Split a secret through every layer of a layout.
+
+    Args:
+        secret: Word values at the outermost layer (BIP39 indices 1..2048)
+        layers: Layout, outermost first (see parse_layout)
+        profile: 'full' or 'compact' (limits depth and path values)
+        rng: NumPy generator for the polynomial coefficients
+
+    Returns:
+        Every leaf, ordered by index path
+
+    Raises:
+        ValueError: On an invalid layout or secret
+    """
+    validate_layout(layers, profile)
+    if len(secret) % 3 or any(not 1 <= w <= 2048 for w in secret):
+        raise ValueError("Secret must be BIP39 indices 1..2048, a multiple of three words")
+    rng = rng if rng is not None else np.random.default_rng()
+
+    leaves: List[NestedShare] = []
+    paths: List[Path] = [((), ())]
+    values = np.asarray([secret], dtype=np.int64)
+    for depth, layer in enumerate(layers):
+        children = split_values(values, layer.k, layer.n, rng).reshape(-1, len(secret))
+        paths = [(t + (layer.k,), xs + (x,)) for t, xs in paths for x in range(1, layer.n + 1)]
+        last = depth == len(layers) - 1
+        keep = np.array([last or not layer.nested(xs[-1]) for _, xs in paths], dtype=bool)
+        if keep.any():
+            words = children[keep]
+            kept = [path for path, leaf in zip(paths, keep) if leaf]
+            checks = table_checksums(words, [xs[-1] for _, xs in kept])
+            leaves += [NestedShare(list(t), list(xs), Share(xs[-1], w, c))
+                       for (t, xs), w, c in zip(kept, words.tolist(), checks.tolist())]
+        paths = [path for path, leaf in zip(paths, keep) if not leaf]
+        values = children[~keep]
+    leaves.sort(key=lambda leaf: leaf.indices)
+    return leaves
+
+
+def recover_tree(leaves: Sequence[NestedShare], verify: bool = True) -> List[int]:
+    """
+    Recover the outermost secret from any sufficient set of leaves.
+
+    Leaves may come from any mix of depths and sub-trees. Working from the
+    deepest layer up, each node with at least k distinct recovered children
+    is rebuilt from its k lowest indices; all nodes of one layer that use
+    the same index set are combined in one batched product. Nodes without
+    enough children are skipped, so any valid recovery path suffices.
+
+    Args:
+        leaves: NestedShares from one custody tree
+        verify: Check every leaf's share table and the checksums recovered
+                at every node (the manual STOP checks)
+
+    Returns:
+        Recovered BIP39 indices (1-based)
+
+    Raises:
+        ValueError: On inconsistent paths, duplicate leaves, a checksum
+                    mismatch, too few leaves, or an index outside 1..2048
+    """
+    if not leaves:
+        raise ValueError("No shares given")
+    m = len(leaves[0].share.words)
+    nodes: Dict[Path, np.ndarray] = {}
+    for leaf in leaves:
+        t, xs = leaf.path
+        if len(t) != len(xs) or not xs or 0 in xs or any(k < 1 for k in t):
+            raise ValueError(f"Invalid layer path {list(t)} / {list(xs)}")
+        if leaf.share.index != xs[-1] or len(leaf.share.words) != m:
+            raise ValueError(f"Share at {list(xs)} does not match its path or word count")
+        if verify and leaf.share.checksums != share_checksums(leaf.share.words, xs[-1]):
+            raise ValueError(f"Checksum mismatch on share {list(xs)}")
+        if leaf.path in nodes:
+            raise ValueError(f"Duplicate share {list(xs)}")
+        nodes[leaf.path] = np.concatenate([leaf.share.words, leaf.share.checksums])
+
+    for depth in range(max(len(xs) for _, xs in nodes), 0, -1):
+        families: Dict[Path, Dict[int, np.ndarray]] = defaultdict(dict)
+        thresholds: Dict[Path, int] = {}
+        for (t, xs), table in list(nodes.items()):
+            if len(xs) != depth:
+                continue
+            parent = (t[:-1], xs[:-1])
+            if thresholds.setdefault(parent, t[-1]) != t[-1]:
+                raise ValueError(f"Inconsistent thresholds under {list(parent[1])}")
+            families[parent][xs[-1]] = table
+            del nodes[(t, xs)]
+
+        groups: Dict[Tuple[int, ...], List[Path]] = defaultdict(list)
+        for parent, children in families.items():
+            if len(children) >= thresholds[parent]:
+                groups[tuple(sorted(children))[:thresholds[parent]]].append(parent)
+        for xs, parents in groups.items():
+            stacked = np.stack([[families[parent][x] for x in xs] for parent in parents])
+            tables = np.einsum('j,gjv->gv', lagrange_weights(xs), stacked) % PRIME
+            words = tables[:, :m]
+            if verify:
+                # The GIC's index term interpolates to sum(gamma_j * x_j): 0 for k >= 2,
+                # the copies' own index for k = 1
+                index_term = int(lagrange_weights(xs) @ np.array(xs)) % PRIME
+                mismatch = (tables[:, m:] != table_checksums(words, index_term)).any(axis=1)
+                if mismatch.any():
+                    bad = [list(parents[i][1]) for i in np.flatnonzero(mismatch)]
+                    raise ValueError(f"Recovered checksums do not match recovered words at {bad}")
+            own = [parent[1][-1] if parent[1] else 0 for parent in parents]
+            tables = np.concatenate([words, table_checksums(words, own)], axis=1)
+            for parent, table in zip(parents, tables):
+                nodes[parent] = table
+
+    root = nodes.get(((), ()))
+    if root is None:
+        raise ValueError("Not enough shares to recover the secret through any path")
+    words = root[:m].tolist()
+    if not all(1 <= w <= 2048 for w in words):
+        raise ValueError("Recovered index outside 1..2048")
+    return words
+
+
+def minimal_cover(leaves: Sequence[NestedShare], rng: np.random.Generator,
+                  layers: Sequence[Layer]) -> List[NestedShare]:
+    """
+    A random minimal recovery set: k random children at every node on the way down.
+
+    Args:
+        leaves: Every leaf of a tree built from `layers`
+        rng: Generator choosing the children
+        layers: The tree's layout
+
+    Returns:
+        The leaves of one random valid recovery path set
+    """
+    by_path = {leaf.path: leaf for leaf in leaves}
+    chosen, frontier = [], [((), ())]
+    for layer in layers:
+        nxt = []
+        for t, xs in frontier:
+            for x in sorted(rng.choice(layer.n, layer.k, replace=False) + 1):
+                child = (t + (layer.k,), xs + (int(x),))
+                if child in by_path:
+                    chosen.append(by_path[child])
+                else:
+                    nxt.append(child)
+        frontier = nxt
+    return chosen
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from pathlib import Path as FsPath
+
+    sys.path.insert(0, str(FsPath(__file__).resolve().parent.parent))
+    from shared.nested import (Layer, NestedShare, build_tree, lagrange_weights, minimal_cover,
+                               parse_layout, recover_tree, table_checksums, validate_layout)
+    from shared.payload import SharePayload
+    from shared.schiavinato_bridge import SchiavanatoPython
+
+    print("Nested Custody Self-Test")
+    print("=" * 60)
+
+    rng = np.random.default_rng(1)
+    secret = [int(w) for w in rng.integers(1, 2049, size=24)]
+
+    words = rng.integers(0, PRIME, size=(50, 24))
+    xs = rng.integers(1, 16, size=50)
+    assert all(table_checksums(words, xs)[i].tolist() == share_checksums(words[i].tolist(), int(xs[i]))
+               for i in range(50))
+    print("✓ Batched share tables match share_checksums")
+
+    flat = build_tree(secret, [Layer(3, 5)], rng=rng)
+    assert all(leaf.depth == 0 for leaf in flat)
+    assert SchiavanatoPython().recover_secret([leaf.share for leaf in flat[1:4]]) == secret
+    assert recover_tree(flat[2:]) == secret
+    print("✓ One-layer tree recovers through the flat recovery procedure too")
+
+    for profile, text in (('full', "2-of-3,3-of-4,2-of-3,2-of-2"), ('compact', "3-of-5,2-of-3")):
+        layers = parse_layout(text)
+        leaves = build_tree(secret, layers, profile, rng)
+        expected = int(np.prod([layer.n for layer in layers]))
+        assert len(leaves) == expected and all(leaf.depth == len(layers) - 1 for leaf in leaves)
+        for leaf in leaves:
+            thresholds, indices = leaf.encode_paths(profile)
+            assert NestedShare.decode_paths(thresholds, indices, leaf.depth, leaf.share,
+                                            profile).path == leaf.path
+        payload = SharePayload.decode(leaves[-1].payload(profile, bytes(8 if profile == 'full' else 4),
+                                                        bytes(12 if profile == 'full' else 6)).encode())
+        assert NestedShare.from_payload(payload).path == leaves[-1].path
+        for _ in range(20):
+            assert recover_tree(minimal_cover(leaves, rng, layers)) == secret
+        assert recover_tree(leaves) == secret
+        print(f"✓ {profile} {text}: {len(leaves)} leaves, paths round-trip, "
+              f"20 random minimal paths recover")
+
+    layers = parse_layout("2-of-3[1,3],3-of-3[2],1-of-2")
+    leaves = build_tree(secret, layers, 'full', rng)
+    assert sorted({leaf.depth for leaf in leaves}) == [0, 1, 2]
+    replicas = [leaf for leaf in leaves if leaf.depth == 2]
+    assert replicas[0].share.words == replicas[1].share.words
+    assert recover_tree([leaf for leaf in leaves if leaf.indices[0] != 1]) == secret
+    assert recover_tree([leaf for leaf in leaves if leaf.indices[0] != 2]) == secret
+    assert recover_tree(minimal_cover(leaves, rng, layers)) == secret
+    print("✓ Mixed-depth tree with selective nesting and k = 1 replicas recovers")
+
+    short = [leaf for leaf in leaves if leaf.indices[0] == 1 and leaf.indices != [1, 1]]
+    for bad, message in (
+        (lambda: validate_layout(parse_layout("2-of-3,2-of-3,2-of-3"), 'compact'), "layers"),
+        (lambda: validate_layout(parse_layout("2-of-3,2-of-3,2-of-16"), 'full'), "too large"),
+        (lambda: validate_layout(parse_layout("4-of-3"), 'full'), "threshold"),
+        (lambda: validate_layout(parse_layout("2-of-3[4],2-of-2"), 'full'), "nest list"),
+        (lambda: parse_layout("2of3"), "Malformed"),
+        (lambda: recover_tree(short), "Not enough"),
+        (lambda: recover_tree(leaves[:1] + leaves[:1]), "Duplicate"),
+        (lambda: recover_tree([NestedShare(leaves[0].thresholds, leaves[0].indices,
+                                           Share(leaves[0].share.index,
+                                                 [(leaves[0].share.words[0] + 1) % PRIME]
+                                                 + leaves[0].share.words[1:],
+                                                 leaves[0].share.checksums))]), "Checksum"),
+    ):
+        try:
+            bad()
+        except ValueError as e:
+            assert message in str(e), (message, str(e))
+        else:
+            raise AssertionError(f"expected ValueError ({message})")
+    print("✓ Bad depth, path values, thresholds, nest lists, duplicates and "
+          "insufficient or corrupted shares raise ValueError")
+
+    layers = parse_layout("3-of-5,3-of-5,3-of-5,3-of-5")
+    start = time.perf_counter()
+    leaves = build_tree(secret, layers, 'full', rng)
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    assert recover_tree(leaves) == secret
+    recovered = time.perf_counter() - start
+    print(f"✓ Four-layer 3-of-5 tree: {len(leaves)} leaves built in {built:.3f}s, "
+          f"recovered from all of them in {recovered:.3f}s "
+          f"({lagrange_weights.cache_info().currsize} cached weight sets)")
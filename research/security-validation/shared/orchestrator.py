@@ -0,0 +1,470 @@
+"""
+Validation-suite orchestrator.
+
+Expands experiments × configurations × seeds into a DAG of subprocess tasks
+(plus the rendering and warehouse stages that depend on them) and runs them
+concurrently under a global CPU and memory budget:
+
+    python -m shared.orchestrator --configs 2-3,3-5,4-7 --seeds 1,2,3
+    python -m shared.orchestrator --quick --cpus 8 --memory 16G
+    python -m shared.orchestrator --dry-run
+
+Each task declares the cores and memory it needs. A task starts once its
+dependencies have succeeded and its reservation fits into what is left of
+the budget. Tasks are considered in declaration order, with backfilling, so
+single-core jobs (Z3 searches, exact counts, the LLR check) run alongside
+the pool-heavy Experiment 1 runs instead of waiting for them. Status is
+streamed to stdout as tasks start and finish, and mirrored in
+`<results>/status.json`. Every task's output goes to `<results>/logs/`.
+
+Reproducible tasks (seeded runs, the exact counter, the LLR check) are looked
+up in the content-addressed result cache (shared/cache.py) before they are
+launched; a hit restores the task's outputs and log instead of running it,
+so re-running the suite after a docs-only change takes seconds.
+
+run_all_experiments.sh is a thin wrapper around this module.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .cache import ResultCache, cache_key, parse_size, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EXPERIMENTS = ('entropy', 'z3', 'counter', 'leakage', 'llr')
+
+
+@dataclass
+class Task:
+    """One subprocess in the suite DAG."""
+
+    name: str
+    command: List[str]
+    cwd: Path = ROOT
+    cpus: int = 1
+    memory_mb: int = 256
+    deps: List[str] = field(default_factory=list)
+    outputs: List[Path] = field(default_factory=list)  # files/dirs to cache
+    cacheable: bool = False  # result fully determined by code + command
+
+    # Filled in by the scheduler
+    status: str = 'queued'  # queued, running, passed, failed, skipped
+    returncode: Optional[int] = None
+    started: Optional[float] = None
+    seconds: Optional[float] = None
+    log: Optional[str] = None
+    cache_key: Optional[str] = None
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['cwd'] = str(self.cwd)
+        data['outputs'] = [str(p) for p in self.outputs]
+        return data
+
+
+def task_cache_key(task: Task, results_dir: Path) -> str:
+    """
+    Cache key of a task: its script, the shared modules and its command.
+
+    The results directory and interpreter path are normalized out of the
+    command so keys are stable across suite runs.
+    """
+    sources = [task.cwd / arg for arg in task.command if arg.endswith('.py')]
+    if '-m' in task.command:
+        module = task.command[task.command.index('-m') + 1]
+        sources.append(ROOT.joinpath(*module.split('.')).with_suffix('.py'))
+    command = [
+        'python' if arg == sys.executable else arg.replace(str(results_dir), '<results>')
+        for arg in task.command
+    ]
+    return cache_key(sources, {'task': task.name, 'command': command})
+
+
+def available_memory_mb() -> int:
+    """MemAvailable from /proc/meminfo, or 4 GiB when unknown."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return 4096
+
+
+def parse_memory(text: str) -> int:
+    """'16G', '512M' or a plain number of MiB -> MiB."""
+    text = text.strip().upper()
+    if text.endswith('G'):
+        return int(float(text[:-1]) * 1024)
+    if text.endswith('M'):
+        return int(float(text[:-1]))
+    return int(text)
+
+
+def run_dag(
+    tasks: List[Task],
+    cpus: int,
+    memory_mb: int,
+    log_dir: Path,
+    status_file: Optional[Path] = None,
+    report: Callable[[str], None] = print,
+    poll_seconds: float = 0.2,
+    cache: Optional[ResultCache] = None
+) -> List[Task]:
+    """
+    Run tasks respecting dependencies and a CPU/memory budget.
+
+    A task that alone exceeds the budget is clamped to it (it then runs by
+    itself). Dependents of a failed task are skipped. With a cache, tasks
+    carrying a `cache_key` are restored from it when possible and stored in
+    it after passing; cached files are relative to `log_dir.parent`.
+
+    Args:
+        tasks: Tasks in priority order (names unique)
+        cpus: Cores available to the suite
+        memory_mb: Memory available to the suite (MiB)
+        log_dir: Directory for per-task logs
+        status_file: Optional JSON file rewritten on every state change
+        report: Sink for streamed status lines
+        poll_seconds: Process polling interval
+        cache: Optional result cache
+
+    Returns:
+        The tasks with status, return codes and timings filled in
+
+    Raises:
+        ValueError: On duplicate names or unknown dependencies
+    """
+    by_name = {t.name: t for t in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("Task names must be unique")
+    for t in tasks:
+        missing = [d for d in t.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"{t.name}: unknown dependencies {missing}")
+
+    log_dir.mkdir(parents=True, exist_ok=True)
+    base = log_dir.parent
+    start = time.perf_counter()
+    running: Dict[str, subprocess.Popen] = {}
+    handles = {}
+    free_cpus, free_mem = cpus, memory_mb
+
+    def need(t: Task):
+        return min(t.cpus, cpus), min(t.memory_mb, memory_mb)
+
+    def emit(message: str):
+        counts = {s: sum(t.status == s for t in tasks)
+                  for s in ('running', 'queued', 'passed', 'failed', 'skipped')}
+        report(f"[{time.perf_counter() - start:8.1f}s] {message:<58} "
+               f"run {counts['running']} | queue {counts['queued']} | "
+               f"ok {counts['passed']} | fail {counts['failed'] + counts['skipped']}")
+        if status_file is not None:
+            with open(status_file, 'w') as f:
+                json.dump({
+                    'elapsed_seconds': time.perf_counter() - start,
+                    'budget': {'cpus': cpus, 'memory_mb': memory_mb},
+                    'free': {'cpus': free_cpus, 'memory_mb': free_mem},
+                    'tasks': [t.to_dict() for t in tasks],
+                }, f, indent=2)
+
+    while True:
+        # Skip dependents of failures (transitively, in declaration order)
+        for t in tasks:
+            if t.status == 'queued' and any(
+                by_name[d].status in ('failed', 'skipped') for d in t.deps
+            ):
+                t.status = 'skipped'
+                emit(f"skip  {t.name}")
+
+        # Launch everything that is ready and fits (first fit, backfilling)
+        for t in tasks:
+            if t.status != 'queued' or any(by_name[d].status != 'passed' for d in t.deps):
+                continue
+            t.log = str(log_dir / f"{t.name.replace('/', '_')}.log")
+            if cache is not None and t.cache_key and cache.get(t.cache_key, base):
+                t.status, t.cached, t.returncode, t.seconds = 'passed', True, 0, 0.0
+                emit(f"cache {t.name}")
+                continue
+            c, m = need(t)
+            if c > free_cpus or m > free_mem:
+                continue
+            handles[t.name] = open(t.log, 'w')
+            running[t.name] = subprocess.Popen(
+                t.command, cwd=t.cwd, stdout=handles[t.name], stderr=subprocess.STDOUT
+            )
+            free_cpus, free_mem = free_cpus - c, free_mem - m
+            t.status, t.started = 'running', time.perf_counter() - start
+            emit(f"start {t.name} ({c} cpu, {m} MB)")
+
+        if not running:
+            break  # nothing running and nothing could start
+
+        time.sleep(poll_seconds)
+        for name, process in list(running.items()):
+            code = process.poll()
+            if code is None:
+                continue
+            t = by_name[name]
+            del running[name]
+            handles.pop(name).close()
+            c, m = need(t)
+            free_cpus, free_mem = free_cpus + c, free_mem + m
+            t.returncode = code
+            t.seconds = time.perf_counter() - start - t.started
+            t.status = 'passed' if code == 0 else 'failed'
+            if cache is not None and t.cache_key and code == 0:
+                cache.put(t.cache_key, t.outputs + [Path(t.log)], base, name=t.name,
+                          config={'command': t.command})
+            emit(f"{'done ' if code == 0 else 'FAIL '} {t.name} ({t.seconds:.1f}s)")
+
+    return tasks
+
+
+def build_suite(args, results_dir: Path) -> List[Task]:
+    """
+    Expand the experiment × config × seed matrix into tasks.
+
+    Resource estimates are per task: Experiment 1 reserves its pool size,
+    everything else one core.
+    """
+    python = sys.executable
+    configs = [tuple(map(int, c.strip().split('-'))) for c in args.configs.split(',')]
+    seeds = [int(s) for s in args.seeds.split(',')] if args.seeds else [None]
+    entropy_workers = args.entropy_workers or max(1, args.cpus // 2)
+    entropy_budget = []
+    if args.time_budget is not None and 'entropy' in args.experiments:
+        # Experiment 1 tasks run min(count, cpus // workers) at a time; each
+        # gets its share of the wall-clock budget
+        count = len(configs) * len(seeds)
+        parallel = min(count, max(1, args.cpus // entropy_workers))
+        entropy_budget = ['--time-budget', f"{args.time_budget * parallel / count:.0f}"]
+    tasks: List[Task] = []
+    entropy_tasks = []
+
+    def seed_args(seed):
+        return ['--seed', str(seed)] if seed is not None else []
+
+    def seed_dir(seed):
+        return f"seed-{seed}" if seed is not None else "unseeded"
+
+    for seed in seeds:
+        for k, n in configs:
+            tag = f"{k}-of-{n}/{seed_dir(seed)}"
+            if 'entropy' in args.experiments:
+                name = f"entropy/{tag}"
+                tasks.append(Task(
+                    name=name,
+                    command=[python, 'entropy_conservation.py',
+                             '--samples', str(args.samples),
+                             '--configs', f"{k}-{n}", '--render', 'none',
+                             '--workers', str(entropy_workers), '--no-cache',
+                             '--output', str(results_dir / 'experiment-1' / seed_dir(seed))]
+                            + seed_args(seed) + (['--sequential'] if args.sequential else [])
+                            + (entropy_budget or ['--trials', str(args.trials)]),
+                    cwd=ROOT / 'experiment-1-entropy',
+                    cpus=entropy_workers,
+                    memory_mb=256 + 128 * entropy_workers,
+                    outputs=[results_dir / 'experiment-1' / seed_dir(seed) / f"{k}-of-{n}"],
+                    cacheable=seed is not None and not entropy_budget,
+                ))
+                entropy_tasks.append(name)
+            if 'z3' in args.experiments:
+                for reveal in args.reveal.split(','):
+                    output = (results_dir / 'experiment-3' / seed_dir(seed)
+                              / f"{k}-of-{n}" / f"z3_{reveal}.json")
+                    tasks.append(Task(
+                        name=f"z3/{tag}/{reveal}",
+                        command=[python, 'adversarial_search.py', '--k', str(k), '--n', str(n),
+                                 '--reveal', reveal, '--timeout', str(args.timeout),
+                                 '--workers', '1', '--output', str(output)]
+                                + seed_args(seed),
+                        cwd=ROOT / 'experiment-3-constraints',
+                        memory_mb=512,
+                        outputs=[output],
+                        cacheable=seed is not None,
+                    ))
+            if 'leakage' in args.experiments:
+                output = results_dir / 'experiment-3' / seed_dir(seed) / f"{k}-of-{n}" / 'leakage.json'
+                tasks.append(Task(
+                    name=f"leakage/{tag}",
+                    command=[python, 'leakage_dimension.py', '--k', str(k), '--n', str(n),
+                             '--output', str(output)]
+                            + seed_args(seed),
+                    cwd=ROOT / 'experiment-3-constraints',
+                    outputs=[output],
+                    cacheable=True,  # --seed defaults to 42
+                ))
+        if 'counter' in args.experiments:
+            output = results_dir / 'experiment-3' / seed_dir(seed) / 'checksum_count.json'
+            tasks.append(Task(
+                name=f"counter/{seed_dir(seed)}",
+                command=[python, 'checksum_counter.py', '--reveal', 'all', '--workers', '1',
+                         '--seed', str(seed if seed is not None else 0),
+                         '--output', str(output)],
+                cwd=ROOT / 'experiment-3-constraints',
+                memory_mb=1024,
+                outputs=[output],
+                cacheable=True,
+            ))
+
+    if 'llr' in args.experiments:
+        tasks.append(Task(
+            name='llr',
+            command=[python, 'llr_uniformity.py', '--extra'] + (['--full'] if not args.quick else []),
+            cwd=ROOT / 'llr-uniformity',
+            memory_mb=1024,
+            cacheable=True,  # exhaustive and deterministic; the log is the result
+        ))
+
+    if entropy_tasks:
+        if args.render:
+            tasks.append(Task(
+                name='render/experiment-1',
+                command=[python, '-m', 'shared.rendering', str(results_dir / 'experiment-1'),
+                         '--workers', str(max(1, min(4, args.cpus)))],
+                cpus=max(1, min(4, args.cpus)),
+                memory_mb=1024,
+                deps=list(entropy_tasks),
+            ))
+        if args.warehouse:
+            tasks.append(Task(
+                name='warehouse/ingest',
+                command=[python, '-m', 'shared.warehouse', '--db', str(args.warehouse),
+                         'ingest', str(results_dir / 'experiment-1')],
+                deps=list(entropy_tasks),
+            ))
+    return tasks
+
+
+def write_summary(tasks: List[Task], results_dir: Path, args, elapsed: float) -> Path:
+    """SUMMARY.md listing every task's outcome."""
+    passed = sum(t.status == 'passed' for t in tasks)
+    lines = [
+        "# Security Validation Suite - Summary",
+        "",
+        f"**Date**: {datetime.datetime.now().isoformat(timespec='seconds')}",
+        f"**Configs**: {args.configs}  ",
+        f"**Seeds**: {args.seeds or 'unseeded'}  ",
+        f"**Trials / samples**: {args.trials} / {args.samples}  ",
+        f"**Budget**: {args.cpus} CPUs, {args.memory_mb} MB  ",
+        f"**Wall time**: {elapsed / 60:.1f} min",
+        "",
+        "| Task | Status | Seconds | Log |",
+        "|------|--------|---------|-----|",
+    ]
+    icons = {'passed': '✅ PASS', 'failed': '❌ FAIL', 'skipped': '⏭ SKIPPED'}
+    for t in tasks:
+        seconds = f"{t.seconds:.1f}" if t.seconds is not None else ''
+        log = os.path.relpath(t.log, results_dir) if t.log else ''
+        status = icons.get(t.status, t.status) + (' (cached)' if t.cached else '')
+        lines.append(f"| {t.name} | {status} | {seconds} | {log} |")
+    cached = sum(t.cached for t in tasks)
+    lines += ["", f"**Overall**: {passed}/{len(tasks)} tasks passed ({cached} from cache)", ""]
+    path = results_dir / "SUMMARY.md"
+    path.write_text("\n".join(lines))
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run the validation suite as a DAG under a CPU/memory budget"
+    )
+    parser.add_argument('--configs', default='2-3,3-5,4-7', help='Comma-separated k-n pairs')
+    parser.add_argument('--seeds', '--seed', default=None,
+                        help='Comma-separated seeds; one task set per seed (default: unseeded)')
+    parser.add_argument('--trials', type=int, default=1000)
+    parser.add_argument('--samples', type=int, default=1000)
+    parser.add_argument('--timeout', type=int, default=300, help='Z3 timeout per task (s)')
+    parser.add_argument('--reveal', default='none,all',
+                        help='Z3 reveal settings per config (default: none,all)')
+    parser.add_argument('--quick', action='store_true',
+                        help='trials=100, samples=100, timeout=60, no n=2052 LLR sweep')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Experiment 1: stop each configuration once its SPRT decides')
+    parser.add_argument('--time-budget', type=float, default=None, metavar='SECONDS',
+                        help='Experiment 1: wall-clock budget shared by its tasks '
+                             '(trials/samples are calibrated to fit)')
+    parser.add_argument('--experiments', default=','.join(EXPERIMENTS),
+                        help=f'Subset of {",".join(EXPERIMENTS)}')
+    parser.add_argument('--cpus', type=int, default=os.cpu_count() or 1,
+                        help='CPU budget (default: all cores)')
+    parser.add_argument('--memory', default=None,
+                        help='Memory budget, e.g. 16G (default: 80%% of available)')
+    parser.add_argument('--entropy-workers', type=int, default=None,
+                        help='Pool size per Experiment 1 task (default: half the CPU budget)')
+    parser.add_argument('--no-render', dest='render', action='store_false',
+                        help='Skip the rendering stage')
+    parser.add_argument('--warehouse', type=Path, default=None,
+                        help='Ingest Experiment 1 reports into this warehouse DB')
+    parser.add_argument('--output', type=Path, default=None,
+                        help='Results directory (default: results/<timestamp>_full_suite)')
+    parser.add_argument('--no-cache', dest='cache', action='store_false',
+                        help='Run every task even when a cached result exists')
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE_DIR,
+                        help=f'Result cache directory (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--cache-size', default=None,
+                        help=f'Cache size limit, e.g. 2G (default: {DEFAULT_MAX_BYTES >> 30}G)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the task DAG and exit')
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.trials, args.samples, args.timeout = 100, 100, 60
+    args.experiments = [e.strip() for e in args.experiments.split(',')]
+    unknown = set(args.experiments) - set(EXPERIMENTS)
+    if unknown:
+        parser.error(f"Unknown experiments: {sorted(unknown)}")
+    args.memory_mb = (parse_memory(args.memory) if args.memory
+                      else int(available_memory_mb() * 0.8))
+
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    results_dir = (args.output or ROOT / 'results' / f"{timestamp}_full_suite").resolve()
+    tasks = build_suite(args, results_dir)
+    cache = None
+    if args.cache:
+        cache = ResultCache(args.cache_dir, parse_size(args.cache_size) if args.cache_size
+                            else DEFAULT_MAX_BYTES)
+        for t in tasks:
+            if t.cacheable:
+                t.cache_key = task_cache_key(t, results_dir)
+
+    print(f"Validation suite: {len(tasks)} tasks, budget {args.cpus} CPUs / "
+          f"{args.memory_mb} MB")
+    if args.dry_run:
+        for t in tasks:
+            deps = f" <- {', '.join(t.deps)}" if t.deps else ''
+            hit = ' [cached]' if cache and t.cache_key and cache.has(t.cache_key) else ''
+            print(f"  {t.name:<40} {t.cpus} cpu {t.memory_mb:>5} MB{hit}{deps}")
+        return 0
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Results: {results_dir}\n")
+    start = time.perf_counter()
+    run_dag(tasks, args.cpus, args.memory_mb, results_dir / 'logs',
+            status_file=results_dir / 'status.json', cache=cache)
+    elapsed = time.perf_counter() - start
+    summary = write_summary(tasks, results_dir, args, elapsed)
+
+    failed = [t.name for t in tasks if t.status != 'passed']
+    cached = sum(t.cached for t in tasks)
+    print(f"\n{len(tasks) - len(failed)}/{len(tasks)} tasks passed in {elapsed / 60:.1f} min"
+          + (f" ({cached} from cache)" if cached else ""))
+    for name in failed:
+        print(f"  ✗ {name}")
+    print(f"Summary: {summary}")
+    return 0 if not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""
+v0.7.0 Share Payload encoding (software spec, "Full Payload" / "Compact Payload").
+
+    Full:    SF || V || F || L || K(2) || X(2) || B(8) || R(12) || ShareData || H(16)
+    Compact: SC || V || F || L || K(1) || X(1) || B(4) || R(6)  || ShareData
+
+ShareData packs GF(2053) values as 12-bit MSB-first integers: the complete
+arithmetic table (word shares, row checksums, column checksums, printed GIC)
+for Full, word shares only (zero-padded to a byte) for Compact. H is the
+first 16 bytes of SHA-256 over everything before it.
+
+Used by the QR workload scripts to build realistic payloads; verified
+against the payload vectors in test_vectors/vectors.json.
+"""
+
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    from .schiavinato_bridge import share_checksums
+except ImportError:  # executed directly for the self-test below
+    from schiavinato_bridge import share_checksums
+
+P = 2053
+PROTOCOL_VERSION = 0x01
+PREFIXES = {'full': b"SF", 'compact': b"SC"}
+PATH_BYTES = {'full': 2, 'compact': 1}
+BATCH_BYTES = {'full': 8, 'compact': 4}
+RBT_BYTES = {'full': 12, 'compact': 6}
+MAX_DEPTH = {'full': 3, 'compact': 1}  # nesting depth (layers - 1)
+HASH_BYTES = 16
+RBT_ITERATIONS = 16384
+
+WORD_COUNT_CODES = {12: 0, 15: 1, 18: 2, 21: 3, 24: 4}
+WALLET_HINTS = range(6)  # 000..101; 110 and 111 are reserved
+
+
+def pack12(values: Sequence[int]) -> bytes:
+    """Pack 12-bit values MSB-first, zero-padding the last byte."""
+    acc = 0
+    for v in values:
+        if not 0 <= v < 4096:
+            raise ValueError(f"Value {v} does not fit in 12 bits")
+        acc = (acc << 12) | v
+    bits = 12 * len(values)
+    pad = -bits % 8
+    return (acc << pad).to_bytes((bits + pad) // 8, 'big')
+
+
+def unpack12(data: bytes, count: int) -> List[int]:
+    """Inverse of pack12 for `count` values."""
+    bits = 12 * count
+    if 8 * len(data) < bits:
+        raise ValueError(f"{len(data)} bytes cannot hold {count} 12-bit values")
+    acc = int.from_bytes(data, 'big') >> (8 * len(data) - bits)
+    return [(acc >> (12 * (count - 1 - i))) & 0xFFF for i in range(count)]
+
+
+def flags_byte(word_count: int, wallet_hint: int = 0, depth: int = 0,
+               profile: str = 'full') -> int:
+    """
+    Flags: bits 0-2 word count code, 3-5 wallet hint, 6-7 nesting depth.
+
+    Raises:
+        ValueError: On an unsupported word count, hint or depth
+    """
+    if word_count not in WORD_COUNT_CODES:
+        raise ValueError(f"Unsupported word count: {word_count}")
+    if wallet_hint not in WALLET_HINTS:
+        raise ValueError(f"Reserved wallet hint: {wallet_hint}")
+    if not 0 <= depth <= MAX_DEPTH[profile]:
+        raise ValueError(f"{profile} payloads support depth 0..{MAX_DEPTH[profile]}")
+    return WORD_COUNT_CODES[word_count] | (wallet_hint << 3) | (depth << 6)
+
+
+def parse_flags(flags: int, profile: str = 'full') -> Tuple[int, int, int]:
+    """(word_count, wallet_hint, depth) from a flags byte."""
+    codes = {code: count for count, code in WORD_COUNT_CODES.items()}
+    depth = flags >> 6
+    if flags & 0x07 not in codes or (flags >> 3) & 0x07 not in WALLET_HINTS:
+        raise ValueError(f"Reserved flags bits set: {flags:#04x}")
+    if depth > MAX_DEPTH[profile]:
+        raise ValueError(f"Depth {depth} not allowed in {profile} payloads")
+    return codes[flags & 0x07], (flags >> 3) & 0x07, depth
+
+
+def encode_path(layers: Sequence[int], profile: str = 'full') -> bytes:
+    """
+    Threshold or Share-index path, outermost layer first.
+
+    Full: depth 0/1 use one byte per layer; depth 2/3 pack four-bit layers
+    MSB-first. Compact: depth 0 is one byte, depth 1 puts layer 0 in the
+    low nibble and layer 1 in the high nibble.
+
+    Raises:
+        ValueError: If a value does not fit its field or the depth is too large
+    """
+    depth = len(layers) - 1
+    if not 0 <= depth <= MAX_DEPTH[profile]:
+        raise ValueError(f"{profile} paths hold 1..{MAX_DEPTH[profile] + 1} layers")
+    if any(v < 1 for v in layers):
+        raise ValueError("Path values must be nonzero")
+    nibbles = (profile == 'full' and depth >= 2) or (profile == 'compact' and depth == 1)
+    if any(v > (15 if nibbles else 255) for v in layers):
+        raise ValueError(f"Path value too large for a depth-{depth} {profile} path")
+    if profile == 'compact':
+        return bytes([layers[0] if depth == 0 else layers[0] | (layers[1] << 4)])
+    if depth <= 1:
+        return bytes([layers[0], layers[1] if depth else 0])
+    padded = list(layers) + [0] * (4 - len(layers))
+    return bytes([(padded[0] << 4) | padded[1], (padded[2] << 4) | padded[3]])
+
+
+def decode_path(data: bytes, depth: int, profile: str = 'full') -> List[int]:
+    """Inverse of encode_path for a known depth."""
+    if len(data) != PATH_BYTES[profile]:
+        raise ValueError(f"{profile} paths are {PATH_BYTES[profile]} byte(s)")
+    if profile == 'compact':
+        layers = [data[0]] if depth == 0 else [data[0] & 0x0F, data[0] >> 4]
+    elif depth <= 1:
+        layers = [data[0], data[1]][:depth + 1]
+    else:
+        layers = [data[0] >> 4, data[0] & 0x0F, data[1] >> 4, data[1] & 0x0F][:depth + 1]
+    if any(v == 0 for v in layers):
+        raise ValueError("Zero value in path")
+    return layers
+
+
+def transport_hash(body: bytes) -> bytes:
+    return hashlib.sha256(body).digest()[:HASH_BYTES]
+
+
+def derive_rbt(language: int, base_values: Sequence[int], batch_id: bytes,
+               profile: str = 'full') -> bytes:
+    """RBT: PBKDF2-HMAC-SHA512(L || pack12(inputs at x=0), B), truncated."""
+    material = bytes([language]) + pack12(base_values)
+    key = hashlib.pbkdf2_hmac('sha512', material, batch_id, RBT_ITERATIONS, 32)
+    return key[:RBT_BYTES[profile]]
+
+
+@dataclass
+class SharePayload:
+    """Decoded Share Payload fields (paths are outermost layer first)."""
+    profile: str
+    word_count: int
+    wallet_hint: int
+    language: int
+    thresholds: List[int]
+    indices: List[int]
+    batch_id: bytes
+    rbt: bytes
+    words: List[int]
+    checksums: Optional[List[int]] = None  # rows + columns + GIC (Full only)
+
+    def encode(self) -> bytes:
+        """
+        Serialize the payload.
+
+        Raises:
+            ValueError: On field sizes or values the spec does not allow
+        """
+        profile = self.profile
+        if len(self.thresholds) != len(self.indices):
+            raise ValueError("Threshold and index paths must have the same depth")
+        if len(self.batch_id) != BATCH_BYTES[profile] or len(self.rbt) != RBT_BYTES[profile]:
+            raise ValueError(f"Wrong Session Batch ID or RBT length for {profile}")
+        if len(self.words) != self.word_count or any(not 0 <= v < P for v in self.words):
+            raise ValueError("Word shares must be word_count values in 0..2052")
+        values = list(self.words)
+        if profile == 'full':
+            if self.checksums is None or len(self.checksums) != self.word_count // 3 + 4:
+                raise ValueError("Full payloads carry the complete arithmetic table")
+            values += self.checksums
+        body = (
+            PREFIXES[profile]
+            + bytes([PROTOCOL_VERSION,
+                     flags_byte(self.word_count, self.wallet_hint, len(self.indices) - 1, profile),
+                     self.language])
+            + encode_path(self.thresholds, profile)
+            + encode_path(self.indices, profile)
+            + self.batch_id + self.rbt + pack12(values)
+        )
+        return body + transport_hash(body) if profile == 'full' else body
+
+    @classmethod
+    def decode(cls, data: bytes) -> 'SharePayload':
+        """
+        Parse and check a payload (prefix, version, flags, lengths, Transport Hash).
+
+        Raises:
+            ValueError: On any malformed or STOP condition
+        """
+        profile = {v: k for k, v in PREFIXES.items()}.get(bytes(data[:2]))
+        if profile is None:
+            raise ValueError("Unknown profile prefix")
+        if data[2] != PROTOCOL_VERSION:
+            raise ValueError(f"Unsupported protocol version {data[2]:#04x}")
+        word_count, hint, depth = parse_flags(data[3], profile)
+        language = data[4]
+        pos = 5
+        path = PATH_BYTES[profile]
+        thresholds = decode_path(data[pos:pos + path], depth, profile)
+        indices = decode_path(data[pos + path:pos + 2 * path], depth, profile)
+        pos += 2 * path
+        batch_id = bytes(data[pos:pos + BATCH_BYTES[profile]])
+        pos += BATCH_BYTES[profile]
+        rbt = bytes(data[pos:pos + RBT_BYTES[profile]])
+        pos += RBT_BYTES[profile]
+        count = word_count + (word_count // 3 + 4 if profile == 'full' else 0)
+        share_bytes = (12 * count + 7) // 8
+        if len(data) != pos + share_bytes + (HASH_BYTES if profile == 'full' else 0):
+            raise ValueError("Payload length does not match its flags")
+        values = unpack12(data[pos:pos + share_bytes], count)
+        if any(v >= P for v in values):
+            raise ValueError("ShareData value outside GF(2053)")
+        if profile == 'full' and transport_hash(data[:-HASH_BYTES]) != bytes(data[-HASH_BYTES:]):
+            raise ValueError("Transport Hash mismatch")
+        return cls(profile, word_count, hint, language, thresholds, indices, batch_id, rbt,
+                   values[:word_count], values[word_count:] if profile == 'full' else None)
+
+
+def payload_size(profile: str, word_count: int) -> int:
+    """Payload bytes for a profile and word count (spec payload-size tables)."""
+    count = word_count + (word_count // 3 + 4 if profile == 'full' else 0)
+    fixed = 2 + 3 + 2 * PATH_BYTES[profile] + BATCH_BYTES[profile] + RBT_BYTES[profile]
+    return fixed + (12 * count + 7) // 8 + (HASH_BYTES if profile == 'full' else 0)
+
+
+def random_payload(profile: str, word_count: int, rng: random.Random,
+                   depth: int = 0) -> bytes:
+    """
+    A realistic payload: uniform word shares on a random share index, the
+    matching checksums, random Session Batch ID and hint. The RBT is random
+    bytes (a PBKDF2 output is indistinguishable from them and costs ~10 ms).
+    """
+    layers = depth + 1
+    cap = 15 if layers > 2 or (profile == 'compact' and layers == 2) else 255
+    thresholds = [rng.randint(2, min(cap, 9)) for _ in range(layers)]
+    indices = [rng.randint(1, min(cap, t + 3)) for t in thresholds]
+    words = [rng.randrange(P) for _ in range(word_count)]
+    return SharePayload(
+        profile=profile,
+        word_count=word_count,
+        wallet_hint=rng.choice(WALLET_HINTS),
+        language=0x01,
+        thresholds=thresholds,
+        indices=indices,
+        batch_id=rng.randbytes(BATCH_BYTES[profile]),
+        rbt=rng.randbytes(RBT_BYTES[profile]),
+        words=words,
+        checksums=share_checksums(words, indices[-1]) if profile == 'full' else None,
+    ).encode()
+
+
+if __name__ == "__main__":
+    import json
+    from pathlib import Path
+
+    print("Share Payload Self-Test")
+    print("=" * 60)
+
+    vectors = Path(__file__).resolve().parents[3] / "test_vectors" / "vectors.json"
+    with open(vectors) as f:
+        vector = json.load(f)['vectors'][0]
+    params = vector['params']
+    flags = int(params['flags_hex'], 16)
+    word_count, hint, depth = parse_flags(flags)
+    language = int(params['language_input_byte_hex'], 16)
+    rbt = vector['rbt']
+    base = vector['mnemonic']['indices_1_based']
+    for profile in ('full', 'compact'):
+        batch = bytes.fromhex(rbt[f'{profile}_session_batch_id_hex'])
+        assert derive_rbt(language, base, batch, profile).hex().upper() == rbt[f'{profile}_rbt_hex']
+    print("✓ RBT derivation matches (Full and Compact)")
+
+    for share in vector['shares']:
+        for profile in ('full', 'compact'):
+            payload = SharePayload(
+                profile=profile, word_count=word_count, wallet_hint=hint, language=language,
+                thresholds=[params['threshold']['k']], indices=[share['x']],
+                batch_id=bytes.fromhex(rbt[f'{profile}_session_batch_id_hex']),
+                rbt=bytes.fromhex(rbt[f'{profile}_rbt_hex']),
+                words=share['word_values'],
+                checksums=(share['row_checksums'] + share['column_checksums']
+                           + [share['printed_gic']]) if profile == 'full' else None,
+            )
+            encoded = payload.encode()
+            expected = share[f'{profile}_payload']
+            assert encoded.hex().upper() == expected['payload_hex'], (share['x'], profile)
+            assert len(encoded) == expected['payload_len'] == payload_size(profile, word_count)
+            assert SharePayload.decode(encoded) == payload
+    print(f"✓ {vector['id']}: Full and Compact payloads of all "
+          f"{len(vector['shares'])} shares match and round-trip")
+
+    sizes = {(p, w): payload_size(p, w) for p in PREFIXES for w in WORD_COUNT_CODES}
+    assert [sizes['full', w] for w in WORD_COUNT_CODES] == [75, 81, 87, 93, 99]
+    assert [sizes['compact', w] for w in WORD_COUNT_CODES] == [35, 40, 44, 49, 53]
+    print("✓ Payload sizes match the spec tables")
+
+    rng = random.Random(7)
+    for profile, max_depth in MAX_DEPTH.items():
+        for d in range(max_depth + 1):
+            for w in WORD_COUNT_CODES:
+                data = random_payload(profile, w, rng, depth=d)
+                assert len(data) == sizes[profile, w]
+                decoded = SharePayload.decode(data)
+                assert len(decoded.indices) == d + 1 and decoded.encode() == data
+    corrupted = bytearray(random_payload('full', 24, rng))
+    corrupted[40] ^= 1
+    try:
+        SharePayload.decode(bytes(corrupted))
+        raise AssertionError("expected Transport Hash mismatch")
+    except ValueError:
+        pass
+    print("✓ Random nested payloads round-trip; corruption is a Transport Hash STOP")
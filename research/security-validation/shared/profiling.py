@@ -0,0 +1,421 @@
+"""
+Lightweight per-stage instrumentation for validation experiments.
+
+Provides:
+- Context-manager stage timers and named counters
+- Optional cProfile and tracemalloc capture (per worker process)
+- Merging of measurements collected in pool workers
+
+The merged result is stored in the `performance` section of an
+ExperimentReport and rendered in summary.md.
+"""
+
+import cProfile
+import json
+import pstats
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+@dataclass
+class StageStats:
+    """Accumulated timing (and optional memory peak) for one stage."""
+
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    peak_memory_bytes: int = 0
+
+    def record(self, elapsed: float, peak_bytes: int = 0):
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        self.peak_memory_bytes = max(self.peak_memory_bytes, peak_bytes)
+
+    def merge(self, other: 'StageStats'):
+        self.calls += other.calls
+        self.total_seconds += other.total_seconds
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+        self.peak_memory_bytes = max(self.peak_memory_bytes, other.peak_memory_bytes)
+
+
+class _StatsCarrier:
+    """Adapter letting pstats.Stats load a raw stats dict from a worker."""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Profiler:
+    """
+    Collects per-stage timings and counters.
+
+    A Profiler is cheap to create and picklable once `snapshot()` has been
+    taken, so each pool task can build its own, return `snapshot()` with its
+    result, and the parent folds the snapshots together with `merge()`.
+
+    Args:
+        profile: Enable cProfile for everything between `start()` and
+                 `snapshot()`
+        trace_memory: Enable tracemalloc and record per-stage memory peaks
+                      (stages should not be nested when this is enabled)
+    """
+
+    def __init__(self, profile: bool = False, trace_memory: bool = False):
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._pstats: Optional[Dict] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> 'Profiler':
+        """Start optional cProfile/tracemalloc capture."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.profile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def stop(self):
+        """Stop optional capture, keeping collected statistics."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.create_stats()
+            self._pstats = _merge_pstats(self._pstats, self._cprofile.stats)
+            self._cprofile = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block under `name`."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        else:
+            base = None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = 0
+            if base is not None:
+                _, peak_total = tracemalloc.get_traced_memory()
+                peak = max(0, peak_total - base)
+            self.stages.setdefault(name, StageStats()).record(elapsed, peak)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        """Record time measured elsewhere (e.g. IPC latency) under `name`."""
+        stats = self.stages.setdefault(name, StageStats())
+        stats.calls += calls
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def count(self, name: str, n: int = 1):
+        """Increment counter `name` by n."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> 'Profiler':
+        """Stop capture and return self in a picklable state."""
+        self.stop()
+        return self
+
+    def merge(self, other: 'Profiler'):
+        """Fold another profiler's measurements into this one."""
+        self.trace_memory = self.trace_memory or other.trace_memory
+        for name, stats in other.stages.items():
+            self.stages.setdefault(name, StageStats()).merge(stats)
+        for name, value in other.counters.items():
+            self.count(name, value)
+        if other._pstats:
+            self._pstats = _merge_pstats(self._pstats, other._pstats)
+
+    @classmethod
+    def merged(cls, profilers: Iterable['Profiler']) -> 'Profiler':
+        """Merge an iterable of profilers (e.g. one per pool task)."""
+        result = cls()
+        for profiler in profilers:
+            if profiler is not None:
+                result.merge(profiler)
+        return result
+
+    def hotspots(self, limit: int = 15) -> List[Dict[str, Any]]:
+        """Top functions by cumulative time from merged cProfile data."""
+        if not self._pstats:
+            return []
+        stats = pstats.Stats(_StatsCarrier(self._pstats))
+        rows = []
+        for func, (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            filename, line, name = func
+            rows.append({
+                'function': f"{_short_filename(filename)}:{line}({name})",
+                'calls': ncalls,
+                'self_seconds': tottime,
+                'cumulative_seconds': cumtime,
+            })
+        rows.sort(key=lambda r: r['cumulative_seconds'], reverse=True)
+        return rows[:limit]
+
+    def to_dict(
+        self,
+        wall_seconds: Optional[float] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the `performance` section of an ExperimentReport.
+
+        Args:
+            wall_seconds: Elapsed wall-clock time of the measured run
+            workers: Number of pool workers that contributed
+
+        Returns:
+            JSON-serializable dict
+        """
+        total = sum(s.total_seconds for s in self.stages.values())
+        stages = {}
+        for name, s in sorted(self.stages.items(), key=lambda kv: -kv[1].total_seconds):
+            entry = asdict(s)
+            entry['mean_seconds'] = s.total_seconds / s.calls if s.calls else 0.0
+            entry['share'] = s.total_seconds / total if total else 0.0
+            if not self.trace_memory:
+                entry.pop('peak_memory_bytes')
+            stages[name] = entry
+
+        performance: Dict[str, Any] = {}
+        if wall_seconds is not None:
+            performance['wall_seconds'] = wall_seconds
+        if workers is not None:
+            performance['workers'] = workers
+        performance['stages'] = stages
+        performance['counters'] = dict(self.counters)
+        hotspots = self.hotspots()
+        if hotspots:
+            performance['hotspots'] = hotspots
+        return performance
+
+
+class _NullProfiler(Profiler):
+    """Profiler that records nothing; used when instrumentation is off."""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        pass
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def _short_filename(filename: str) -> str:
+    """Shorten a code filename to its last two path components."""
+    parts = filename.replace('\\', '/').split('/')
+    return '/'.join(parts[-2:])
+
+
+def _merge_pstats(a: Optional[Dict], b: Dict) -> Dict:
+    """Sum two raw cProfile stats dicts."""
+    if not a:
+        return dict(b)
+    merged = dict(a)
+    for func, (cc, nc, tt, ct, callers) in b.items():
+        if func in merged:
+            cc0, nc0, tt0, ct0, callers0 = merged[func]
+            combined_callers = dict(callers0)
+            for caller, value in callers.items():
+                if caller in combined_callers:
+                    prev = combined_callers[caller]
+                    if isinstance(value, tuple):
+                        value = tuple(x + y for x, y in zip(prev, value))
+                    else:
+                        value = prev + value
+                combined_callers[caller] = value
+            merged[func] = (cc0 + cc, nc0 + nc, tt0 + tt, ct0 + ct, combined_callers)
+        else:
+            merged[func] = (cc, nc, tt, ct, callers)
+    return merged
+
+
+def format_performance_markdown(performance: Dict[str, Any]) -> str:
+    """Format a `performance` section as markdown."""
+    if not performance:
+        return "_No performance data recorded._"
+
+    lines = []
+    if 'wall_seconds' in performance:
+        lines.append(f"**Wall time**: {performance['wall_seconds']:.2f}s  ")
+    if 'workers' in performance:
+        lines.append(f"**Workers**: {performance['workers']}")
+    if lines:
+        lines.append("")
+
+    stages = performance.get('stages', {})
+    if stages:
+        with_memory = any('peak_memory_bytes' in s for s in stages.values())
+        header = "| Stage | Calls | Total (s) | Mean (ms) | Max (ms) | Share |"
+        divider = "|-------|-------|-----------|-----------|----------|-------|"
+        if with_memory:
+            header += " Peak memory (KiB) |"
+            divider += "-------------------|"
+        lines.extend([header, divider])
+        for name, s in stages.items():
+            row = (
+                f"| {name} | {s['calls']} | {s['total_seconds']:.3f} | "
+                f"{s['mean_seconds'] * 1000:.3f} | {s['max_seconds'] * 1000:.3f} | "
+                f"{s['share'] * 100:.1f}% |"
+            )
+            if with_memory:
+                row += f" {s.get('peak_memory_bytes', 0) / 1024:.1f} |"
+            lines.append(row)
+
+    counters = performance.get('counters', {})
+    if counters:
+        lines.append("")
+        lines.append("| Counter | Value |")
+        lines.append("|---------|-------|")
+        for name, value in counters.items():
+            lines.append(f"| {name} | {value} |")
+
+    hotspots = performance.get('hotspots', [])
+    if hotspots:
+        lines.append("")
+        lines.append("Top functions by cumulative time (cProfile, merged across workers):")
+        lines.append("")
+        lines.append("| Function | Calls | Self (s) | Cumulative (s) |")
+        lines.append("|----------|-------|----------|----------------|")
+        for h in hotspots:
+            lines.append(
+                f"| `{h['function']}` | {h['calls']} | {h['self_seconds']:.3f} | "
+                f"{h['cumulative_seconds']:.3f} |"
+            )
+
+    return "\n".join(lines)
+
+
+# Modules that must never be loaded by a bare `import shared` or by the
+# hot-path helpers pool workers use.
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'mnemonic', 'scipy', 'pandas')
+
+# Import-time budget for `import shared` (plus the worker-side helpers below)
+# in a fresh interpreter. Generous enough for slow CI machines; the eager
+# package used to take well over a second.
+IMPORT_BUDGET_SECONDS = 0.25
+
+
+def measure_import(
+    statement: str = "import shared",
+    heavy_modules: Iterable[str] = HEAVY_MODULES,
+    repeats: int = 3
+) -> Dict[str, Any]:
+    """
+    Time an import statement in fresh interpreters.
+    
+    Args:
+        statement: Python import statement to time
+        heavy_modules: Top-level module names to report if they got loaded
+        repeats: Number of fresh interpreters; the fastest run is reported
+    
+    Returns:
+        Dict with 'seconds' (best of `repeats`) and 'loaded_heavy_modules'
+    """
+    package_root = Path(__file__).resolve().parent.parent
+    probe = (
+        "import sys, time, json\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = sorted(m for m in {tuple(heavy_modules)!r} if m in sys.modules)\n"
+        "print(json.dumps({'seconds': elapsed, 'loaded_heavy_modules': heavy}))\n"
+    )
+    best = None
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", probe],
+            cwd=package_root,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        measurement = json.loads(out.stdout.strip().splitlines()[-1])
+        if best is None or measurement['seconds'] < best['seconds']:
+            best = measurement
+    return best
+
+
+def verify_import_budget(budget_seconds: float = IMPORT_BUDGET_SECONDS):
+    """
+    Guard against eager imports creeping back into the shared package.
+    
+    Raises:
+        AssertionError: If `import shared` (or the worker-side helpers) loads
+                        a heavy module or exceeds the time budget
+    """
+    checks = [
+        "import shared",
+        "import shared.reporting, shared.profiling, shared.field_arithmetic",
+        "from shared.bip39_utils import generate_random_bip39, is_valid_bip39",
+    ]
+    for statement in checks:
+        result = measure_import(statement)
+        heavy = result['loaded_heavy_modules']
+        assert not heavy, f"`{statement}` eagerly loaded {heavy}"
+        assert result['seconds'] <= budget_seconds, (
+            f"`{statement}` took {result['seconds']:.3f}s "
+            f"(budget {budget_seconds:.3f}s)"
+        )
+        print(f"✓ {statement}: {result['seconds'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    # Self-test
+    print("Profiling Utilities Self-Test")
+    print("=" * 60)
+
+    worker_a = Profiler(profile=True, trace_memory=True).start()
+    with worker_a.stage("allocate"):
+        blob = [0] * 100000
+    with worker_a.stage("sleep"):
+        time.sleep(0.01)
+    worker_a.count("items", 3)
+    worker_a.snapshot()
+
+    worker_b = Profiler().start()
+    with worker_b.stage("sleep"):
+        time.sleep(0.01)
+    worker_b.count("items", 2)
+    worker_b.snapshot()
+
+    merged = Profiler.merged([worker_a, worker_b])
+    assert merged.stages["sleep"].calls == 2, "Stage calls should merge"
+    assert merged.counters["items"] == 5, "Counters should merge"
+    assert merged.stages["allocate"].peak_memory_bytes > 0, "Memory peak should be captured"
+    print("✓ Stage/counter merge passed")
+
+    with NULL_PROFILER.stage("ignored"):
+        pass
+    assert not NULL_PROFILER.stages, "Null profiler must not record"
+    print("✓ Null profiler passed")
+
+    perf = merged.to_dict(wall_seconds=0.05, workers=2)
+    print(format_performance_markdown(perf))
+
+    print("\nAll profiling tests passed!")
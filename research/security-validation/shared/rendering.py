@@ -0,0 +1,350 @@
+"""
+Deferred report rendering stage.
+
+Experiments write raw results (report JSON plus a `render.json` manifest
+describing the figures to draw) and return immediately. This module turns
+those inputs into figures, `summary.md` and results tables, either inline,
+in a background process, or later from the command line:
+
+    python -m shared.rendering experiment-1-entropy/results/
+    python -m shared.rendering results/ --workers 4 --force
+
+Figures are rendered in parallel across a process pool, and every output is
+skipped when the hash of its inputs matches the one recorded the last time it
+was rendered.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MANIFEST_NAME = "render.json"
+STAMP_NAME = ".render_stamp.json"
+
+
+@dataclass
+class FigureJob:
+    """
+    One figure to render from raw data.
+
+    Each data series is either inline (`{"values": [...]}`) or a reference
+    to a column of a columnar results file (`{"file": "trials.npz",
+    "column": "consistent"}`, path relative to the manifest directory).
+    `comparison` figures take two series under "first" and "second".
+    """
+
+    kind: str  # "histogram", "convergence", "comparison"
+    output: str  # file name, relative to the manifest directory
+    data: Dict[str, Any]
+    options: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def write_render_manifest(
+    output_dir: Path,
+    report_file: str,
+    figures: List[FigureJob],
+    table: Optional[Dict[str, Any]] = None
+) -> Path:
+    """
+    Record what the rendering stage should produce for one result directory.
+
+    Args:
+        output_dir: Directory holding the raw results
+        report_file: ExperimentReport JSON file name (relative to output_dir);
+                     rendered to summary.md
+        figures: Figures to draw
+        table: Optional results-table row spec:
+               {"title": ..., "output": ..., "columns": {header: statistic key}}.
+               Rows from all manifests sharing a title are combined into one
+               table written next to the top-level rendering root.
+
+    Returns:
+        Path to the manifest
+    """
+    manifest = {
+        'report': report_file,
+        'figures': [f.to_dict() for f in figures],
+    }
+    if table is not None:
+        manifest['table'] = table
+    path = Path(output_dir) / MANIFEST_NAME
+    with open(path, 'w') as f:
+        json.dump(manifest, f)
+    return path
+
+
+def _digest(*parts: Any) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            h.update(part)
+        else:
+            h.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _series_refs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if 'first' in data:
+        return [data['first'], data['second']]
+    return [data]
+
+
+def _resolve_series(ref: Dict[str, Any], directory: Path):
+    if 'file' in ref:
+        from shared.columnar import load_columns
+        return load_columns(directory / ref['file'])[ref['column']]
+    return ref['values']
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _job_digest(job: Dict[str, Any], directory: Path) -> str:
+    files = sorted({ref['file'] for ref in _series_refs(job['data']) if 'file' in ref})
+    return _digest(job, [_file_digest(directory / name) for name in files])
+
+
+def _load_stamp(directory: Path) -> Dict[str, str]:
+    try:
+        with open(directory / STAMP_NAME) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_stamp(directory: Path, stamp: Dict[str, str]):
+    with open(directory / STAMP_NAME, 'w') as f:
+        json.dump(stamp, f, indent=2, sort_keys=True)
+
+
+def _is_fresh(stamp: Dict[str, str], output: Path, digest: str, force: bool) -> bool:
+    return not force and output.exists() and stamp.get(output.name) == digest
+
+
+def render_figure(job: Dict[str, Any], directory: str) -> str:
+    """
+    Render one figure (pool task).
+
+    Returns:
+        Path of the written file
+    """
+    from shared import reporting  # plotting libraries load in the worker only
+
+    output = Path(directory) / job['output']
+    kind = job['kind']
+    data = job['data']
+    options = job.get('options', {})
+
+    if kind == 'histogram':
+        values = _resolve_series(data, Path(directory))
+        reporting.plot_histogram(values, output_path=output, **options)
+    elif kind == 'convergence':
+        import numpy as np
+        values = np.asarray(_resolve_series(data, Path(directory)), dtype=np.float64)
+        running = np.cumsum(values) / np.arange(1, len(values) + 1)
+        reporting.plot_convergence(
+            np.arange(1, len(running) + 1), running, output_path=output, **options
+        )
+    elif kind == 'comparison':
+        reporting.plot_distribution_comparison(
+            _resolve_series(data['first'], Path(directory)),
+            _resolve_series(data['second'], Path(directory)),
+            output_path=output, **options
+        )
+    else:
+        raise ValueError(f"Unknown figure kind: {kind}")
+    return str(output)
+
+
+def render_table(title: str, headers: List[str], rows: List[List[Any]], output: str) -> str:
+    """Render a results table image (pool task)."""
+    from shared import reporting
+
+    reporting.create_results_table(headers, rows, title, Path(output))
+    return output
+
+
+def _format_cell(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.6f}" if abs(value) < 1 else f"{value:.2f}"
+    return str(value)
+
+
+def render_directory(
+    root: Path,
+    workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    Render every manifest found under `root`.
+
+    Args:
+        root: Results directory (searched recursively for render.json)
+        workers: Pool size for figure rendering (default: CPU count)
+        force: Re-render even when inputs are unchanged
+
+    Returns:
+        Dict with 'rendered', 'skipped' output lists and 'seconds'
+    """
+    from shared.reporting import ExperimentReport, generate_summary
+
+    root = Path(root)
+    start = time.perf_counter()
+    rendered: List[str] = []
+    skipped: List[str] = []
+    tables: Dict[str, Dict[str, Any]] = {}
+    figure_tasks = []
+    stamps: Dict[Path, Dict[str, str]] = {}
+
+    for manifest_path in sorted(root.rglob(MANIFEST_NAME)):
+        directory = manifest_path.parent
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        stamp = stamps.setdefault(directory, _load_stamp(directory))
+
+        report_path = directory / manifest['report']
+        report_bytes = report_path.read_bytes()
+
+        # summary.md depends on the report only
+        summary_path = directory / "summary.md"
+        digest = _digest(report_bytes)
+        if _is_fresh(stamp, summary_path, digest, force):
+            skipped.append(str(summary_path))
+        else:
+            report = ExperimentReport.from_json(report_path)
+            generate_summary(report, directory)
+            stamp[summary_path.name] = digest
+            rendered.append(str(summary_path))
+
+        for job in manifest.get('figures', []):
+            output = directory / job['output']
+            digest = _job_digest(job, directory)
+            if _is_fresh(stamp, output, digest, force):
+                skipped.append(str(output))
+            else:
+                figure_tasks.append((job, directory, digest))
+
+        table = manifest.get('table')
+        if table:
+            report = json.loads(report_bytes)
+            stats = report.get('statistical_summary', {})
+            spec = tables.setdefault(table['title'], {
+                'output': table['output'],
+                'headers': ['Experiment', 'Status'] + list(table['columns']),
+                'rows': [],
+            })
+            spec['rows'].append(
+                [report['experiment_name'], report['pass_fail']]
+                + [_format_cell(stats.get(key, '')) for key in table['columns'].values()]
+            )
+
+    root_stamp = stamps.setdefault(root, _load_stamp(root))
+    table_tasks = []
+    for title, spec in tables.items():
+        output = root / spec['output']
+        digest = _digest(title, spec['headers'], spec['rows'])
+        if _is_fresh(root_stamp, output, digest, force):
+            skipped.append(str(output))
+        else:
+            table_tasks.append((title, spec, output, digest))
+
+    if figure_tasks or table_tasks:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {}
+            for job, directory, digest in figure_tasks:
+                future = pool.submit(render_figure, job, str(directory))
+                futures[future] = (stamps[directory], directory / job['output'], digest)
+            for title, spec, output, digest in table_tasks:
+                future = pool.submit(
+                    render_table, title, spec['headers'], spec['rows'], str(output)
+                )
+                futures[future] = (root_stamp, output, digest)
+            for future in as_completed(futures):
+                stamp, output, digest = futures[future]
+                future.result()
+                stamp[output.name] = digest
+                rendered.append(str(output))
+
+    for directory, stamp in stamps.items():
+        if stamp:
+            _save_stamp(directory, stamp)
+
+    return {
+        'rendered': rendered,
+        'skipped': skipped,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def launch_background(
+    root: Path,
+    workers: Optional[int] = None,
+    log_file: Optional[Path] = None
+) -> subprocess.Popen:
+    """
+    Start the rendering stage in a detached background process.
+
+    Args:
+        root: Results directory to render
+        workers: Pool size for figure rendering
+        log_file: Where to write the renderer's output
+                  (default: <root>/render.log)
+
+    Returns:
+        The Popen handle (the caller does not need to wait on it)
+    """
+    root = Path(root).resolve()
+    log_file = Path(log_file) if log_file else root / "render.log"
+    cmd = [sys.executable, "-m", "shared.rendering", str(root)]
+    if workers:
+        cmd += ["--workers", str(workers)]
+    # The child keeps its own copy of the descriptor
+    with open(log_file, 'a') as log:
+        return subprocess.Popen(
+            cmd,
+            cwd=Path(__file__).resolve().parent.parent,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Render figures, summaries and tables from raw experiment results"
+    )
+    parser.add_argument('root', type=Path, help='Results directory')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Parallel rendering processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render outputs even if their inputs are unchanged')
+    args = parser.parse_args(argv)
+
+    result = render_directory(args.root, workers=args.workers, force=args.force)
+    print(
+        f"✓ Rendered {len(result['rendered'])} output(s), skipped "
+        f"{len(result['skipped'])} unchanged, in {result['seconds']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    # Re-import under the package name so pool workers can unpickle tasks
+    from shared.rendering import main as _main
+    sys.exit(_main())
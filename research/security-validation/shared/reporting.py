@@ -5,14 +5,56 @@ Provides consistent formatting for experiment results, statistical summaries,
 and publication-quality plots.
 """
 
+import os
+import sys
 import json
 import datetime
+import functools
+import subprocess
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
+from typing import Dict, Any, List, Mapping, Optional
+from dataclasses import dataclass, asdict, field
+
+try:
+    from .profiling import format_performance_markdown
+except ImportError:  # executed directly for the self-test below
+    from profiling import format_performance_markdown
+
+
+def _pyplot():
+    """
+    Import pyplot on first use, on a non-interactive backend.
+    
+    Keeps matplotlib (and seaborn) out of processes that never plot, such as
+    pool workers and report-less CLI runs.
+    """
+    import matplotlib
+    if "matplotlib.pyplot" not in sys.modules and not os.environ.get("MPLBACKEND"):
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """
+    Identify the code that produced a result.
+    
+    Returns:
+        `git describe --always --dirty` of this checkout, or the shared
+        package version when git is unavailable
+    """
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, timeout=10
+        )
+        if out.returncode == 0 and out.stdout.strip():
+            return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return "shared-0.1.0"
 
 
 @dataclass
@@ -26,6 +68,10 @@ class ExperimentReport:
     statistical_summary: Dict[str, Any]
     conclusion: str
     pass_fail: str  # "PASS", "FAIL", "MARGINAL", "INCONCLUSIVE"
+    performance: Dict[str, Any] = field(default_factory=dict)  # see shared.profiling
+    # Columnar result files (see shared.columnar), name -> path relative to the report
+    data_files: Dict[str, str] = field(default_factory=dict)
+    code_version: str = field(default_factory=code_version)
     
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -34,20 +80,56 @@ class ExperimentReport:
         """Save report as JSON."""
         with open(filepath, 'w') as f:
             json.dump(self.to_dict(), f, indent=2)
+        self._base_dir = Path(filepath).parent
     
     @classmethod
     def from_json(cls, filepath: Path) -> 'ExperimentReport':
         """Load report from JSON."""
         with open(filepath, 'r') as f:
             data = json.load(f)
-        return cls(**data)
+        data.setdefault('code_version', '')  # reports written before versioning
+        report = cls(**data)
+        report._base_dir = Path(filepath).parent
+        return report
+    
+    def load_data(
+        self,
+        name: str = "trials",
+        base_dir: Optional[Path] = None,
+        mmap: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load a referenced columnar result file.
+        
+        Args:
+            name: Key in `data_files` (default: "trials")
+            base_dir: Directory the paths are relative to (default: the
+                      directory the report was loaded from or saved to)
+            mmap: Memory-map the columns instead of reading them
+        
+        Returns:
+            Column name -> NumPy array
+        
+        Raises:
+            KeyError: If the report does not reference `name`
+        """
+        try:
+            from .columnar import load_columns
+        except ImportError:  # executed directly for the self-test below
+            from columnar import load_columns
+        
+        if name not in self.data_files:
+            raise KeyError(f"Report has no data file '{name}' (has: {sorted(self.data_files)})")
+        base_dir = Path(base_dir) if base_dir else getattr(self, '_base_dir', Path('.'))
+        return load_columns(base_dir / self.data_files[name], mmap=mmap)
 
 
 def save_results(
     experiment_name: str,
     config: Dict[str, Any],
     raw_data: Dict[str, Any],
-    output_dir: Path
+    output_dir: Path,
+    columns: Optional[Mapping[str, Any]] = None
 ) -> Path:
     """
     Save experiment results to JSON file.
@@ -57,6 +139,9 @@ def save_results(
         config: Configuration parameters
         raw_data: Raw experimental data
         output_dir: Directory to save results
+        columns: Optional per-trial columns (name -> 1-D array). Written to a
+                 sibling .npz (see shared.columnar) and referenced from the
+                 JSON instead of being inlined.
     
     Returns:
         Path to saved JSON file
@@ -70,10 +155,19 @@ def save_results(
     data = {
         'experiment': experiment_name,
         'timestamp': timestamp,
+        'code_version': code_version(),
         'configuration': config,
         'results': raw_data
     }
     
+    if columns is not None:
+        try:
+            from .columnar import save_columns
+        except ImportError:  # executed directly for the self-test below
+            from columnar import save_columns
+        data_path = save_columns(output_dir / f"{timestamp}_{experiment_name}.npz", columns)
+        data['data_files'] = {'trials': data_path.name}
+    
     with open(filepath, 'w') as f:
         json.dump(data, f, indent=2)
     
@@ -108,10 +202,23 @@ def generate_summary(
     
     status = f"{status_emoji.get(report.pass_fail, '❓')} {report.pass_fail}"
     
+    raw_data = f"See `{report.timestamp}_*.json` in this directory."
+    if report.data_files:
+        raw_data = ", ".join(
+            f"`{path}` ({name})" for name, path in report.data_files.items()
+        ) + " (columnar; load with `ExperimentReport.load_data()`)"
+    
+    performance_section = ""
+    if report.performance:
+        performance_section = (
+            f"\n## Performance\n\n{format_performance_markdown(report.performance)}\n"
+        )
+    
     md_content = f"""# {report.experiment_name} - Results Summary
 
 **Status**: {status}  
-**Date**: {report.timestamp}
+**Date**: {report.timestamp}  
+**Code version**: {report.code_version or 'unknown'}
 
 ## Configuration
 
@@ -130,10 +237,10 @@ def generate_summary(
 ## Conclusion
 
 {report.conclusion}
-
+{performance_section}
 ---
 
-**Raw data**: See `{report.timestamp}_*.json` in this directory.
+**Raw data**: {raw_data}
 """
     
     with open(filepath, 'w') as f:
@@ -182,6 +289,31 @@ def _format_statistics_markdown(stats: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def parse_count(text: str) -> int:
+    """Trial or batch count from the command line; accepts '1e9' as well as '1000000000'."""
+    return int(float(text))
+
+
+def binomial_interval(successes: int, trials: int, confidence: float = 0.95) -> List[float]:
+    """
+    Exact (Clopper-Pearson) confidence interval for a binomial proportion.
+    
+    Args:
+        successes: Observed events
+        trials: Independent trials
+        confidence: Coverage of the interval
+    
+    Returns:
+        [lower, upper]
+    """
+    from scipy.stats import beta
+    
+    alpha = 1 - confidence
+    lower = 0.0 if successes == 0 else float(beta.ppf(alpha / 2, successes, trials - successes + 1))
+    upper = 1.0 if successes == trials else float(beta.ppf(1 - alpha / 2, successes + 1, trials - successes))
+    return [lower, upper]
+
+
 def plot_histogram(
     data: List[float],
     title: str,
@@ -201,6 +333,7 @@ def plot_histogram(
         bins: Number of bins
         expected_value: Optional vertical line for expected value
     """
+    plt = _pyplot()
     plt.figure(figsize=(10, 6))
     
     plt.hist(data, bins=bins, alpha=0.7, color='steelblue', edgecolor='black')
@@ -241,6 +374,8 @@ def plot_distribution_comparison(
         title: Plot title
         output_path: Where to save plot
     """
+    import seaborn as sns
+    plt = _pyplot()
     plt.figure(figsize=(12, 6))
     
     # Set seaborn style for better aesthetics
@@ -287,6 +422,7 @@ def plot_convergence(
         output_path: Where to save plot
         expected_value: Optional horizontal line for expected value
     """
+    plt = _pyplot()
     plt.figure(figsize=(10, 6))
     
     plt.plot(x_values, y_values, linewidth=2, color='steelblue', alpha=0.8)
@@ -323,6 +459,7 @@ def create_results_table(
         title: Table title
         output_path: Where to save plot
     """
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(12, len(rows) * 0.5 + 2))
     ax.axis('tight')
     ax.axis('off')
@@ -353,6 +490,8 @@ def create_results_table(
 
 
 if __name__ == "__main__":
+    import numpy as np
+    
     # Self-test
     print("Reporting Utilities Self-Test")
     print("=" * 60)
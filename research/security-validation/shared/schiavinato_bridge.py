@@ -7,34 +7,45 @@ construction, not a Python approximation.
 """
 
 import json
+import random
 import subprocess
 import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from .field_arithmetic import GF2053
+except ImportError:  # executed directly for the self-test below
+    from field_arithmetic import GF2053
+
 
 @dataclass
 class Share:
     """Represents a single DuraShare share."""
     
     index: int
-    words: List[int]  # 24 word indices in GF(2053)
-    checksums: List[int]  # 9 checksum values in GF(2053)
+    words: List[int]  # word share values in GF(2053) (12-24 words)
+    checksums: List[int]  # row checksums, 3 column checksums, printed GIC
+    mat: Optional[List[List[int]]] = None  # printed MAT tags, one list per MAT column
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             'index': self.index,
             'words': self.words,
             'checksums': self.checksums
         }
+        if self.mat is not None:
+            data['mat'] = self.mat
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Share':
         return cls(
             index=data['index'],
             words=data['words'],
-            checksums=data['checksums']
+            checksums=data['checksums'],
+            mat=data.get('mat')
         )
 
 
@@ -166,23 +177,226 @@ class SchiavatoJS:
         raise NotImplementedError("Checksum verification not yet implemented")
 
 
+# v0.7.0 share-table constants (manual_spec/README.md, "Constants and Notation")
+PRIME = 2053
+COLUMN_TAGS = (100, 200, 300)
+COLUMN_TOTAL = sum(COLUMN_TAGS)
+
+
+def row_total(word_count: int) -> int:
+    """T_R = r(r+1)/2 for r = word_count / 3 rows."""
+    r = word_count // 3
+    return r * (r + 1) // 2
+
+
 # Fallback: Pure Python implementation for development
 class SchiavanatoPython:
     """
-    Pure Python implementation of DuraShare.
+    Pure Python implementation of DuraShare (v0.7.0 share-table arithmetic).
     
     Used as fallback if JS bridge not working, or for debugging.
-    NOT authoritative - use SchiavatoJS for validation experiments.
+    NOT authoritative - use SchiavatoJS for validation experiments. It does
+    reproduce the published test vectors (test_vectors/vectors.json).
+    
+    Each Share's `checksums` holds the r row checksums, then the three column
+    checksums, then the printed (share-bound) GIC:
+    
+        R_j[x] = (w_{3j-2}[x] + w_{3j-1}[x] + w_{3j}[x] + j) mod 2053
+        C_c[x] = (sum of column c on Share x + tauC_c) mod 2053
+        GIC[x] = (sum of all words on Share x + T_R + T_C + x) mod 2053
     """
     
     def __init__(self):
-        # TODO: Implement Python version
         pass
     
-    def create_shares(self, mnemonic: str, k: int, n: int) -> List[Share]:
-        """Create shares using Python implementation."""
-        # TODO: Implement
-        raise NotImplementedError("Python implementation not yet complete")
+    def create_shares(
+        self,
+        mnemonic: str,
+        k: int,
+        n: int,
+        seed: Optional[int] = None,
+        coefficients: Optional[List[List[int]]] = None
+    ) -> List[Share]:
+        """
+        Create shares using Python implementation.
+        
+        Args:
+            mnemonic: BIP39 mnemonic (12, 15, 18, 21 or 24 words)
+            k: Threshold (minimum shares needed)
+            n: Total number of shares
+            seed: Optional random seed for the polynomial coefficients
+            coefficients: Explicit non-constant coefficients, one list of
+                          k-1 values per word (overrides `seed`; used to
+                          reproduce test vectors)
+        
+        Returns:
+            List of n Share objects (indices 1..n)
+        
+        Raises:
+            ValueError: If mnemonic is invalid or k/n parameters are invalid
+        """
+        try:
+            from .bip39_utils import mnemonic_to_indices
+        except ImportError:  # executed directly for the self-test below
+            from bip39_utils import mnemonic_to_indices
+        
+        secrets = mnemonic_to_indices(mnemonic)
+        if len(secrets) not in (12, 15, 18, 21, 24):
+            raise ValueError(
+                f"Invalid mnemonic length: {len(secrets)} words. Expected 12, 15, 18, 21 or 24"
+            )
+        
+        return split_indices(secrets, k, n, seed=seed, coefficients=coefficients)
+    
+    def recover_secret(self, shares: List[Share]) -> List[int]:
+        """
+        Recover the word indices from k or more shares.
+        
+        Every share's checksums and the recovered row/column/GIC values are
+        validated as in the manual recovery procedure.
+        
+        Args:
+            shares: Share objects from one session (at least k)
+        
+        Returns:
+            Recovered BIP39 indices (1-based)
+        
+        Raises:
+            ValueError: On any STOP condition (duplicate or zero index,
+                        checksum mismatch, index outside 1..2048)
+        """
+        xs = [share.index for share in shares]
+        if len(set(xs)) != len(xs) or 0 in xs:
+            raise ValueError(f"Invalid share indices: {xs}")
+        for share in shares:
+            if not self.verify_checksums(share):
+                raise ValueError(f"Checksum mismatch on share {share.index}")
+        
+        gammas = [GF2053.lagrange_coefficient(xs, 0, j) for j in range(len(xs))]
+        if sum(g * x for g, x in zip(gammas, xs)) % PRIME != 0:
+            raise ValueError("Lagrange sanity check failed")
+        
+        def recover(values: List[int]) -> int:
+            return sum(g * v for g, v in zip(gammas, values)) % PRIME
+        
+        words = [recover([s.words[i] for s in shares]) for i in range(len(shares[0].words))]
+        checks = [recover([s.checksums[i] for s in shares]) for i in range(len(shares[0].checksums))]
+        if checks != share_checksums(words, 0):
+            raise ValueError("Recovered checksums do not match recovered words")
+        if not all(1 <= w <= 2048 for w in words):
+            raise ValueError("Recovered index outside 1..2048")
+        return words
+
+    def recover_secret_locating(self, shares: List[Share], k: int) -> List[int]:
+        """
+        Error-locating recovery from more than k shares (Berlekamp-Welch).
+
+        Up to floor((m - k) / 2) wrong values per table position are
+        corrected; see rs_decoding.locate_faults for the full report.
+
+        Args:
+            shares: Share objects from one session (at least k)
+            k: Threshold
+
+        Returns:
+            Recovered BIP39 indices (1-based)
+
+        Raises:
+            ValueError: If some position has too many errors to decode or
+                        the recovered values fail the manual checks (the
+                        message names the faulty shares found)
+        """
+        try:
+            from .rs_decoding import locate_faults
+        except ImportError:  # executed directly for the self-test below
+            from rs_decoding import locate_faults
+
+        report = locate_faults(shares, k)
+        if not report.recovered:
+            raise ValueError(
+                f"Cannot recover: undecodable positions {report.undecodable}, "
+                f"faulty shares {report.faulty}"
+            )
+        return report.words
+
+    def verify_checksums(self, share: Share) -> bool:
+        """Check a share's row, column and printed GIC values."""
+        return share.checksums == share_checksums(share.words, share.index)
+
+
+def share_checksums(words: List[int], x: int, p: int = PRIME) -> List[int]:
+    """
+    Row checksums, column checksums and printed GIC for one share.
+    
+    Args:
+        words: Word values on Share x (x = 0: the base secret values)
+        x: Share index (bound into the GIC)
+        p: Field prime (2053; smaller primes for toy-field runs)
+    
+    Returns:
+        r row checksums + 3 column checksums + [GIC]
+    """
+    r = len(words) // 3
+    rows = [(sum(words[3 * j:3 * j + 3]) + j + 1) % p for j in range(r)]
+    columns = [(sum(words[c::3]) + COLUMN_TAGS[c]) % p for c in range(3)]
+    gic = (sum(words) + row_total(len(words)) + COLUMN_TOTAL + x) % p
+    return rows + columns + [gic]
+
+
+def split_indices(
+    secrets: List[int],
+    k: int,
+    n: int,
+    seed: Optional[int] = None,
+    coefficients: Optional[List[List[int]]] = None,
+    p: int = PRIME
+) -> List[Share]:
+    """
+    Split word values into n shares with the v0.7.0 share-table checksums.
+    
+    The arithmetic core of SchiavanatoPython.create_shares without the BIP39
+    validation, so toy fields (p = 13, words 1..8, ...) can reuse it.
+    
+    Args:
+        secrets: Word values (length divisible by 3)
+        k: Threshold
+        n: Total number of shares (< p)
+        seed: Optional random seed for the polynomial coefficients
+        coefficients: Explicit non-constant coefficients, one list of
+                      k-1 values per word (overrides `seed`)
+        p: Field prime
+    
+    Returns:
+        List of n Share objects (indices 1..n)
+    
+    Raises:
+        ValueError: If k/n or the coefficient lists are invalid
+    """
+    if k < 2 or k > n or n >= p:
+        raise ValueError(f"Invalid threshold: k={k}, n={n}. Need 2 ≤ k ≤ n < {p}")
+    if coefficients is None:
+        rng = random.Random(seed)
+        coefficients = [[rng.randrange(p) for _ in range(k - 1)] for _ in secrets]
+    if len(coefficients) != len(secrets) or any(len(c) != k - 1 for c in coefficients):
+        raise ValueError(f"Need {len(secrets)} lists of {k - 1} coefficients")
+    
+    polys = [[w] + list(c) for w, c in zip(secrets, coefficients)]
+    return [
+        Share(
+            index=x,
+            words=words,
+            checksums=share_checksums(words, x, p)
+        )
+        for x in range(1, n + 1)
+        for words in [[_eval(poly, x, p) for poly in polys]]
+    ]
+
+
+def _eval(poly: List[int], x: int, p: int = PRIME) -> int:
+    result = 0
+    for coefficient in reversed(poly):
+        result = (result * x + coefficient) % p
+    return result
 
 
 def get_implementation(prefer_js: bool = True) -> Any:
@@ -206,3 +420,45 @@ def get_implementation(prefer_js: bool = True) -> Any:
     else:
         return SchiavanatoPython()
 
+
+
+if __name__ == "__main__":
+    # Self-test against the published v0.7.0 test vector
+    import sys
+    
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from shared.bip39_utils import indices_to_mnemonic
+    from shared.schiavinato_bridge import SchiavanatoPython, Share
+    
+    print("Python Reference Implementation Self-Test")
+    print("=" * 60)
+    
+    vectors = Path(__file__).resolve().parents[3] / "test_vectors" / "vectors.json"
+    with open(vectors) as f:
+        vector = json.load(f)['vectors'][0]
+    impl = SchiavanatoPython()
+    params = vector['params']
+    shares = impl.create_shares(
+        " ".join(vector['mnemonic']['words']),
+        params['threshold']['k'],
+        params['threshold']['n'],
+        coefficients=[[c] for c in vector['coefficients']]
+    )
+    for share, expected in zip(shares, vector['shares']):
+        assert share.words == expected['word_values'], f"Share {share.index} words differ"
+        assert share.checksums == (
+            expected['row_checksums'] + expected['column_checksums'] + [expected['printed_gic']]
+        ), f"Share {share.index} checksums differ"
+    print(f"✓ {vector['id']}: all {len(shares)} shares match")
+    
+    assert impl.recover_secret(shares[1:]) == vector['mnemonic']['indices_1_based']
+    print("✓ Recovery with checksum validation passed")
+    
+    mnemonic = indices_to_mnemonic(list(range(1, 2048, 85))[:24])
+    shares = impl.create_shares(mnemonic, 3, 5, seed=1)
+    assert impl.recover_secret([shares[0], shares[2], shares[4]]) == list(range(1, 2048, 85))[:24]
+    tampered = Share(shares[0].index, [shares[0].words[0] + 1] + shares[0].words[1:], shares[0].checksums)
+    assert not impl.verify_checksums(tampered)
+    print("✓ 24-word 3-of-5 round-trip and tamper detection passed")
+    
+    print("\nAll reference implementation tests passed!")
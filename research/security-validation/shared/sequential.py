@@ -0,0 +1,134 @@
+"""
+Sequential probability ratio test (SPRT) for streaming pass/fail decisions.
+
+Experiments that classify a consistency ratio against fixed thresholds can
+stop as soon as the evidence settles the question instead of exhausting a
+fixed trial budget. Wald's SPRT compares
+
+    H0: ratio = p0  (e.g. 0.99, the PASS threshold)
+    H1: ratio = p1  (e.g. 0.95, the FAIL threshold)
+
+on Bernoulli observations, accumulating the log-likelihood ratio
+log L(H1)/L(H0) and stopping when it leaves (log(beta/(1-alpha)),
+log((1-beta)/alpha)). The error rates are then at most alpha (wrongly
+rejecting H0) and beta (wrongly accepting it), and the expected sample size
+is far below that of a fixed-size test with the same error rates.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+ACCEPT_H0 = 'accept_h0'
+ACCEPT_H1 = 'accept_h1'
+
+
+@dataclass
+class BernoulliSPRT:
+    """
+    Wald SPRT on a stream of successes/failures.
+
+    Attributes:
+        p0: Success probability under H0 (the "good" hypothesis)
+        p1: Success probability under H1 (must be below p0)
+        alpha: Bound on P(accept H1 | H0)
+        beta: Bound on P(accept H0 | H1)
+    """
+    p0: float = 0.99
+    p1: float = 0.95
+    alpha: float = 0.01
+    beta: float = 0.01
+    successes: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        if not 0 < self.p1 < self.p0 < 1:
+            raise ValueError(f"Need 0 < p1 < p0 < 1, got p0={self.p0}, p1={self.p1}")
+        if not (0 < self.alpha < 1 and 0 < self.beta < 1):
+            raise ValueError("alpha and beta must lie in (0, 1)")
+        self._success_step = math.log(self.p1 / self.p0)
+        self._failure_step = math.log((1 - self.p1) / (1 - self.p0))
+
+    @property
+    def lower(self) -> float:
+        """Accept H0 at or below this log-likelihood ratio."""
+        return math.log(self.beta / (1 - self.alpha))
+
+    @property
+    def upper(self) -> float:
+        """Accept H1 at or above this log-likelihood ratio."""
+        return math.log((1 - self.beta) / self.alpha)
+
+    @property
+    def observations(self) -> int:
+        return self.successes + self.failures
+
+    @property
+    def llr(self) -> float:
+        """log L(H1) / L(H0) of everything observed so far."""
+        return self.successes * self._success_step + self.failures * self._failure_step
+
+    @property
+    def decision(self) -> Optional[str]:
+        """ACCEPT_H0, ACCEPT_H1, or None while still undecided."""
+        llr = self.llr
+        if llr <= self.lower:
+            return ACCEPT_H0
+        if llr >= self.upper:
+            return ACCEPT_H1
+        return None
+
+    def update(self, successes: int, failures: int) -> Optional[str]:
+        """
+        Add a batch of observations.
+
+        Args:
+            successes: Number of successes in the batch
+            failures: Number of failures in the batch
+
+        Returns:
+            The decision after the batch (see `decision`)
+        """
+        self.successes += successes
+        self.failures += failures
+        return self.decision
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'p0': self.p0, 'p1': self.p1, 'alpha': self.alpha, 'beta': self.beta,
+            'successes': self.successes, 'failures': self.failures,
+            'llr': self.llr, 'lower': self.lower, 'upper': self.upper,
+            'decision': self.decision,
+        }
+
+
+if __name__ == "__main__":
+    import random
+
+    # All successes: accept H0 after ceil(lower / log(p1/p0)) observations
+    test = BernoulliSPRT()
+    needed = math.ceil(test.lower / math.log(test.p1 / test.p0))
+    assert test.update(needed - 1, 0) is None
+    assert test.update(1, 0) == ACCEPT_H0
+    print(f"✓ All-consistent stream accepts H0 after {needed} observations")
+
+    # Empirical error rates stay below alpha / beta
+    rng = random.Random(1)
+    for truth, wrong in ((0.99, ACCEPT_H1), (0.95, ACCEPT_H0)):
+        errors, lengths = 0, []
+        for _ in range(2000):
+            test = BernoulliSPRT()
+            while test.decision is None:
+                test.update(*((1, 0) if rng.random() < truth else (0, 1)))
+            errors += test.decision == wrong
+            lengths.append(test.observations)
+        rate = errors / 2000
+        assert rate <= 0.02, rate
+        print(f"✓ ratio {truth}: error rate {rate:.4f}, "
+              f"mean sample size {sum(lengths) / len(lengths):.0f}")
+
+    try:
+        BernoulliSPRT(p0=0.9, p1=0.95)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        print("✓ Rejects p1 >= p0")
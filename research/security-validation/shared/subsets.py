@@ -0,0 +1,389 @@
+"""
+All-subsets recovery verification in revolving-door (Gray-code) order.
+
+Checks that every k-subset of n Shares recovers the same share table and
+lists the subsets that do not. Subsets are visited in revolving-door
+order (Knuth, TAOCP 7.2.1.3, Algorithm R), in which consecutive subsets
+differ by one Share leaving (a) and one entering (b). The Lagrange
+weights at 0 then update in O(k) instead of being rebuilt in O(k²):
+
+    gamma_j <- gamma_j * x_b / (x_b - x_j) * (x_a - x_j) / x_a    (j kept)
+    gamma_b  = prod over kept m of x_m / (x_m - x_b)
+
+Weights and members of consecutive subsets are buffered and every table
+position is recovered for a whole buffer at once. The rank range is
+split into contiguous chunks across a process pool; each chunk unranks
+its first subset and walks from there.
+
+The printed GIC carries + x (degree 1 in x), which is removed before
+recovery so that k = 1 copies verify too.
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .gf_linalg import inv_mod
+    from .schiavinato_bridge import PRIME, Share, share_checksums
+except ImportError:  # executed directly for the self-test below
+    from gf_linalg import inv_mod
+    from schiavinato_bridge import PRIME, Share, share_checksums
+
+BUFFER = 4096  # subsets recovered per vectorized step
+
+
+# ----------------------------------------------------------------------------
+# Revolving-door order over 0..n-1:
+#     RD(n, k) = RD(n-1, k), then reversed RD(n-1, k-1) each with n-1 added
+# ----------------------------------------------------------------------------
+
+def revolving_door_rank(subset: Sequence[int], n: int) -> int:
+    """Position of a subset (of 0..n-1) in revolving-door order."""
+    members = set(subset)
+    k, offset, sign = len(members), 0, 1
+    for top in range(n - 1, -1, -1):
+        if k == 0 or k == top + 1:
+            break
+        if top in members:
+            # Second half: reversed RD(top, k-1)
+            offset += sign * (math.comb(top, k) + math.comb(top, k - 1) - 1)
+            sign, k = -sign, k - 1
+    return offset
+
+
+def revolving_door_unrank(rank: int, n: int, k: int) -> List[int]:
+    """Subset (sorted, of 0..n-1) at a position in revolving-door order."""
+    if not 0 <= rank < math.comb(n, k):
+        raise ValueError(f"Rank {rank} outside 0..C({n},{k})-1")
+    subset = []
+    while k and k < n:
+        first = math.comb(n - 1, k)
+        if rank >= first:
+            subset.append(n - 1)
+            rank = math.comb(n - 1, k - 1) - 1 - (rank - first)
+            k -= 1
+        n -= 1
+    subset.extend(range(k))
+    return sorted(subset)
+
+
+def revolving_door_next(c: List[int], n: int) -> Optional[Tuple[int, int]]:
+    """
+    Step a sorted subset to its revolving-door successor in place.
+
+    Returns:
+        (left, entered) or None after the last subset
+    """
+    t = len(c)
+    if t == 0 or t == n:
+        return None
+    c.append(n)  # sentinel c_{t+1}
+    try:
+        if t % 2:
+            if c[0] + 1 < c[1]:
+                c[0] += 1
+                return c[0] - 1, c[0]
+            j, step = 1, 'decrease'
+        else:
+            if c[0] > 0:
+                c[0] -= 1
+                return c[0] + 1, c[0]
+            j, step = 1, 'increase'
+        while j < t:
+            if step == 'decrease':
+                if c[j] >= j + 1:
+                    left = c[j]
+                    c[j], c[j - 1] = c[j - 1], j - 1
+                    return left, j - 1
+                j, step = j + 1, 'increase'
+            else:
+                if c[j] + 1 < c[j + 1]:
+                    left = c[j - 1]
+                    c[j - 1], c[j] = c[j], c[j] + 1
+                    return left, c[j]
+                j, step = j + 1, 'decrease'
+        return None
+    finally:
+        c.pop()
+
+
+# ----------------------------------------------------------------------------
+# Incremental Lagrange weights along the walk
+# ----------------------------------------------------------------------------
+
+def walk(xs: Sequence[int], k: int, start: int = 0, count: Optional[int] = None,
+         p: int = PRIME):
+    """
+    Yield (members, weights) for `count` consecutive subsets from rank `start`.
+
+    `members` are positions in xs (sorted); `weights` are the Lagrange
+    weights at 0 of those Shares, updated incrementally after the first
+    subset. The yielded lists are reused; copy them to keep them.
+    """
+    n = len(xs)
+    total = math.comb(n, k)
+    count = total - start if count is None else min(count, total - start)
+    if count <= 0:
+        return
+    x = [int(v) % p for v in xs]
+    inverse = [0] + inv_mod(np.arange(1, p), p).tolist()
+    # ratio[a][j] = x_a / (x_a - x_j): weight factor of Share a on Share j
+    ratio = [[x[a] * inverse[(x[a] - x[j]) % p] % p if a != j else 0 for j in range(n)]
+             for a in range(n)]
+    # undo[a][j] = (x_a - x_j) / x_a: removes that factor again
+    undo = [[(x[a] - x[j]) * inverse[x[a]] % p for j in range(n)] for a in range(n)]
+
+    c = revolving_door_unrank(start, n, k)
+    gamma = [0] * n
+    for j in c:
+        g = 1
+        for m in c:
+            if m != j:
+                g = g * ratio[m][j] % p
+        gamma[j] = g
+    for step in range(count):
+        yield c, [gamma[j] for j in c]
+        if step + 1 == count:
+            return
+        left, entered = revolving_door_next(c, n)
+        up, down = ratio[entered], undo[left]
+        g = 1
+        for j in c:
+            if j != entered:
+                gamma[j] = gamma[j] * up[j] % p * down[j] % p
+                g = g * ratio[j][entered] % p
+        gamma[entered] = g
+
+
+# ----------------------------------------------------------------------------
+# Verifier
+# ----------------------------------------------------------------------------
+
+@dataclass
+class SubsetReport:
+    """Outcome of an all-subsets verification."""
+    k: int
+    n: int
+    subsets: int
+    reference: List[int]                  # words every subset is compared against
+    reference_source: str                 # 'given', 'decoded' (Berlekamp-Welch) or 'first subset'
+    failed: int = 0                       # subsets recovering a different table
+    undetected: int = 0                   # ... whose wrong table still passes the manual checks
+    failures: List[dict] = field(default_factory=list)        # first failures (rank, shares, positions)
+    share_failures: dict = field(default_factory=dict)        # Share index -> failing subsets containing it
+
+    @property
+    def passed(self) -> bool:
+        return self.failed == 0
+
+
+_STATE = {}
+
+
+def _init(xs, values, reference, width, k, p, max_failures):
+    _STATE.update(xs=xs, values=values, reference=reference, width=width, k=k, p=p,
+                  max_failures=max_failures)
+
+
+def _chunk(bounds: Tuple[int, int]) -> dict:
+    """Pool task: verify the subsets with ranks start..start+count-1."""
+    try:
+        from .nested import table_checksums
+    except ImportError:  # executed directly for the self-test below
+        from nested import table_checksums
+
+    start, count = bounds
+    xs, values, reference = _STATE['xs'], _STATE['values'], _STATE['reference']
+    width, k, p = _STATE['width'], _STATE['k'], _STATE['p']
+    result = {"subsets": 0, "failed": 0, "undetected": 0, "failures": [],
+              "share_failures": np.zeros(len(xs), dtype=np.int64)}
+    members, weights = [], []
+
+    def flush():
+        m = np.array(members, dtype=np.int64)
+        w = np.array(weights, dtype=np.int64)
+        recovered = np.einsum('bj,bjv->bv', w, values[m]) % p
+        bad = (recovered != reference).any(axis=1)
+        result["subsets"] += len(m)
+        if bad.any():
+            rows = recovered[bad]
+            passing = (rows[:, width:] == table_checksums(rows[:, :width], 0, p)).all(axis=1)
+            passing &= ((rows[:, :width] >= 1) & (rows[:, :width] <= 2048)).all(axis=1)
+            result["failed"] += int(bad.sum())
+            result["undetected"] += int(passing.sum())
+            np.add.at(result["share_failures"], m[bad].ravel(), 1)
+            for i, row in zip(np.flatnonzero(bad)[:_STATE['max_failures']], rows):
+                if len(result["failures"]) >= _STATE['max_failures']:
+                    break
+                result["failures"].append({
+                    "rank": start + result["subsets"] - len(m) + int(i),
+                    "shares": [int(xs[j]) for j in m[i]],
+                    "positions": (np.flatnonzero(row != reference) + 1).tolist(),
+                })
+        members.clear()
+        weights.clear()
+
+    for c, gammas in walk(xs, k, start, count, p):
+        members.append(list(c))
+        weights.append(gammas)
+        if len(members) == BUFFER:
+            flush()
+    if members:
+        flush()
+    return result
+
+
+def verify_all_subsets(shares: Sequence[Share], k: int, reference: Optional[Sequence[int]] = None,
+                       workers: Optional[int] = None, chunk: Optional[int] = None,
+                       max_failures: int = 100, p: int = PRIME) -> SubsetReport:
+    """
+    Recover the full share table from every k-subset and report disagreements.
+
+    Args:
+        shares: Shares of one session (distinct indices, same table size)
+        k: Threshold
+        reference: Expected words; default: the Berlekamp-Welch decoding of
+                   all Shares, or the first subset's recovery if that fails
+        workers: Pool size (default: all CPU cores; 1 runs in-process)
+        chunk: Subsets per pool task (default: an even split, at least BUFFER)
+        max_failures: Failing subsets listed in the report
+        p: Field prime
+
+    Returns:
+        SubsetReport with failure counts, the first failures and how many
+        failing subsets each Share appears in
+
+    Raises:
+        ValueError: On duplicate or zero indices, k > n, or mixed table sizes
+    """
+    try:
+        from .rs_decoding import locate_faults
+    except ImportError:  # executed directly for the self-test below
+        from rs_decoding import locate_faults
+
+    xs = [share.index for share in shares]
+    if len(set(xs)) != len(xs) or 0 in xs or not 1 <= k <= len(xs):
+        raise ValueError(f"Need k <= n shares with distinct nonzero indices, got k={k}, {xs}")
+    width = len(shares[0].words)
+    if any(len(s.words) != width or len(s.checksums) != width // 3 + 4 for s in shares):
+        raise ValueError("Shares have different table sizes")
+    values = np.array([s.words + s.checksums for s in shares], dtype=np.int64)
+    values[:, -1] = (values[:, -1] - xs) % p  # GIC without its + x term
+
+    if reference is not None:
+        source = 'given'
+    else:
+        decoded = locate_faults(shares, k, p)
+        if decoded.recovered:
+            reference, source = decoded.words, 'decoded'
+        else:
+            c, gammas = next(walk(xs, k, 0, 1, p))
+            reference = (np.array(gammas) @ values[c] % p)[:width].tolist()
+            source = 'first subset'
+    table = np.array(list(reference) + share_checksums(list(reference), 0, p), dtype=np.int64)
+
+    total = math.comb(len(xs), k)
+    workers = workers or os.cpu_count()
+    chunk = chunk or max(BUFFER, -(-total // (4 * workers)))
+    bounds = [(start, min(chunk, total - start)) for start in range(0, total, chunk)]
+    init = (np.array(xs, dtype=np.int64), values, table, width, k, p, max_failures)
+    if workers == 1:
+        _init(*init)
+        parts = [_chunk(b) for b in bounds]
+    else:
+        with Pool(processes=workers, initializer=_init, initargs=init) as pool:
+            parts = pool.map(_chunk, bounds)
+
+    report = SubsetReport(k=k, n=len(xs), subsets=0, reference=list(reference), reference_source=source)
+    involvement = np.zeros(len(xs), dtype=np.int64)
+    for part in parts:
+        report.subsets += part["subsets"]
+        report.failed += part["failed"]
+        report.undetected += part["undetected"]
+        report.failures += part["failures"]
+        involvement += part["share_failures"]
+    report.failures = report.failures[:max_failures]
+    report.share_failures = {x: int(v) for x, v in zip(xs, involvement) if v}
+    return report
+
+
+if __name__ == "__main__":
+    import itertools
+    import sys
+    import time
+    from dataclasses import replace
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from shared.field_arithmetic import GF2053
+    from shared.schiavinato_bridge import split_indices
+    from shared.subsets import (revolving_door_next, revolving_door_rank, revolving_door_unrank,
+                                verify_all_subsets, walk)
+
+    print("All-Subsets Verifier Self-Test")
+    print("=" * 60)
+
+    def reference_order(n, k):
+        if k in (0, n):
+            return [list(range(k))]
+        return reference_order(n - 1, k) + [s + [n - 1] for s in reversed(reference_order(n - 1, k - 1))]
+
+    for n in range(1, 10):
+        for k in range(n + 1):
+            order = reference_order(n, k)
+            c = list(order[0])
+            for rank, subset in enumerate(order):
+                assert c == subset and revolving_door_rank(subset, n) == rank
+                assert revolving_door_unrank(rank, n, k) == subset
+                step = revolving_door_next(c, n)
+                if step is not None:
+                    assert step[0] in subset and step[1] not in subset
+            assert step is None
+    print("✓ Revolving-door successor, rank and unrank match the recursive order (n <= 9)")
+
+    xs = [3, 17, 200, 5, 2052, 9, 44, 1000, 12, 71]
+    for start in (0, 37):
+        for c, gammas in walk(xs, 4, start, 80):
+            assert gammas == [GF2053.lagrange_coefficient([xs[m] for m in c], 0, j) for j in range(4)]
+    print("✓ Incremental Lagrange weights equal fresh ones along the walk")
+
+    rng = np.random.default_rng(0)
+    secret = [int(w) for w in rng.integers(1, 2049, size=24)]
+    shares = split_indices(secret, 5, 9, seed=1)
+    report = verify_all_subsets(shares, 5, workers=1)
+    assert report.passed and report.subsets == 126 and report.reference == secret
+    shares[3] = replace(shares[3], words=shares[3].words[:6] + [(shares[3].words[6] + 1) % PRIME]
+                        + shares[3].words[7:])
+    report = verify_all_subsets(shares, 5, workers=2, chunk=40)
+    expected = [subset for subset in itertools.combinations(shares, 5)
+                if any(GF2053.interpolate([(s.index, s.words[i]) for s in subset]) != secret[i]
+                        for i in range(24))]
+    assert report.failed == len(expected) == 70 and report.undetected == 0
+    assert report.share_failures[4] == 70 and report.reference_source == 'decoded'
+    assert all(4 in f["shares"] and f["positions"] == [7] for f in report.failures)
+    print(f"✓ 5-of-9 with one corrupted word: the {report.failed} subsets holding Share 4 fail "
+          f"(matching subset-by-subset interpolation), none pass the manual checks")
+
+    copies = [Share(x, secret, share_checksums(secret, x)) for x in (1, 2, 3)]
+    assert verify_all_subsets(copies, 1, workers=1).passed
+    print("✓ k = 1 copies verify")
+
+    shares = split_indices(secret, 7, 15, seed=2)
+    start = time.perf_counter()
+    report = verify_all_subsets(shares, 7, workers=1)
+    elapsed = time.perf_counter() - start
+    assert report.passed and report.subsets == 6435
+    print(f"✓ 7-of-15: all {report.subsets:,} subsets verified in {elapsed:.2f}s on one core")
+
+    shares = split_indices(secret, 10, 20, seed=3)
+    start = time.perf_counter()
+    report = verify_all_subsets(shares, 10)
+    elapsed = time.perf_counter() - start
+    assert report.passed and report.subsets == 184756
+    print(f"✓ 10-of-20: all {report.subsets:,} subsets verified in {elapsed:.2f}s "
+          f"({os.cpu_count()} worker(s))")
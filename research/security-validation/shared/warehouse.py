@@ -0,0 +1,593 @@
+"""
+Queryable results warehouse across experiment runs.
+
+Ingests ExperimentReport JSON (and `save_results` files) together with the
+columnar per-trial files they reference into one indexed SQLite database, so
+history can be queried without walking result directories:
+
+    python -m shared.warehouse ingest experiment-1-entropy/results/
+    python -m shared.warehouse aggregate --column ratio --by k,n
+    python -m shared.warehouse runs --experiment "Entropy Conservation"
+    python -m shared.warehouse sql "SELECT code_version, COUNT(*) FROM runs GROUP BY 1"
+
+Runs are indexed by experiment, configuration (k, n), seed, code version and
+timestamp. Per-trial columns are reduced at ingest time to count / sum /
+sum of squares / min / max, so pooled means and standard deviations across
+any number of runs are a single indexed GROUP BY. Re-ingesting an unchanged
+file is a no-op.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "results" / "warehouse.sqlite"
+
+# Columns of `runs` that aggregate() may group or filter by
+RUN_FIELDS = ("experiment", "k", "n", "seed", "code_version", "pass_fail", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id            INTEGER PRIMARY KEY,
+    experiment    TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    k             INTEGER,
+    n             INTEGER,
+    seed          INTEGER,
+    code_version  TEXT,
+    timestamp     TEXT,
+    pass_fail     TEXT,
+    configuration TEXT NOT NULL,
+    source        TEXT NOT NULL UNIQUE,
+    digest        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (experiment, k, n);
+CREATE INDEX IF NOT EXISTS runs_version ON runs (code_version);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs (seed);
+CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp);
+
+CREATE TABLE IF NOT EXISTS statistics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    key    TEXT NOT NULL,
+    value  REAL,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS statistics_key ON statistics (key);
+
+CREATE TABLE IF NOT EXISTS column_stats (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    file   TEXT NOT NULL,
+    column TEXT NOT NULL,
+    count  INTEGER NOT NULL,
+    sum    REAL,
+    sum_sq REAL,
+    min    REAL,
+    max    REAL,
+    PRIMARY KEY (run_id, file, column)
+);
+CREATE INDEX IF NOT EXISTS column_stats_column ON column_stats (column);
+"""
+
+_CONFIG_SUFFIX = re.compile(r"\s+\d+-of-\d+$")
+
+
+def _experiment_key(name: str) -> str:
+    """'Entropy Conservation 2-of-3' -> 'Entropy Conservation'."""
+    return _CONFIG_SUFFIX.sub("", name)
+
+
+def _cached_copy(path: Path, root: Path) -> bool:
+    """Whether a file found under `root` is a result cache entry's copy (cache/<key>/files/...)."""
+    parts = path.relative_to(root).parts
+    return any(parts[i] == "cache" and parts[i + 2] == "files" for i in range(len(parts) - 2))
+
+
+def _as_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Numeric statistic as a float; NaN/inf and non-numbers become NULL."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class ResultsWarehouse:
+    """
+    SQLite-backed index of experiment results.
+
+    Args:
+        path: Database file (created on first use); ":memory:" for a
+              throwaway store
+    """
+
+    def __init__(self, path: Path = DEFAULT_DB):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(str(path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'ResultsWarehouse':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, paths: Iterable[Path]) -> Dict[str, int]:
+        """
+        Ingest result JSON files, searching directories recursively.
+
+        Files that are neither ExperimentReport nor save_results output
+        (render manifests, stamps, ...) are ignored, and so are the copies
+        a directory search finds in the result cache (shared/cache.py),
+        which would otherwise count every cached run twice.
+
+        Args:
+            paths: Files and/or directories
+
+        Returns:
+            Counts of 'added', 'updated' and 'unchanged' runs
+        """
+        counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+        with self.conn:
+            for path in paths:
+                path = Path(path)
+                if path.is_dir():
+                    files = [f for f in sorted(path.rglob("*.json")) if not _cached_copy(f, path)]
+                else:
+                    files = [path]
+                for file in files:
+                    outcome = self._ingest_file(file)
+                    if outcome:
+                        counts[outcome] += 1
+        return counts
+
+    def _ingest_file(self, path: Path) -> Optional[str]:
+        raw = path.read_bytes()
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        if 'experiment_name' in data and 'statistical_summary' in data:
+            name = data['experiment_name']
+            statistics = data.get('statistical_summary', {})
+        elif 'experiment' in data and 'results' in data:
+            name = data['experiment']  # save_results output
+            statistics = {}
+        else:
+            return None
+
+        source = str(path.resolve())
+        data_files = data.get('data_files') or {}
+        h = hashlib.sha256(raw)
+        for _, rel in sorted(data_files.items()):
+            data_path = path.parent / rel
+            if data_path.exists():
+                h.update(data_path.read_bytes())
+        digest = h.hexdigest()
+
+        existing = self.conn.execute(
+            "SELECT id, digest FROM runs WHERE source = ?", (source,)
+        ).fetchone()
+        if existing and existing['digest'] == digest:
+            return 'unchanged'
+        if existing:
+            self.conn.execute("DELETE FROM runs WHERE id = ?", (existing['id'],))
+
+        config = data.get('configuration', {})
+        cursor = self.conn.execute(
+            """INSERT INTO runs (experiment, name, k, n, seed, code_version,
+                                 timestamp, pass_fail, configuration, source, digest)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                _experiment_key(name), name,
+                _as_int(config.get('k')), _as_int(config.get('n')),
+                _as_int(config.get('seed')),
+                data.get('code_version') or None,
+                data.get('timestamp'), data.get('pass_fail'),
+                json.dumps(config, sort_keys=True), source, digest,
+            )
+        )
+        run_id = cursor.lastrowid
+
+        self.conn.executemany(
+            "INSERT INTO statistics (run_id, key, value) VALUES (?, ?, ?)",
+            [(run_id, key, _as_float(value)) for key, value in statistics.items()]
+        )
+        for file_key, rel in data_files.items():
+            data_path = path.parent / rel
+            if data_path.exists():
+                self._ingest_columns(run_id, file_key, data_path)
+
+        return 'updated' if existing else 'added'
+
+    def _ingest_columns(self, run_id: int, file_key: str, path: Path):
+        import numpy as np
+        try:
+            from .columnar import load_columns
+        except ImportError:  # executed directly for the self-test below
+            from columnar import load_columns
+
+        rows = []
+        for column, values in load_columns(path).items():
+            if values.ndim != 1 or values.dtype.kind not in "biuf":
+                continue
+            x = np.asarray(values, dtype=np.float64)
+            if len(x) == 0:
+                rows.append((run_id, file_key, column, 0, None, None, None, None))
+                continue
+            rows.append((
+                run_id, file_key, column, len(x),
+                float(x.sum()), float(np.dot(x, x)), float(x.min()), float(x.max()),
+            ))
+        self.conn.executemany(
+            """INSERT INTO column_stats (run_id, file, column, count, sum, sum_sq, min, max)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def aggregate(
+        self,
+        column: str = "ratio",
+        by: Sequence[str] = ("k", "n"),
+        file: str = "trials",
+        **filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Pool a per-trial column over every matching run.
+
+        Args:
+            column: Column in the runs' columnar files (e.g. "ratio")
+            by: Run fields to group by (subset of RUN_FIELDS)
+            file: data_files key the column belongs to
+            **filters: Equality filters on RUN_FIELDS, e.g. experiment=...,
+                       code_version=...
+
+        Returns:
+            One dict per group: the `by` fields plus runs, trials, mean,
+            std (pooled, population), min and max
+        """
+        by = list(by)
+        for name in list(by) + list(filters):
+            if name not in RUN_FIELDS:
+                raise ValueError(f"Unknown run field: {name} (expected one of {RUN_FIELDS})")
+
+        where = ["c.column = ?", "c.file = ?"] + [f"r.{name} = ?" for name in filters]
+        params = [column, file] + list(filters.values())
+        group = ", ".join(f"r.{name}" for name in by)
+        select = "".join(f"r.{name} AS {name}, " for name in by)
+        sql = f"""
+            SELECT {select}
+                   COUNT(DISTINCT r.id) AS runs,
+                   SUM(c.count) AS trials,
+                   SUM(c.sum) AS total,
+                   SUM(c.sum_sq) AS total_sq,
+                   MIN(c.min) AS min,
+                   MAX(c.max) AS max
+            FROM runs r JOIN column_stats c ON c.run_id = r.id
+            WHERE {' AND '.join(where)}
+            {f'GROUP BY {group} ORDER BY {group}' if by else ''}
+        """
+        results = []
+        for row in self.conn.execute(sql, params):
+            row = dict(row)
+            trials = row['trials'] or 0
+            total = row.pop('total')
+            total_sq = row.pop('total_sq')
+            if trials:
+                mean = total / trials
+                row['mean'] = mean
+                row['std'] = math.sqrt(max(total_sq / trials - mean * mean, 0.0))
+            else:
+                row['mean'] = row['std'] = None
+            results.append(row)
+        return results
+
+    def runs(self, limit: Optional[int] = None, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        List ingested runs, newest first.
+
+        Args:
+            limit: Maximum number of runs
+            **filters: Equality filters on RUN_FIELDS
+
+        Returns:
+            Run rows as dicts (configuration decoded)
+        """
+        for name in filters:
+            if name not in RUN_FIELDS:
+                raise ValueError(f"Unknown run field: {name} (expected one of {RUN_FIELDS})")
+        sql = "SELECT * FROM runs"
+        if filters:
+            sql += " WHERE " + " AND ".join(f"{name} = ?" for name in filters)
+        sql += " ORDER BY timestamp DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = []
+        for row in self.conn.execute(sql, list(filters.values())):
+            row = dict(row)
+            row['configuration'] = json.loads(row['configuration'])
+            rows.append(row)
+        return rows
+
+    def statistic_history(self, key: str, **filters: Any) -> List[Tuple[str, str, float]]:
+        """(timestamp, code_version, value) of one summary statistic over time."""
+        for name in filters:
+            if name not in RUN_FIELDS:
+                raise ValueError(f"Unknown run field: {name} (expected one of {RUN_FIELDS})")
+        where = ["s.key = ?"] + [f"r.{name} = ?" for name in filters]
+        sql = f"""
+            SELECT r.timestamp, r.code_version, s.value
+            FROM runs r JOIN statistics s ON s.run_id = r.id
+            WHERE {' AND '.join(where)}
+            ORDER BY r.timestamp
+        """
+        return [tuple(row) for row in self.conn.execute(sql, [key] + list(filters.values()))]
+
+    def compare(self, report_path: Path, column: str = "ratio", file: str = "trials") -> Dict[str, Any]:
+        """
+        Compare one run against every other ingested run of the same
+        experiment and configuration.
+
+        The run is ingested first (a no-op if already present). `column`
+        and `file` select the per-trial column as in aggregate().
+
+        Returns:
+            Dict with the run's and the history's trial count and mean, and
+            `z` = (run mean - history mean) / standard error of the
+            difference (None when undefined)
+        """
+        self.ingest([report_path])
+        source = str(Path(report_path).resolve())
+        run = self.conn.execute("SELECT * FROM runs WHERE source = ?", (source,)).fetchone()
+        if run is None:
+            raise ValueError(f"Not an experiment report: {report_path}")
+
+        def pooled(where: str, params: Sequence[Any]) -> Tuple[int, float, float]:
+            row = self.conn.execute(
+                f"""SELECT SUM(c.count), SUM(c.sum), SUM(c.sum_sq)
+                    FROM runs r JOIN column_stats c ON c.run_id = r.id
+                    WHERE c.column = ? AND c.file = ? AND {where}""",
+                [column, file] + list(params)
+            ).fetchone()
+            return row[0] or 0, row[1] or 0.0, row[2] or 0.0
+
+        this = pooled("r.id = ?", [run['id']])
+        history = pooled(
+            "r.experiment = ? AND r.k IS ? AND r.n IS ? AND r.id != ?",
+            [run['experiment'], run['k'], run['n'], run['id']]
+        )
+
+        def mean_var(count, total, total_sq):
+            if not count:
+                return None, None
+            mean = total / count
+            return mean, max(total_sq / count - mean * mean, 0.0)
+
+        run_mean, run_var = mean_var(*this)
+        hist_mean, hist_var = mean_var(*history)
+        z = None
+        if run_mean is not None and hist_mean is not None:
+            se = math.sqrt(run_var / this[0] + hist_var / history[0])
+            if se > 0:
+                z = (run_mean - hist_mean) / se
+        return {
+            'experiment': run['experiment'],
+            'k': run['k'],
+            'n': run['n'],
+            'file': file,
+            'column': column,
+            'run_trials': this[0],
+            'run_mean': run_mean,
+            'history_runs': self.conn.execute(
+                "SELECT COUNT(*) FROM runs WHERE experiment = ? AND k IS ? AND n IS ? AND id != ?",
+                (run['experiment'], run['k'], run['n'], run['id'])
+            ).fetchone()[0],
+            'history_trials': history[0],
+            'history_mean': hist_mean,
+            'z': z,
+        }
+
+    def sql(self, query: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """
+        Run an arbitrary read query.
+
+        Raises:
+            sqlite3.OperationalError: If the query tries to modify the database
+        """
+        self.conn.execute("PRAGMA query_only = ON")
+        try:
+            return [dict(row) for row in self.conn.execute(query, params)]
+        finally:
+            self.conn.execute("PRAGMA query_only = OFF")
+
+
+def _print_rows(rows: List[Dict[str, Any]]):
+    if not rows:
+        print("(no rows)")
+        return
+    headers = list(rows[0])
+    cells = [
+        [f"{v:.6g}" if isinstance(v, float) else ("" if v is None else str(v)) for v in row.values()]
+        for row in rows
+    ]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths)))
+
+
+def _parse_filters(items: Optional[List[str]]) -> Dict[str, Any]:
+    filters = {}
+    for item in items or []:
+        name, _, value = item.partition("=")
+        filters[name] = int(value) if name in ("k", "n", "seed") else value
+    return filters
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query experiment results across runs")
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB,
+                        help=f'Warehouse database (default: {DEFAULT_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('ingest', help='Ingest report JSON files or result directories')
+    p.add_argument('paths', type=Path, nargs='+')
+
+    p = sub.add_parser('aggregate', help='Pool a per-trial column across runs')
+    p.add_argument('--column', default='ratio')
+    p.add_argument('--file', default='trials', help='data_files key of the column (default: trials)')
+    p.add_argument('--by', default='k,n', help='Comma-separated run fields')
+    p.add_argument('--where', action='append', metavar='FIELD=VALUE')
+
+    p = sub.add_parser('runs', help='List ingested runs')
+    p.add_argument('--experiment')
+    p.add_argument('--limit', type=int, default=20)
+
+    p = sub.add_parser('compare', help='Compare a report against history')
+    p.add_argument('report', type=Path)
+    p.add_argument('--column', default='ratio')
+    p.add_argument('--file', default='trials', help='data_files key of the column (default: trials)')
+
+    p = sub.add_parser('sql', help='Run a read-only SQL query')
+    p.add_argument('query')
+
+    args = parser.parse_args(argv)
+
+    with ResultsWarehouse(args.db) as warehouse:
+        if args.command == 'ingest':
+            counts = warehouse.ingest(args.paths)
+            print(f"✓ Ingested: {counts['added']} added, {counts['updated']} updated, "
+                  f"{counts['unchanged']} unchanged")
+        elif args.command == 'aggregate':
+            by = [f for f in args.by.split(',') if f]
+            _print_rows(warehouse.aggregate(args.column, by, args.file, **_parse_filters(args.where)))
+        elif args.command == 'runs':
+            filters = {'experiment': args.experiment} if args.experiment else {}
+            rows = warehouse.runs(limit=args.limit, **filters)
+            _print_rows([
+                {key: row[key] for key in ('id', 'timestamp', 'experiment', 'k', 'n',
+                                           'seed', 'code_version', 'pass_fail')}
+                for row in rows
+            ])
+        elif args.command == 'compare':
+            _print_rows([warehouse.compare(args.report, args.column, args.file)])
+        elif args.command == 'sql':
+            try:
+                _print_rows(warehouse.sql(args.query))
+            except sqlite3.OperationalError as e:
+                parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+
+    # Self-test (no arguments)
+    import shutil
+    import tempfile
+    import time
+
+    import numpy as np
+
+    try:
+        from .columnar import save_columns
+    except ImportError:
+        from columnar import save_columns
+
+    print("Results Warehouse Self-Test")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        rng = np.random.default_rng(0)
+        for run, (k, n) in enumerate([(2, 3), (2, 3), (3, 5)] * 20):
+            run_dir = tmp / f"run{run}" / f"{k}-of-{n}"
+            run_dir.mkdir(parents=True)
+            ratio = rng.random(1000)
+            save_columns(run_dir / "trials.npz", {'ratio': ratio, 'consistent': (ratio * 100).astype(int)})
+            save_columns(run_dir / "timings.npz", {'ratio': ratio + 10})  # same column name, other table
+            with open(run_dir / "report.json", 'w') as f:
+                json.dump({
+                    'experiment_name': f"Entropy Conservation {k}-of-{n}",
+                    'timestamp': f"2026-01-{run % 28 + 1:02d}T00:00:00",
+                    'configuration': {'k': k, 'n': n, 'seed': run},
+                    'results': {},
+                    'statistical_summary': {'mean_ratio': float(ratio.mean()), 'p_value': float('nan')},
+                    'conclusion': "",
+                    'pass_fail': "PASS",
+                    'data_files': {'trials': "trials.npz", 'timings': "timings.npz"},
+                    'code_version': "v1" if run < 30 else "v2",
+                }, f)
+            (run_dir / "render.json").write_text("{}")  # ignored
+        # A result cache entry holding a copy of run0 (skipped by directory ingest)
+        shutil.copytree(tmp / "run0", tmp / "results" / "cache" / ("0" * 64) / "files" / "run0")
+
+        db = tmp / "warehouse.sqlite"
+        with ResultsWarehouse(db) as warehouse:
+            counts = warehouse.ingest([tmp])
+            assert counts == {'added': 60, 'updated': 0, 'unchanged': 0}, counts
+            assert warehouse.ingest([tmp])['unchanged'] == 60, "Re-ingest should be a no-op"
+            print("✓ Ingest (and idempotent re-ingest) passed")
+
+        with ResultsWarehouse(db) as warehouse:
+            start = time.perf_counter()
+            rows = warehouse.aggregate("ratio", by=("k", "n"))
+            elapsed = time.perf_counter() - start
+            assert [(r['k'], r['n'], r['runs'], r['trials']) for r in rows] == \
+                [(2, 3, 40, 40000), (3, 5, 20, 20000)], rows
+            assert abs(rows[0]['mean'] - 0.5) < 0.01 and abs(rows[0]['std'] - 0.2887) < 0.01
+            print(f"✓ Mean ratio by k-of-n across runs in {elapsed * 1000:.2f} ms")
+
+            by_version = warehouse.aggregate("ratio", by=("code_version",), k=2, n=3)
+            assert [r['code_version'] for r in by_version] == ["v1", "v2"]
+            assert len(warehouse.runs(limit=5, k=3)) == 5
+            assert len(warehouse.statistic_history("mean_ratio", k=3, n=5)) == 20
+            print("✓ Filters, run listing and statistic history passed")
+
+            result = warehouse.compare(tmp / "run0" / "2-of-3" / "report.json")
+            assert result['history_runs'] == 39 and abs(result['z']) < 4, result
+            assert abs(result['run_mean'] - 0.5) < 0.05, result
+            print(f"✓ Compare against history passed (z = {result['z']:.2f})")
+
+            try:
+                warehouse.sql("DELETE FROM runs")
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("sql() modified the database")
+            assert warehouse.sql("SELECT COUNT(*) AS runs FROM runs") == [{'runs': 60}]
+            print("✓ sql() is read-only")
+
+    print("\nAll warehouse tests passed!")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Exact enumeration of undetectable multi-position errors in a share table.
+
+The row, column and GIC checks are linear in the errors: writing each
+check residual as (printed value - recomputed value), an error vector e
+over the table positions (words, row checksums, column checksums, GIC and
+the Share index x) changes the residuals by H e for a fixed check matrix
+H over GF(2053). An error escapes every check iff H e = 0.
+
+For a set T of positions, the errors with support exactly T (every
+position in T wrong, every other right) that escape are counted without
+trying any deltas, by inclusion-exclusion over the kernels of the column
+subsets of H:
+
+    N(T) = sum over S in T of (-1)^(|T| - |S|) * p^(|S| - rank H_S)
+
+For double errors on a 24-word table this replaces C(37,2) * 2052^2
+(about 2.8e9) trial patterns with 666 rank computations. Position sets
+are enumerated in parallel, one task per lowest position, and every set
+with N(T) > 0 is listed with a kernel basis describing its patterns.
+
+Usage
+-----
+    python3 blind_spots.py                 # double errors, every word count
+    python3 blind_spots.py --order 2,3,4   # up to four wrong positions
+    python3 blind_spots.py --check         # brute-force cross-check in toy fields
+
+License: MIT (see repository root).
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.gf_linalg import nullspace, rank
+from shared.schiavinato_bridge import PRIME
+
+WORD_COUNTS = (12, 15, 18, 21, 24)
+
+
+def position_names(words: int) -> list[str]:
+    """w1..wN, R1..Rr, C1..C3, GIC, x."""
+    rows = words // 3
+    return ([f"w{i + 1}" for i in range(words)] + [f"R{j + 1}" for j in range(rows)]
+            + [f"C{c + 1}" for c in range(3)] + ["GIC", "x"])
+
+
+@functools.lru_cache(maxsize=None)
+def check_matrix(words: int, p: int = PRIME) -> np.ndarray:
+    """
+    Residual change per unit error at each position (checks x positions).
+
+    Rows: r row checks, 3 column checks, the GIC check. A word error moves
+    its row, column and GIC residuals by -1; an error in a printed checksum
+    moves its own residual by +1; an error in x enters the recomputed GIC
+    through its index term and moves the GIC residual by -1.
+    """
+    rows = words // 3
+    n = len(position_names(words))
+    h = np.zeros((rows + 4, n), dtype=np.int64)
+    for i in range(words):
+        h[i // 3, i] = h[rows + i % 3, i] = h[rows + 3, i] = -1
+    for j in range(rows):
+        h[j, words + j] = 1
+    for c in range(3):
+        h[rows + c, words + rows + c] = 1
+    h[rows + 3, words + rows + 3] = 1
+    h[rows + 3, words + rows + 4] = -1
+    return h % p
+
+
+@functools.lru_cache(maxsize=1 << 20)
+def kernel_dim(words: int, subset: tuple, p: int = PRIME) -> int:
+    """Dimension of the kernel of the columns `subset` of the check matrix."""
+    if not subset:
+        return 0
+    return len(subset) - rank(check_matrix(words, p)[:, list(subset)], p)
+
+
+def undetected_count(words: int, subset: tuple, p: int = PRIME) -> int:
+    """Errors with support exactly `subset` that pass every check."""
+    k = len(subset)
+    return sum((-1) ** (k - size) * p ** kernel_dim(words, sub, p)
+               for size in range(k + 1) for sub in itertools.combinations(subset, size))
+
+
+def _task(args: tuple) -> tuple[int, int, list[dict]]:
+    """Pool task: every position set of one size whose lowest position is `first`."""
+    words, order, first, p = args
+    names = position_names(words)
+    found = []
+    for rest in itertools.combinations(range(first + 1, len(names)), order - 1):
+        subset = (first,) + rest
+        count = undetected_count(words, subset, p)
+        if count:
+            basis = nullspace(check_matrix(words, p)[:, list(subset)], p)
+            found.append({
+                "positions": [names[i] for i in subset],
+                "patterns": count,
+                "kernel_basis": basis.tolist(),
+            })
+    return words, order, found
+
+
+def enumerate_blind_spots(word_counts, orders, p: int = PRIME,
+                          workers: int | None = None) -> list[dict]:
+    """
+    Every undetectable error class of the given sizes.
+
+    Args:
+        word_counts: Word counts to analyze
+        orders: Numbers of simultaneously wrong positions (e.g. 2 for double errors)
+        p: Field prime
+        workers: Pool size (default: all CPU cores)
+
+    Returns:
+        One dict per (word count, order): total and undetectable pattern
+        counts and the list of undetectable position sets
+    """
+    tasks = [(w, k, first, p) for w in word_counts for k in orders
+             for first in range(len(position_names(w)) - k + 1)]
+    classes: dict[tuple, list] = {(w, k): [] for w in word_counts for k in orders}
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for words, order, found in pool.imap_unordered(_task, tasks):
+            classes[words, order].extend(found)
+
+    results = []
+    for words in word_counts:
+        n = len(position_names(words))
+        for order in orders:
+            found = sorted(classes[words, order], key=lambda c: [position_names(words).index(x)
+                                                                 for x in c["positions"]])
+            total = math.comb(n, order) * (p - 1) ** order
+            undetected = sum(c["patterns"] for c in found)
+            results.append({
+                "words": words, "order": order, "positions": n,
+                "position_sets": math.comb(n, order), "patterns": total,
+                "undetected": undetected, "undetected_fraction": undetected / total,
+                "classes": found,
+            })
+    return results
+
+
+def _describe(c: dict, p: int) -> str:
+    positions = ", ".join(c["positions"])
+    basis = [[v - p if v > p // 2 else v for v in vector] for vector in c["kernel_basis"]]
+    if len(basis) == 1:
+        return f"({positions}) = t*({', '.join(map(str, basis[0]))}), t != 0"
+    return f"({positions}) in span {basis}"
+
+
+def print_results(results: list[dict], p: int = PRIME) -> None:
+    for r in results:
+        print(f"{r['words']}-word table, {r['order']} wrong positions: {r['position_sets']:,} position "
+              f"sets, {r['patterns']:.3e} patterns, {r['undetected']:,} undetectable "
+              f"({r['undetected_fraction']:.2e}) in {len(r['classes'])} class(es)")
+        for c in r["classes"][:20]:
+            print(f"    {c['patterns']:>12,}  {_describe(c, p)}")
+        if len(r["classes"]) > 20:
+            print(f"    ... {len(r['classes']) - 20} more (see --output)")
+
+
+def brute_force(words: int, order: int, p: int) -> int:
+    """Undetectable errors of one size, by trying every delta (toy fields only)."""
+    h = check_matrix(words, p)
+    deltas = np.array(list(itertools.product(range(1, p), repeat=order)), dtype=np.int64)
+    total = 0
+    for subset in itertools.combinations(range(h.shape[1]), order):
+        residual = deltas @ h[:, list(subset)].T % p
+        total += int((~residual.any(axis=1)).sum())
+    return total
+
+
+def check() -> None:
+    """Inclusion-exclusion counts against brute force in toy fields, and the matrix itself."""
+    for p, order in ((13, 2), (5, 3), (3, 4)):
+        counts = enumerate_blind_spots([12], [order], p, workers=1)[0]
+        assert counts["undetected"] == brute_force(12, order, p), (p, order)
+        print(f"✓ GF({p}), 12 words, {order} wrong positions: {counts['undetected']:,} undetectable "
+              f"patterns, matching brute force")
+
+    from shared.schiavinato_bridge import share_checksums
+
+    words = [5, 17, 2040, 33, 1999, 0, 7, 1024, 2052, 11, 12, 13]
+    table = words + share_checksums(words, 3) + [3]
+
+    def residual(t: list[int]) -> list[int]:
+        return [(a - b) % PRIME for a, b in zip(t[12:-1], share_checksums(t[:12], t[-1]))]
+
+    for i in range(len(table)):
+        bumped = list(table)
+        bumped[i] += 1
+        assert residual(bumped) == list(check_matrix(12)[:, i]), position_names(12)[i]
+    print("✓ Check matrix columns equal the residual change of a unit error at every position")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", default=",".join(map(str, WORD_COUNTS)),
+                        help="comma-separated word counts (default: all)")
+    parser.add_argument("--order", default="2",
+                        help="comma-separated numbers of wrong positions (default: 2)")
+    parser.add_argument("--prime", type=int, default=PRIME, help="field prime (default: 2053)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--check", action="store_true", help="run the brute-force cross-checks and exit")
+    parser.add_argument("--output", type=Path, default=None, help="write every class as JSON")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    word_counts = [int(w) for w in args.words.split(",")]
+    orders = [int(k) for k in args.order.split(",")]
+    for words in word_counts:
+        if words not in WORD_COUNTS:
+            parser.error(f"unsupported word count: {words}")
+    if any(k < 1 for k in orders):
+        parser.error("--order values must be positive")
+
+    start = time.perf_counter()
+    results = enumerate_blind_spots(word_counts, orders, args.prime, args.workers)
+    print_results(results, args.prime)
+    print(f"\nEnumerated in {time.perf_counter() - start:.1f}s")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"prime": args.prime, "results": results}, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""Transcription-error detection coverage of the v0.7.0 share-table checks.
+
+Injects human transcription errors into batches of share tables and
+measures which of the manual checks catch them:
+
+    range     every value is a field element (0..2052)
+    row       R_j = (w_{3j-2} + w_{3j-1} + w_{3j} + j) mod 2053
+    column    C_c = (sum of column c + 100c) mod 2053
+    GIC       (sum of all words + T_R + T_C + x) mod 2053
+
+Error classes
+-------------
+    slip          one digit of one value miswritten
+    digit-swap    two adjacent digits of one value transposed
+    transpose     two adjacent word cells exchanged (across or down)
+    row-swap      two word rows, with their row checksums, exchanged
+    label         wrong Share index x recorded
+    double        two independent errors from the classes above
+    triple        three independent errors
+
+Values are written as four decimal digits. An error that leaves the table
+unchanged (swapping equal digits or equal cells) is not counted.
+
+Method
+------
+Each pool task draws a batch of genuine tables (uniform words, random
+Share index, checksums), applies every error class to a copy of the batch,
+and evaluates all checks as array operations over the batch. The report
+gives per error class and word count the share of effective errors each
+check flags, and the miss rate with an exact 95% interval, plus a few
+missed examples.
+
+Usage
+-----
+    python3 transcription_errors.py --tables 1e7
+    python3 transcription_errors.py --tables 1e8 --words 12,24 --output errors.json
+    python3 transcription_errors.py --check
+
+License: MIT (see repository root).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from shared.reporting import binomial_interval, parse_count
+from shared.schiavinato_bridge import COLUMN_TAGS, COLUMN_TOTAL, PRIME, row_total, share_checksums
+
+P = PRIME
+DIGITS = 4
+MAX_LABEL = 255
+SINGLE_CLASSES = ("slip", "digit-swap", "transpose", "row-swap", "label")
+CLASSES = SINGLE_CLASSES + ("double", "triple")
+CHECKS = ("range", "row", "column", "gic")
+WORD_COUNTS = (12, 15, 18, 21, 24)
+DEFAULT_BATCH = 1 << 17
+MAX_EXAMPLES = 3
+
+_POW10 = 10 ** np.arange(DIGITS, dtype=np.int32)
+
+
+class Layout:
+    """
+    Flat column layout of one share table.
+
+    Columns 0..3r-1 hold the words row by row, then r row checksums,
+    3 column checksums, the GIC and the Share index x.
+    """
+
+    def __init__(self, words: int):
+        self.words = words
+        self.rows = words // 3
+        self.row_cells = 3 * self.rows
+        self.column_cells = self.row_cells + self.rows
+        self.gic = self.column_cells + 3
+        self.label = self.gic + 1
+        self.width = self.label + 1
+        pairs = []
+        for j in range(self.rows):
+            pairs += [(3 * j, 3 * j + 1), (3 * j + 1, 3 * j + 2)]
+            if j + 1 < self.rows:
+                pairs += [(3 * j + c, 3 * j + 3 + c) for c in range(3)]
+        self.adjacent = np.array(pairs, dtype=np.int64)
+
+    def names(self) -> list[str]:
+        """Human-readable cell names, e.g. w5, R2, C3, GIC, x."""
+        return ([f"w{i + 1}" for i in range(self.words)] + [f"R{j + 1}" for j in range(self.rows)]
+                + [f"C{c + 1}" for c in range(3)] + ["GIC", "x"])
+
+
+def genuine_tables(layout: Layout, n: int, rng: np.random.Generator) -> np.ndarray:
+    """`n` correct share tables (n, width) with uniform words and Share indices."""
+    t = np.empty((n, layout.width), dtype=np.int32)
+    words = rng.integers(0, P, size=(n, layout.rows, 3), dtype=np.int32)
+    t[:, :layout.row_cells] = words.reshape(n, -1)
+    t[:, layout.row_cells:layout.column_cells] = (words.sum(axis=2) + np.arange(1, layout.rows + 1)) % P
+    t[:, layout.column_cells:layout.gic] = (words.sum(axis=1) + np.array(COLUMN_TAGS)) % P
+    x = rng.integers(1, MAX_LABEL + 1, size=n, dtype=np.int32)
+    t[:, layout.gic] = (words.sum(axis=(1, 2)) + row_total(layout.words) + COLUMN_TOTAL + x) % P
+    t[:, layout.label] = x
+    return t
+
+
+def evaluate(layout: Layout, t: np.ndarray) -> dict[str, np.ndarray]:
+    """Which checks fail on each transcribed table."""
+    n = t.shape[0]
+    values = t[:, :layout.label]
+    words = values[:, :layout.row_cells].reshape(n, layout.rows, 3)
+    rows = (words.sum(axis=2) + np.arange(1, layout.rows + 1)) % P
+    columns = (words.sum(axis=1) + np.array(COLUMN_TAGS)) % P
+    gic = (words.sum(axis=(1, 2)) + row_total(layout.words) + COLUMN_TOTAL + t[:, layout.label]) % P
+    return {
+        "range": (values >= P).any(axis=1),
+        "row": (rows != values[:, layout.row_cells:layout.column_cells]).any(axis=1),
+        "column": (columns != values[:, layout.column_cells:layout.gic]).any(axis=1),
+        "gic": gic != values[:, layout.gic],
+    }
+
+
+def _digit(values: np.ndarray, position: np.ndarray) -> np.ndarray:
+    return values // _POW10[position] % 10
+
+
+def slip(layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """One digit of one value (any cell but x) replaced by another digit."""
+    n = t.shape[0]
+    at = np.arange(n)
+    cell = rng.integers(0, layout.label, size=n)
+    position = rng.integers(0, DIGITS, size=n)
+    old = _digit(t[at, cell], position)
+    new = (old + rng.integers(1, 10, size=n)) % 10
+    t[at, cell] += ((new - old) * _POW10[position]).astype(np.int32)
+
+
+def digit_swap(layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """Two adjacent digits of one value (any cell but x) transposed."""
+    n = t.shape[0]
+    at = np.arange(n)
+    cell = rng.integers(0, layout.label, size=n)
+    low = rng.integers(0, DIGITS - 1, size=n)
+    a, b = _digit(t[at, cell], low), _digit(t[at, cell], low + 1)
+    t[at, cell] += ((b - a) * _POW10[low] + (a - b) * _POW10[low + 1]).astype(np.int32)
+
+
+def transpose(layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """Two horizontally or vertically adjacent word cells exchanged."""
+    at = np.arange(t.shape[0])
+    pair = layout.adjacent[rng.integers(0, len(layout.adjacent), size=t.shape[0])]
+    a, b = t[at, pair[:, 0]].copy(), t[at, pair[:, 1]].copy()
+    t[at, pair[:, 0]], t[at, pair[:, 1]] = b, a
+
+
+def row_swap(layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """Two distinct word rows, with their row checksums, exchanged."""
+    n = t.shape[0]
+    j = rng.integers(0, layout.rows, size=n)
+    k = (j + rng.integers(1, layout.rows, size=n)) % layout.rows
+    at = np.arange(n)[:, None]
+    cells_j = np.concatenate([3 * j[:, None] + np.arange(3), layout.row_cells + j[:, None]], axis=1)
+    cells_k = np.concatenate([3 * k[:, None] + np.arange(3), layout.row_cells + k[:, None]], axis=1)
+    a, b = t[at, cells_j].copy(), t[at, cells_k].copy()
+    t[at, cells_j], t[at, cells_k] = b, a
+
+
+def wrong_label(layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """Share index replaced by a different index in 1..MAX_LABEL."""
+    shift = rng.integers(1, MAX_LABEL, size=t.shape[0], dtype=np.int32)
+    t[:, layout.label] = (t[:, layout.label] - 1 + shift) % MAX_LABEL + 1
+
+
+PRIMITIVES = {
+    "slip": slip, "digit-swap": digit_swap, "transpose": transpose,
+    "row-swap": row_swap, "label": wrong_label,
+}
+
+
+def inject(error_class: str, layout: Layout, t: np.ndarray, rng: np.random.Generator) -> None:
+    """Apply one error class to every table of `t` in place."""
+    if error_class in PRIMITIVES:
+        PRIMITIVES[error_class](layout, t, rng)
+        return
+    for _ in range({"double": 2, "triple": 3}[error_class]):
+        choice = rng.integers(0, len(SINGLE_CLASSES), size=t.shape[0])
+        for index, name in enumerate(SINGLE_CLASSES):
+            selected = np.flatnonzero(choice == index)
+            if selected.size:
+                part = t[selected]
+                PRIMITIVES[name](layout, part, rng)
+                t[selected] = part
+
+
+def _examples(layout: Layout, genuine: np.ndarray, corrupted: np.ndarray,
+              missed: np.ndarray) -> list[str]:
+    names = layout.names()
+    found = []
+    for i in np.flatnonzero(missed)[:MAX_EXAMPLES]:
+        changed = np.flatnonzero(genuine[i] != corrupted[i])
+        found.append(", ".join(f"{names[c]} {genuine[i, c]}->{corrupted[i, c]}" for c in changed))
+    return found
+
+
+def simulate(words: int, tables: int, seed: int, classes=CLASSES) -> dict:
+    """
+    Corrupt one batch of genuine tables with every error class.
+
+    Args:
+        words: Word count
+        tables: Genuine tables in the batch
+        seed: Seed for this batch
+        classes: Error classes to apply
+
+    Returns:
+        Per class: effective errors, flags per check, misses and examples
+    """
+    rng = np.random.default_rng(seed)
+    layout = Layout(words)
+    genuine = genuine_tables(layout, tables, rng)
+    counts = {}
+    for error_class in classes:
+        corrupted = genuine.copy()
+        inject(error_class, layout, corrupted, rng)
+        effective = (corrupted != genuine).any(axis=1)
+        flags = evaluate(layout, corrupted)
+        detected = np.zeros(tables, dtype=bool)
+        entry = {"effective": int(effective.sum())}
+        for check in CHECKS:
+            entry[check] = int((flags[check] & effective).sum())
+            detected |= flags[check]
+        missed = effective & ~detected
+        entry["missed"] = int(missed.sum())
+        entry["examples"] = _examples(layout, genuine, corrupted, missed)
+        counts[error_class] = entry
+    return counts
+
+
+def _task(args: tuple) -> tuple[int, dict]:
+    words, count, seed, classes = args
+    return words, simulate(words, count, seed, classes)
+
+
+def run(word_counts, tables: int, classes=CLASSES, batch: int = DEFAULT_BATCH,
+        workers: int | None = None, seed: int | None = None) -> list[dict]:
+    """
+    Simulate every (word count, error class) cell across a process pool.
+
+    Args:
+        word_counts: Word counts to simulate
+        tables: Genuine tables per word count (each gets every error class)
+        classes: Error classes
+        batch: Tables per pool task (bounds worker memory)
+        workers: Pool size (default: all CPU cores)
+        seed: Master seed (None: fresh entropy)
+
+    Returns:
+        One dict per cell with detection rates per check and the miss rate
+    """
+    master = np.random.SeedSequence(seed)
+    tasks = []
+    for words in word_counts:
+        for start in range(0, tables, batch):
+            task_seed = int(master.spawn(1)[0].generate_state(1, dtype=np.uint64)[0])
+            tasks.append((words, min(batch, tables - start), task_seed, tuple(classes)))
+    totals = {(w, c): {"effective": 0, "missed": 0, "examples": [], **{k: 0 for k in CHECKS}}
+              for w in word_counts for c in classes}
+    with Pool(processes=workers or os.cpu_count()) as pool:
+        for words, counts in pool.imap_unordered(_task, tasks):
+            for error_class, entry in counts.items():
+                total = totals[words, error_class]
+                for name in ("effective", "missed") + CHECKS:
+                    total[name] += entry[name]
+                total["examples"] = (total["examples"] + entry["examples"])[:MAX_EXAMPLES]
+
+    results = []
+    for words in word_counts:
+        for error_class in classes:
+            total = totals[words, error_class]
+            n = max(total["effective"], 1)
+            results.append({
+                "words": words, "error": error_class, "effective": total["effective"],
+                "flagged": {check: total[check] / n for check in CHECKS},
+                "missed": total["missed"], "miss_rate": total["missed"] / n,
+                "miss_ci95": binomial_interval(total["missed"], n),
+                "missed_examples": total["examples"],
+            })
+    return results
+
+
+def print_results(results: list[dict]) -> None:
+    print(f"{'words':>5}  {'error':<11}{'effective':>13}" + "".join(f"{c:>9}" for c in CHECKS)
+          + f"{'missed':>10}{'miss rate':>12}{'95% upper':>11}")
+    for r in results:
+        print(f"{r['words']:>5}  {r['error']:<11}{r['effective']:>13,}"
+              + "".join(f"{r['flagged'][c]:>9.2%}" for c in CHECKS)
+              + f"{r['missed']:>10,}{r['miss_rate']:>12.2e}{r['miss_ci95'][1]:>11.2e}")
+    misses = [r for r in results if r["missed_examples"]]
+    if misses:
+        print("\nMissed examples:")
+        for r in misses:
+            for example in r["missed_examples"]:
+                print(f"  {r['words']}-word {r['error']}: {example}")
+
+
+def check() -> None:
+    """Table construction against the reference checksums, and known coverage facts."""
+    rng = np.random.default_rng(0)
+    for words in WORD_COUNTS:
+        layout = Layout(words)
+        t = genuine_tables(layout, 100, rng)
+        for row in t[:10]:
+            x = int(row[layout.label])
+            expected = share_checksums([int(w) for w in row[:words]], x)
+            assert list(row[layout.row_cells:layout.label]) == expected
+        assert not any(f.any() for f in evaluate(layout, t).values())
+    print("✓ Generated tables match the reference checksums and pass every check")
+
+    counts = simulate(24, 50_000, 1)
+    for error_class in SINGLE_CLASSES:
+        assert counts[error_class]["missed"] == 0, error_class
+    assert counts["label"]["effective"] == 50_000 and counts["label"]["gic"] == 50_000
+    print("✓ Every single error (slip, digit swap, transposition, row swap, label) is caught")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tables", type=parse_count, default=1_000_000,
+                        help="genuine tables per word count, e.g. 1e8 (default: 1e6)")
+    parser.add_argument("--words", default=",".join(map(str, WORD_COUNTS)),
+                        help="comma-separated word counts (default: all)")
+    parser.add_argument("--errors", default=",".join(CLASSES),
+                        help=f"comma-separated error classes (default: {','.join(CLASSES)})")
+    parser.add_argument("--batch", type=parse_count, default=DEFAULT_BATCH,
+                        help=f"tables per pool task (default: {DEFAULT_BATCH})")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--check", action="store_true", help="run the consistency checks and exit")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+        return
+
+    word_counts = [int(w) for w in args.words.split(",")]
+    classes = args.errors.split(",")
+    for words in word_counts:
+        if words not in WORD_COUNTS:
+            parser.error(f"unsupported word count: {words}")
+    for name in classes:
+        if name not in CLASSES:
+            parser.error(f"unknown error class: {name}")
+
+    total = len(word_counts) * len(classes) * args.tables
+    print(f"Share-table transcription errors: {len(word_counts)} word counts x "
+          f"{len(classes)} error classes x {args.tables:,} tables\n")
+    start = time.perf_counter()
+    results = run(word_counts, args.tables, classes, args.batch, args.workers, args.seed)
+    elapsed = time.perf_counter() - start
+    print_results(results)
+    print(f"\n{total:,} corrupted tables in {elapsed:.1f}s ({total / elapsed:,.0f}/s)")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({"tables": args.tables, "seed": args.seed, "seconds": elapsed,
+                       "results": results}, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()